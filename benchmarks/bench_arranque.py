@@ -0,0 +1,97 @@
+"""
+Benchmark: cold start. Prints an `-X importtime` report for `import main`
+(slowest top-level imports and this repo's own modules) and times, over
+several fresh uvicorn processes, spawn -> first 200 on / and the latency of
+that first request (template compilation, first connection).
+
+Usage: python -m benchmarks.bench_arranque [runs] [rows]   (default: 5 2000)
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+PUERTO = 8766
+MODULOS_REPO = ('main', 'database', 'database_async', 'cache', 'importacion', 'instrumentacion',
+                'operaciones', 'planificador')
+
+
+def importtime(raiz: str, entorno: dict):
+    """(total ms, [(module, self ms, cumulative ms, depth)]) for `import main`"""
+    salida = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import main'],
+        cwd=raiz, env=entorno, capture_output=True, text=True, check=True
+    ).stderr
+    filas = []
+    for linea in salida.splitlines():
+        if not linea.startswith('import time:') or 'self [us]' in linea:
+            continue
+        propio, acumulado, nombre = linea[len('import time:'):].split('|')
+        propio, acumulado = int(propio), int(acumulado)
+        profundidad = (len(nombre) - len(nombre.lstrip())) // 2
+        filas.append((nombre.strip(), propio / 1000, acumulado / 1000, profundidad))
+    total = next(acum for nombre, _, acum, _ in filas if nombre == 'main')
+    return total, filas
+
+
+def primer_respuesta(raiz: str, entorno: dict):
+    """(seconds from spawn to first 200 on /, seconds that first request took)"""
+    inicio = time.perf_counter()
+    proceso = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--port', str(PUERTO), '--log-level', 'warning'],
+        cwd=raiz, env=entorno
+    )
+    try:
+        while True:
+            if proceso.poll() is not None:
+                raise RuntimeError("uvicorn terminó antes de responder")
+            try:
+                peticion = time.perf_counter()
+                r = httpx.get(f'http://127.0.0.1:{PUERTO}/', timeout=10)
+            except httpx.TransportError:
+                time.sleep(0.005)
+                continue
+            r.raise_for_status()
+            return time.perf_counter() - inicio, time.perf_counter() - peticion
+    finally:
+        proceso.terminate()
+        proceso.wait()
+
+
+def main(runs, rows):
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ['DATABASE_URL'] = url
+        from benchmarks.synthetic import create_database
+        engine, _ = create_database(url, rows)
+        engine.dispose()
+        entorno = {**os.environ, 'DATABASE_URL': url, 'PLANIFICADOR_INTERVALO': '0'}
+
+        total, filas = importtime(raiz, entorno)
+        print(f"import main: {total:.0f} ms")
+        print("  Paquetes de primer nivel más lentos (acumulado):")
+        for nombre, _, acumulado, _ in sorted((f for f in filas if f[3] <= 1 and f[0] != 'main'), key=lambda f: -f[2])[:10]:
+            print(f"    {nombre:<40} {acumulado:>8.1f} ms")
+        print("  Módulos del repo (tiempo propio):")
+        for nombre, propio, acumulado, _ in filas:
+            if nombre in MODULOS_REPO:
+                print(f"    {nombre:<40} {propio:>8.1f} ms  (acumulado {acumulado:.1f} ms)")
+
+        arranques, primeras = [], []
+        for _ in range(runs):
+            arranque, primera = primer_respuesta(raiz, entorno)
+            arranques.append(arranque)
+            primeras.append(primera)
+        print(f"spawn -> primer 200 en /: mediana {statistics.median(arranques) * 1000:.0f} ms "
+              f"(min {min(arranques) * 1000:.0f}, max {max(arranques) * 1000:.0f}) en {runs} arranques")
+        print(f"primera petición a /: mediana {statistics.median(primeras) * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:]]
+    main(*(args + [5, 2000][len(args):]))
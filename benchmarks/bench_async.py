@@ -0,0 +1,117 @@
+"""
+Load test: latency of a cheap request while slow queries run concurrently,
+with a synchronous Session inside async handlers (before) vs the AsyncSession
+layer in database_async (after).
+
+Usage: python -m benchmarks.bench_async [rows] [slow_workers] [probes]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+import database
+import database_async
+from benchmarks.synthetic import create_database
+
+
+def build_apps(url, pool_size):
+    """Same two endpoints wired both ways: /slow scans the table, /fast reads one row"""
+    # Sessions are only returned by the dependency teardown, so every in-flight
+    # request holds a connection; size the pools so checkouts never wait
+    sync_engine = create_engine(url, pool_size=pool_size, connect_args={"check_same_thread": False})
+    Session = sessionmaker(bind=sync_engine)
+    sync_app = FastAPI()
+    
+    def get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+    
+    @sync_app.get("/slow")
+    async def slow_sync(db=Depends(get_db)):
+        return database.compute_dashboard_stats(db)
+    
+    @sync_app.get("/fast")
+    async def fast_sync(db=Depends(get_db)):
+        return {"id": database.get_postulacion(db, 1).id}
+    
+    async_engine = create_async_engine(database_async._async_url(url), pool_size=pool_size)
+    AsyncSession = async_sessionmaker(async_engine, expire_on_commit=False)
+    async_app = FastAPI()
+    
+    async def get_async_db():
+        async with AsyncSession() as db:
+            yield db
+    
+    @async_app.get("/slow")
+    async def slow_async(db=Depends(get_async_db)):
+        return await database_async.compute_dashboard_stats(db)
+    
+    @async_app.get("/fast")
+    async def fast_async(db=Depends(get_async_db)):
+        return {"id": (await database_async.get_postulacion(db, 1)).id}
+    
+    return sync_app, async_app, sync_engine, async_engine
+
+
+async def measure(app, slow_workers, probes):
+    """Keep `slow_workers` slow requests in flight while a probe issues `probes`
+    sequential cheap requests; return the probe latencies (ms)"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Warm up as many connections as the run will use
+        await asyncio.gather(*(client.get("/fast") for _ in range(slow_workers + 1)))
+        
+        terminado = asyncio.Event()
+        
+        async def slow_worker():
+            while not terminado.is_set():
+                await client.get("/slow")
+        
+        workers = [asyncio.create_task(slow_worker()) for _ in range(slow_workers)]
+        await asyncio.sleep(0.05)
+        latencias = []
+        for _ in range(probes):
+            start = time.perf_counter()
+            await client.get("/fast")
+            latencias.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(0.01)
+        terminado.set()
+        await asyncio.gather(*workers)
+    return sorted(latencias)
+
+
+def report(nombre, latencias):
+    p99 = latencias[min(len(latencias) - 1, int(len(latencias) * 0.99))]
+    print(f"{nombre:<24} p50 {statistics.median(latencias):8.1f} ms   p99 {p99:8.1f} ms   max {latencias[-1]:8.1f} ms")
+
+
+def main(rows, slow_workers, probes):
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine, _ = create_database(url, rows)
+        engine.dispose()
+        sync_app, async_app, sync_engine, async_engine = build_apps(url, slow_workers + 2)
+        
+        print(f"{rows} rows, {slow_workers} concurrent slow requests, {probes} probe requests")
+        report("sync Session (before)", asyncio.run(measure(sync_app, slow_workers, probes)))
+        report("AsyncSession (after)", asyncio.run(measure(async_app, slow_workers, probes)))
+        
+        asyncio.run(async_engine.dispose())
+        sync_engine.dispose()
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:]]
+    main(*(args + [100000, 2, 50][len(args):]))
@@ -0,0 +1,85 @@
+"""
+Benchmark: read latency while bulk_import writes, with SQLite's defaults
+(rollback journal, 2 MB cache) vs the PERFIL_SQLITE connection profile (WAL,
+synchronous=NORMAL, larger cache, mmap, busy timeout)
+
+Usage: python -m benchmarks.bench_concurrencia [rows] [import_rows] [readers]   (default: 100000 50000 2)
+"""
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+import database
+from benchmarks.synthetic import create_database, generate_postulaciones
+
+PERFILES = {
+    'defaults': {'journal_mode': 'DELETE'},
+    'PERFIL_SQLITE': database.PERFIL_SQLITE,
+}
+
+
+def leer(Session, fin: threading.Event, tiempos: list, errores: list):
+    """Request-like reads (fresh session each time) until the import finishes"""
+    while not fin.is_set():
+        inicio = time.perf_counter()
+        try:
+            with Session() as db:
+                database.get_postulaciones(db, limit=50)
+                database.count_postulaciones.__wrapped__(db, estado='Postulado')
+        except OperationalError as e:
+            errores.append(str(e.orig))
+            continue
+        tiempos.append(time.perf_counter() - inicio)
+
+
+def correr(nombre, perfil, rows, import_rows, readers):
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine, _ = create_database(url, rows)
+        engine.dispose()
+        engine = create_engine(url, pool_size=readers + 1, connect_args={"check_same_thread": False})
+        database.aplicar_perfil_sqlite(engine, perfil)
+        Session = sessionmaker(bind=engine)
+        filas = list(generate_postulaciones(import_rows, seed=7))
+        for i, fila in enumerate(filas):
+            fila['url_oferta'] = f'https://example.com/importadas/{i}'
+
+        fin = threading.Event()
+        tiempos, errores = [], []
+        hilos = [threading.Thread(target=leer, args=(Session, fin, tiempos, errores)) for _ in range(readers)]
+        for hilo in hilos:
+            hilo.start()
+        time.sleep(0.2)  # Baseline reads before the writer starts
+        inicio = time.perf_counter()
+        with Session() as db:
+            insertadas = database.bulk_import(db, filas)
+        duracion = time.perf_counter() - inicio
+        fin.set()
+        for hilo in hilos:
+            hilo.join()
+        engine.dispose()
+
+    tiempos.sort()
+    p99 = tiempos[max(0, len(tiempos) * 99 // 100 - 1)] if tiempos else float('nan')
+    print(f"{nombre:<14} {insertadas / duracion:>10,.0f} {len(tiempos):>7} "
+          f"{statistics.median(tiempos) * 1000 if tiempos else float('nan'):>9.1f} "
+          f"{p99 * 1000:>9.1f} {(tiempos[-1] if tiempos else float('nan')) * 1000:>9.1f} {len(errores):>7}")
+
+
+def main(rows, import_rows, readers):
+    print(f"{rows} filas existentes, importando {import_rows} con {readers} lectores concurrentes")
+    print(f"{'perfil':<14} {'import f/s':>10} {'lecturas':>7} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9} {'errores':>7}")
+    for nombre, perfil in PERFILES.items():
+        correr(nombre, perfil, rows, import_rows, readers)
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:]]
+    main(*(args + [100000, 50000, 2][len(args):]))
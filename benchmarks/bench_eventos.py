@@ -0,0 +1,124 @@
+"""
+Benchmark: N open dashboards kept current by reloading the page after every
+status change (before) vs subscribed to the /api/eventos stream (after).
+
+Starts uvicorn on a fresh synthetic database (read cache off, so every page
+load does its queries), then makes `cambios` status changes. Reported per
+change: the time until all N dashboards show it, the bytes sent to each, and
+the dashboard stats computations the server made for them.
+
+Usage: python -m benchmarks.bench_eventos [rows] [clients] [changes]   (default: 5000 20 10)
+"""
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.servidores import esperar_listo
+
+PUERTO = 8767
+BASE = f'http://127.0.0.1:{PUERTO}'
+ESTADOS_CICLO = ['En revisión', 'Entrevista', 'Oferta', 'Postulado']
+
+
+async def cambiar_estado(c, i: int):
+    r = await c.post('/postulaciones/1/cambiar-estado', data={'nuevo_estado': ESTADOS_CICLO[i % len(ESTADOS_CICLO)]})
+    assert r.status_code == 303, r.status_code
+
+
+async def recargando(clientes: int, cambios: int):
+    """Each dashboard reloads the page after every change"""
+    tiempos, tamanos = [], []
+    async with httpx.AsyncClient(base_url=BASE, timeout=60) as escritor:
+        paneles = [httpx.AsyncClient(base_url=BASE, timeout=60) for _ in range(clientes)]
+        try:
+            for i in range(cambios):
+                await cambiar_estado(escritor, i)
+                inicio = time.perf_counter()
+                respuestas = await asyncio.gather(*(p.get('/') for p in paneles))
+                tiempos.append(time.perf_counter() - inicio)
+                tamanos.append(len(respuestas[0].content))
+        finally:
+            for p in paneles:
+                await p.aclose()
+    return tiempos, statistics.mean(tamanos), clientes * cambios
+
+
+async def suscritos(clientes: int, cambios: int):
+    """Each dashboard applies the events of its /api/eventos stream"""
+    recibidos = [asyncio.Queue() for _ in range(clientes)]
+    tamanos = []
+
+    async def panel(cola):
+        async with httpx.AsyncClient(base_url=BASE, timeout=None) as c:
+            async with c.stream('GET', '/api/eventos') as r:
+                evento = None
+                async for linea in r.aiter_lines():
+                    if linea.startswith('event: '):
+                        evento = linea[7:]
+                    elif linea.startswith('data: '):
+                        tamanos.append(len(linea) + len(evento) + 10)
+                        cola.put_nowait((evento, json.loads(linea[6:])))
+
+    tareas = [asyncio.create_task(panel(cola)) for cola in recibidos]
+    for cola in recibidos:
+        await cola.get()  # Snapshot
+    tamanos.clear()
+    async with httpx.AsyncClient(base_url=BASE, timeout=60) as escritor:
+        inicial = (await escritor.get('/api/eventos/estado')).json()['calculos']
+        tiempos = []
+        for i in range(cambios):
+            await cambiar_estado(escritor, i)
+            inicio = time.perf_counter()
+            await asyncio.gather(*(cola.get() for cola in recibidos))
+            tiempos.append(time.perf_counter() - inicio)
+        calculos = (await escritor.get('/api/eventos/estado')).json()['calculos'] - inicial
+    for tarea in tareas:
+        tarea.cancel()
+    await asyncio.gather(*tareas, return_exceptions=True)
+    return tiempos, statistics.mean(tamanos), calculos
+
+
+def main(rows, clientes, cambios):
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ['DATABASE_URL'] = url
+        from benchmarks.synthetic import create_database
+        engine, _ = create_database(url, rows)
+        engine.dispose()
+        entorno = {
+            **os.environ, 'DATABASE_URL': url, 'CACHE_TTL': '0', 'PLANIFICADOR_INTERVALO': '0',
+            'JINJA_CACHE_DIR': os.path.join(tmp, 'jinja'), 'EVENTOS_ESPERA': '0.01'
+        }
+        proceso = subprocess.Popen(
+            [sys.executable, '-m', 'uvicorn', 'main:app', '--port', str(PUERTO), '--log-level', 'warning'],
+            cwd=raiz, env=entorno
+        )
+        try:
+            esperar_listo(proceso, BASE)
+            resultados = {
+                'recargando': asyncio.run(recargando(clientes, cambios)),
+                'eventos': asyncio.run(suscritos(clientes, cambios)),
+            }
+        finally:
+            proceso.terminate()
+            proceso.wait()
+
+    print(f"{rows} filas, {clientes} dashboards, {cambios} cambios de estado")
+    print(f"{'modo':<11} {'p50 ms':>8} {'p95 ms':>8} {'bytes/panel':>12} {'stats calculadas':>17}")
+    for modo, (tiempos, tamano, calculos) in resultados.items():
+        tiempos.sort()
+        print(f"{modo:<11} {statistics.median(tiempos) * 1000:>8.1f} {tiempos[len(tiempos) * 95 // 100] * 1000:>8.1f} "
+              f"{tamano:>12.0f} {calculos:>17}")
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:]]
+    main(*(args + [5000, 20, 10][len(args):]))
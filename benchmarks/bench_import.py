@@ -0,0 +1,88 @@
+"""
+Benchmark: CSV import throughput (rows/sec) for several batch sizes, compared
+with the previous one-ORM-object-per-row import
+
+Usage: python -m benchmarks.bench_import [rows] [batch sizes...]   (default: 100000 500 5000 20000)
+"""
+import csv
+import io
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.synthetic import generate_postulaciones
+from database import Postulacion, create_schema
+from importacion import importar_csv
+
+COLUMNAS = ['empresa', 'puesto', 'url_oferta', 'fecha_postulacion', 'estado', 'notas',
+            'fecha_seguimiento', 'fecha_respuesta', 'tags']
+TAGS = ['python', 'remoto', 'senior', 'fintech', 'startup', 'backend']
+
+
+def build_csv(n: int) -> str:
+    """Render n synthetic rows as CSV text (about a third of them tagged)"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=COLUMNAS, extrasaction='ignore')
+    writer.writeheader()
+    for i, fila in enumerate(generate_postulaciones(n)):
+        fila['tags'] = ', '.join(TAGS[i % 6:i % 6 + 2]) if i % 3 == 0 else ''
+        writer.writerow(fila)
+    return buffer.getvalue()
+
+
+def legacy_import(db, texto: str) -> int:
+    """Previous implementation: strptime and one ORM object per row, one commit"""
+    count = 0
+    for p in csv.DictReader(io.StringIO(texto)):
+        fecha_post = datetime.strptime(p['fecha_postulacion'], '%Y-%m-%d').date()
+        fecha_seg = datetime.strptime(p['fecha_seguimiento'], '%Y-%m-%d').date() if p['fecha_seguimiento'] else None
+        fecha_resp = datetime.strptime(p['fecha_respuesta'], '%Y-%m-%d').date() if p['fecha_respuesta'] else None
+        db.add(Postulacion(
+            empresa=p['empresa'], puesto=p['puesto'], url_oferta=p['url_oferta'],
+            fecha_postulacion=fecha_post, estado=p['estado'], notas=p['notas'],
+            fecha_seguimiento=fecha_seg, fecha_respuesta=fecha_resp, tags=p['tags'] or None
+        ))
+        count += 1
+    db.commit()
+    return count
+
+
+def fresh_session(directorio: str, nombre: str):
+    engine = create_engine(f"sqlite:///{os.path.join(directorio, nombre)}")
+    create_schema(engine)
+    return engine, sessionmaker(bind=engine)()
+
+
+def main(argv):
+    n = int(argv[0]) if argv else 100000
+    batches = [int(b) for b in argv[1:]] or [500, 5000, 20000]
+    texto = build_csv(n)
+    print(f"{n} filas, {len(texto) / 1e6:.1f} MB de CSV")
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        engine, db = fresh_session(directorio, 'legacy.db')
+        inicio = time.perf_counter()
+        legacy_import(db, texto)
+        segundos = time.perf_counter() - inicio
+        db.close()
+        engine.dispose()
+        print(f"  {'legacy (ORM, sin stats/tags)':<30} {segundos:7.2f} s  {n / segundos:>10,.0f} filas/s")
+        
+        for batch in batches:
+            engine, db = fresh_session(directorio, f'batch_{batch}.db')
+            inicio = time.perf_counter()
+            reporte = importar_csv(db, io.StringIO(texto), batch_size=batch)
+            segundos = time.perf_counter() - inicio
+            db.close()
+            engine.dispose()
+            assert reporte.insertadas == n, reporte.to_dict()
+            print(f"  {f'importar_csv batch={batch}':<30} {segundos:7.2f} s  {n / segundos:>10,.0f} filas/s")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,74 @@
+"""
+Benchmark: N estado changes and N creations sent as N form posts (one
+transaction and 303 redirect each) vs one POST /api/postulaciones/batch
+
+Usage: python -m benchmarks.bench_lote [rows] [ops...]   (default: 20000 100 1000)
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import httpx
+
+
+async def medir(n: int, rows: int):
+    import main
+    transporte = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transporte, base_url='http://bench') as cliente:
+        ids = range(rows // 2, rows // 2 + n)
+        estados = ['Entrevista', 'Rechazado']
+
+        inicio = time.perf_counter()
+        for postulacion_id in ids:
+            r = await cliente.post(f'/postulaciones/{postulacion_id}/cambiar-estado', data={'nuevo_estado': estados[0]})
+            assert r.status_code == 303, r.text
+        t_form_estado = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        r = await cliente.post('/api/postulaciones/batch', json={
+            'operaciones': [{'op': 'estado', 'id': i, 'estado': estados[1]} for i in ids]
+        })
+        assert r.status_code == 200 and r.json()['errores'] == 0, r.text
+        t_lote_estado = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        for i in range(n):
+            r = await cliente.post('/postulaciones/nueva', data={
+                'empresa': f'Form {i}', 'puesto': 'Dev', 'fecha_postulacion': '2026-01-15',
+                'estado': 'Postulado', 'tags': 'python, scraper'
+            })
+            assert r.status_code == 303, r.text
+        t_form_crear = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        r = await cliente.post('/api/postulaciones/batch', json={'operaciones': [
+            {'op': 'crear', 'empresa': f'Lote {i}', 'puesto': 'Dev', 'fecha_postulacion': '2026-01-15',
+             'tags': 'python, scraper'}
+            for i in range(n)
+        ]})
+        assert r.status_code == 200 and r.json()['errores'] == 0, r.text
+        t_lote_crear = time.perf_counter() - inicio
+
+    for nombre, t_form, t_lote in (('estado', t_form_estado, t_lote_estado), ('crear', t_form_crear, t_lote_crear)):
+        print(f"{n:>6} {nombre:<8} {t_form:>10.3f} {t_lote:>10.3f} {t_form / t_lote:>8.0f}x")
+
+
+def main(rows, sizes):
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        # database.py (imported by synthetic and main) binds its engine at import time
+        os.environ['DATABASE_URL'] = url
+        from benchmarks.synthetic import create_database
+        engine, _ = create_database(url, rows)
+        engine.dispose()
+        print(f"{rows} filas existentes")
+        print(f"{'ops':>6} {'op':<8} {'forms (s)':>10} {'lote (s)':>10} {'speedup':>9}")
+        for n in sizes:
+            asyncio.run(medir(n, rows))
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:]]
+    main(args[0] if args else 20000, args[1:] or [100, 1000])
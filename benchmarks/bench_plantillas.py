@@ -0,0 +1,99 @@
+"""
+Benchmark: render time of each template in templates/ with the context its
+route builds (queries run once, outside the timing). Pages with {% cache %}
+fragments are timed twice: fragment cache cleared before every render (cold)
+and reused across renders (warm).
+
+Usage: python -m benchmarks.bench_plantillas [rows] [repeat]   (default: 20000 200)
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+
+def medir(plantilla, contexto, repeat: int, antes=None):
+    """Median and p95 milliseconds of plantilla.render(contexto)"""
+    tiempos = []
+    for _ in range(repeat):
+        if antes:
+            antes()
+        inicio = time.perf_counter()
+        plantilla.render(contexto)
+        tiempos.append(time.perf_counter() - inicio)
+    tiempos.sort()
+    return statistics.median(tiempos) * 1000, tiempos[len(tiempos) * 95 // 100] * 1000
+
+
+def main(rows, repeat):
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ['DATABASE_URL'] = url
+        os.environ['JINJA_CACHE_DIR'] = os.path.join(tmp, 'jinja')
+        from benchmarks.synthetic import create_database
+        engine, Session = create_database(url, rows)
+
+        from starlette.requests import Request
+
+        import cache
+        import database
+        import fragmentos
+        from main import templates
+
+        def peticion(ruta):
+            return Request({'type': 'http', 'method': 'GET', 'path': ruta, 'query_string': b'', 'headers': []})
+
+        with Session() as db:
+            stats = database.get_dashboard_stats(db)
+            pagina = database.get_postulaciones_pagina(db, limit=20, columnas=database.COLUMNAS_LISTA)
+            postulacion = database.get_postulacion(db, pagina['items'][0].id)
+            contextos = {
+                'dashboard.html': {
+                    'request': peticion('/'), 'stats': stats, 'estados': database.ESTADOS,
+                    'seguimientos': database.get_seguimientos_pendientes(db, dias=7),
+                    'version_datos': cache.version_datos()
+                },
+                'postulaciones.html': {
+                    'request': peticion('/postulaciones'), 'postulaciones': pagina['items'],
+                    'page': 1, 'total_pages': (rows + 19) // 20, 'total': rows,
+                    'next_cursor': pagina['next_cursor'], 'prev_cursor': pagina['prev_cursor'],
+                    'filtros_qs': '', 'estado_filter': None, 'empresa_filter': None, 'search': None,
+                    'estados': database.ESTADOS
+                },
+                'detail.html': {
+                    'request': peticion(f'/postulaciones/{postulacion.id}'), 'postulacion': postulacion,
+                    'estados': database.ESTADOS
+                },
+                'form.html': {
+                    'request': peticion(f'/postulaciones/{postulacion.id}/editar'), 'postulacion': postulacion,
+                    'estados': database.ESTADOS, 'titulo': 'Editar Postulación'
+                },
+                'metricas.html': {
+                    'request': peticion('/metricas'), 'stats': stats, 'estados': database.ESTADOS,
+                    'funnel': database.get_funnel_metricas(db), 'salarios': database.get_salarios_metricas(db),
+                    'version_datos': cache.version_datos()
+                },
+            }
+        engine.dispose()
+
+        print(f"{rows} filas, {repeat} renders por plantilla")
+        print(f"{'plantilla':<22} {'p50 ms':>8} {'p95 ms':>8}  {'con fragmentos (p50 ms)':>24}")
+        for nombre in sorted(os.listdir('templates')):
+            if nombre not in contextos:
+                continue  # base.html is only rendered through the pages extending it
+            plantilla = templates.get_template(nombre)
+            fuente = templates.env.loader.get_source(templates.env, nombre)[0]
+            if '{% cache' in fuente:
+                p50, p95 = medir(plantilla, contextos[nombre], repeat, antes=fragmentos.fragmentos.clear)
+                tibio, _ = medir(plantilla, contextos[nombre], repeat)
+                extra = f"{tibio:>8.3f} ({p50 / tibio:.1f}x)"
+            else:
+                p50, p95 = medir(plantilla, contextos[nombre], repeat)
+                extra = '-'
+            print(f"{nombre:<22} {p50:>8.3f} {p95:>8.3f}  {extra:>24}")
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:]]
+    main(*(args + [20000, 200][len(args):]))
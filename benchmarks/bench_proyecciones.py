@@ -0,0 +1,71 @@
+"""
+Benchmark: list queries loading whole Postulacion objects (including notas)
+vs the COLUMNAS_LISTA / COLUMNAS_SEGUIMIENTO projections, on rows with large notes.
+Reports latency and peak Python memory (tracemalloc) per call.
+
+Usage: python -m benchmarks.bench_proyecciones [rows] [notas_words] [limit]   (default: 20000 1500 500)
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+import database
+from benchmarks.synthetic import create_database
+from database import COLUMNAS_LISTA, Postulacion
+
+
+def seguimientos_completos(db, dias: int = 7):
+    """Previous get_seguimientos_pendientes: whole ORM objects"""
+    return db.query(Postulacion).filter(
+        Postulacion.fecha_seguimiento <= date.today() + timedelta(days=dias),
+        Postulacion.estado.in_(['Postulado', 'En revisión'])
+    ).order_by(Postulacion.fecha_seguimiento).all()
+
+
+def medir(Session, fn, repeat: int = 5):
+    """(best seconds, peak KiB) of fn(db), each call on a fresh session"""
+    mejor = float('inf')
+    for _ in range(repeat):
+        with Session() as db:
+            inicio = time.perf_counter()
+            fn(db)
+            mejor = min(mejor, time.perf_counter() - inicio)
+    with Session() as db:
+        tracemalloc.start()
+        resultado = fn(db)
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        del resultado
+    return mejor, pico / 1024
+
+
+def main(rows, palabras, limit):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, Session = create_database(
+            f"sqlite:///{os.path.join(tmp, 'bench.db')}", rows, notas_palabras=(palabras // 2, palabras)
+        )
+        with Session() as db:
+            n_seg = len(seguimientos_completos(db))
+        casos = [
+            (f'get_postulaciones(limit={limit})',
+             lambda db: database.get_postulaciones(db, limit=limit),
+             lambda db: database.get_postulaciones(db, limit=limit, columnas=COLUMNAS_LISTA)),
+            (f'get_seguimientos_pendientes ({n_seg} filas)',
+             seguimientos_completos,
+             lambda db: database.get_seguimientos_pendientes.__wrapped__(db)),
+        ]
+        print(f"{rows} filas, notas de {palabras // 2}-{palabras} palabras")
+        print(f"{'consulta':<42} {'objetos ms':>10} {'proy. ms':>9} {'objetos KiB':>11} {'proy. KiB':>10}")
+        for nombre, completo, proyectado in casos:
+            t_obj, m_obj = medir(Session, completo)
+            t_proj, m_proj = medir(Session, proyectado)
+            print(f"{nombre:<42} {t_obj * 1000:>10.1f} {t_proj * 1000:>9.1f} {m_obj:>11,.0f} {m_proj:>10,.0f}")
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:]]
+    main(*(args + [20000, 1500, 500][len(args):]))
@@ -0,0 +1,84 @@
+"""
+Benchmark: dashboard stats via the old per-count implementation, the single
+aggregate query (compute_dashboard_stats) and the materialized tables (get_dashboard_stats)
+
+Usage: python -m benchmarks.bench_stats [sizes...]   (default: 10000 100000 1000000)
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.synthetic import create_database
+from database import Postulacion, ESTADOS, compute_dashboard_stats, get_dashboard_stats
+
+
+def legacy_dashboard_stats(db):
+    """Previous implementation: one COUNT per metric plus a Python-side average"""
+    total = db.query(Postulacion).count()
+    estado_counts = {}
+    for estado in ESTADOS:
+        estado_counts[estado] = db.query(Postulacion).filter(Postulacion.estado == estado).count()
+    respondidos = db.query(Postulacion).filter(
+        Postulacion.estado.notin_(['Postulado', 'Sin respuesta'])
+    ).count()
+    tasa_respuesta = (respondidos / total * 100) if total > 0 else 0
+    hoy = datetime.now().date()
+    esta_semana = db.query(Postulacion).filter(Postulacion.fecha_postulacion >= hoy - timedelta(days=7)).count()
+    este_mes = db.query(Postulacion).filter(Postulacion.fecha_postulacion >= hoy - timedelta(days=30)).count()
+    respuestas = db.query(Postulacion).filter(Postulacion.fecha_respuesta != None).all()
+    if respuestas:
+        tiempos = [(p.fecha_respuesta - p.fecha_postulacion).days for p in respuestas]
+        tiempo_promedio = sum(tiempos) / len(tiempos)
+    else:
+        tiempo_promedio = 0
+    seguimientos_pendientes = db.query(Postulacion).filter(
+        Postulacion.fecha_seguimiento <= hoy,
+        Postulacion.estado.in_(['Postulado', 'En revisión'])
+    ).count()
+    sin_respuesta = db.query(Postulacion).filter(
+        Postulacion.estado == 'Postulado',
+        Postulacion.fecha_postulacion <= hoy - timedelta(days=14)
+    ).count() + estado_counts['Sin respuesta']
+    return {
+        'total': total,
+        'estado_counts': estado_counts,
+        'tasa_respuesta': round(tasa_respuesta, 1),
+        'esta_semana': esta_semana,
+        'este_mes': este_mes,
+        'tiempo_promedio_respuesta': round(tiempo_promedio, 1),
+        'seguimientos_pendientes': seguimientos_pendientes,
+        'sin_respuesta_14dias': sin_respuesta,
+        'respondidos': respondidos
+    }
+
+
+def timed(fn, db, repeat):
+    """Best-of-`repeat` wall time in seconds and the last result"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(db)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(sizes):
+    print(f"{'rows':>10} {'legacy (s)':>12} {'single-pass (s)':>16} {'materialized (s)':>17} {'speedup':>8}")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine, Session = create_database(f"sqlite:///{os.path.join(tmp, 'bench.db')}", n)
+            repeat = 3 if n <= 100000 else 1
+            with Session() as db:
+                t_old, old = timed(legacy_dashboard_stats, db, repeat)
+                t_new, new = timed(compute_dashboard_stats, db, repeat)
+                # __wrapped__ skips the read cache so every repeat hits the stats tables
+                t_mat, mat = timed(get_dashboard_stats.__wrapped__, db, repeat)
+            engine.dispose()
+        assert old == new == mat, f"results differ:\n{old}\n{new}\n{mat}"
+        print(f"{n:>10} {t_old:>12.3f} {t_new:>16.3f} {t_mat:>17.4f} {t_old / t_mat:>7.0f}x")
+
+
+if __name__ == '__main__':
+    main([int(a) for a in sys.argv[1:]] or [10000, 100000, 1000000])
@@ -0,0 +1,82 @@
+"""
+Benchmark: HTTP throughput of servidor.py with 1..N worker processes
+
+Each run starts the launcher on a fresh synthetic database (read cache off,
+so every request does its queries) and drives it with concurrent keep-alive
+clients for a fixed time over a mix of list, stats and page routes.
+
+Usage: python -m benchmarks.bench_workers [rows] [seconds] [workers...]   (default: 20000 10 1 2 4)
+"""
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.servidores import esperar_listo
+
+RUTAS = ['/api/postulaciones?limit=20', '/api/stats', '/postulaciones', '/api/seguimientos']
+CLIENTES = 32
+PUERTO = 8765
+
+
+async def cargar(segundos: float):
+    """Requests completed and their latencies during `segundos`"""
+    latencias = []
+    fin = time.perf_counter() + segundos
+
+    async def cliente(i):
+        async with httpx.AsyncClient(base_url=f'http://127.0.0.1:{PUERTO}', timeout=30) as c:
+            n = i
+            while time.perf_counter() < fin:
+                inicio = time.perf_counter()
+                r = await c.get(RUTAS[n % len(RUTAS)])
+                r.raise_for_status()
+                latencias.append(time.perf_counter() - inicio)
+                n += 1
+
+    await asyncio.gather(*(cliente(i) for i in range(CLIENTES)))
+    return latencias
+
+
+def main(rows, segundos, workers):
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ['DATABASE_URL'] = url
+        from benchmarks.synthetic import create_database
+        engine, _ = create_database(url, rows)
+        engine.dispose()
+        entorno = {
+            **os.environ, 'DATABASE_URL': url, 'CACHE_TTL': '0', 'PLANIFICADOR_INTERVALO': '0',
+            'CACHE_VERSION_ARCHIVO': os.path.join(tmp, 'version_datos.bin')
+        }
+        print(f"{rows} filas, {CLIENTES} clientes, {segundos:.0f} s por corrida, {os.cpu_count()} CPUs")
+        print(f"{'workers':>7} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'speedup':>8}")
+        base = None
+        for n in workers:
+            proceso = subprocess.Popen(
+                [sys.executable, 'servidor.py', '--workers', str(n), '--port', str(PUERTO), '--log-level', 'warning'],
+                cwd=raiz, env=entorno
+            )
+            try:
+                esperar_listo(proceso, f'http://127.0.0.1:{PUERTO}')
+                asyncio.run(cargar(1))  # Warm-up
+                latencias = asyncio.run(cargar(segundos))
+            finally:
+                proceso.terminate()
+                proceso.wait()
+            rps = len(latencias) / segundos
+            base = base or rps
+            latencias.sort()
+            print(f"{n:>7} {rps:>9.0f} {statistics.median(latencias) * 1000:>8.1f} "
+                  f"{latencias[len(latencias) * 99 // 100] * 1000:>8.1f} {rps / base:>7.1f}x")
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 20000, float(args[1]) if len(args) > 1 else 10, [int(a) for a in args[2:]] or [1, 2, 4])
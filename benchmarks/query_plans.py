@@ -0,0 +1,133 @@
+"""
+Query-plan regression check: runs EXPLAIN QUERY PLAN for every SELECT issued
+by the read functions in database.py and fails if any of them falls back to a
+full scan of a table.
+
+Usage: python -m benchmarks.query_plans [-v]
+"""
+import os
+import sys
+import tempfile
+from datetime import date
+from typing import List, Tuple
+
+from sqlalchemy import event
+
+import database
+from benchmarks.synthetic import create_database
+
+# Functions whose job is to read every row; their scans are expected
+FULL_SCAN_OK = {'compute_dashboard_stats', 'verify_stats', 'get_postulaciones_para_exportar'}
+
+# Tables bounded by a small constant (one row per estado) may always be scanned
+SMALL_TABLES = {'stats_estados'}
+
+
+def plan_cases():
+    """(name, callable(db)) for each read path worth guarding"""
+    cursor = database.encode_cursor(database.Postulacion(id=500, fecha_postulacion=date.today()))
+    return [
+        ('get_postulacion', lambda db: database.get_postulacion(db, 1)),
+        ('get_postulaciones_por_id', lambda db: database.get_postulaciones_por_id(db, [3, 1, 2], columnas=database.COLUMNAS_LISTA)),
+        ('get_postulaciones', lambda db: database.get_postulaciones(db)),
+        ('get_postulaciones[estado]', lambda db: database.get_postulaciones(db, estado='Entrevista')),
+        ('get_postulaciones[tags]', lambda db: database.get_postulaciones(db, tags='python,remoto')),
+        ('get_postulaciones[tags any]', lambda db: database.get_postulaciones(db, tags='python,remoto', tags_modo='any')),
+        ('get_postulaciones[search]', lambda db: database.get_postulaciones(db, search='developer')),
+        ('get_postulaciones[after]', lambda db: database.get_postulaciones(db, after=cursor)),
+        ('get_postulaciones[before]', lambda db: database.get_postulaciones(db, before=cursor)),
+        ('get_postulaciones_pagina[estado]', lambda db: database.get_postulaciones_pagina(db, estado='Oferta', after=cursor)),
+        ('get_postulaciones[salario]', lambda db: database.get_postulaciones(db, salario_desde=4000, salario_hasta=5000)),
+        ('count_postulaciones', lambda db: database.count_postulaciones(db)),
+        ('count_postulaciones[salario]', lambda db: database.count_postulaciones(db, salario_desde=4000, salario_moneda='USD')),
+        ('count_postulaciones[estado]', lambda db: database.count_postulaciones(db, estado='Postulado')),
+        ('count_postulaciones[tags]', lambda db: database.count_postulaciones(db, tags='python')),
+        ('get_tag_facets', lambda db: database.get_tag_facets(db, estado='Entrevista')),
+        ('buscar_postulaciones', lambda db: database.buscar_postulaciones(db, 'revision')),
+        ('get_dashboard_stats', lambda db: database.get_dashboard_stats(db)),
+        ('get_metricas_series', lambda db: database.get_metricas_series(db)),
+        ('get_funnel_metricas', lambda db: database.get_funnel_metricas(db)),
+        ('get_salarios_metricas', lambda db: database.get_salarios_metricas(db)),
+        ('get_metricas_series[mes]', lambda db: database.get_metricas_series(db, 'mes', date(2020, 1, 1))),
+        ('get_seguimientos_pendientes', lambda db: database.get_seguimientos_pendientes(db)),
+        ('get_postulaciones_para_exportar', lambda db: database.get_postulaciones_para_exportar(db)),
+        ('compute_dashboard_stats', lambda db: database.compute_dashboard_stats(db)),
+        ('verify_stats', lambda db: database.verify_stats(db)),
+    ]
+
+
+def full_scans(plan_rows):
+    """Plan lines that scan a whole table (not an index, a virtual table or a subquery)"""
+    subconsultas = {
+        detalle.split(' ', 1)[1] for detalle in plan_rows
+        if detalle.startswith(('CO-ROUTINE ', 'MATERIALIZE '))
+    }
+    return [
+        detalle for detalle in plan_rows
+        if detalle.startswith('SCAN ') and 'USING' not in detalle and 'VIRTUAL TABLE' not in detalle
+        and detalle.split(' ', 1)[1] not in subconsultas and detalle.split()[1] not in SMALL_TABLES
+    ]
+
+
+def crear_base(ruta: str, rows: int = 2000):
+    """Synthetic database at ruta, analyzed so the planner sees realistic statistics"""
+    engine, Session = create_database(f"sqlite:///{ruta}", rows)
+    with engine.begin() as conn:
+        conn.exec_driver_sql('ANALYZE')
+    return engine, Session
+
+
+def explicar(engine, Session, caso) -> Tuple[List[List[str]], List[str]]:
+    """Query plan of every SELECT the case issues, and the full scans among them"""
+    capturadas = []
+    
+    def capturar(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            capturadas.append((statement, parameters))
+    
+    # Cached results would skip the queries
+    database._despues_de_escribir()
+    event.listen(engine, 'before_cursor_execute', capturar)
+    try:
+        with Session() as db:
+            caso(db)
+    finally:
+        event.remove(engine, 'before_cursor_execute', capturar)
+    
+    planes = []
+    scans = []
+    with engine.connect() as conn:
+        for statement, parameters in capturadas:
+            rows = conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).all()
+            plan = [row[-1] for row in rows]
+            planes.append(plan)
+            scans += full_scans(plan)
+    return planes, scans
+
+
+def main(verbose=False) -> int:
+    fallas = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, Session = crear_base(os.path.join(tmp, 'plans.db'))
+        for nombre, caso in plan_cases():
+            planes, scans = explicar(engine, Session, caso)
+            base = nombre.split('[')[0]
+            if scans and base not in FULL_SCAN_OK:
+                estado = 'FAIL'
+                fallas += 1
+            else:
+                estado = 'ok  ' if not scans else 'scan'
+            print(f"{estado} {nombre} ({len(planes)} queries){': ' + '; '.join(scans) if scans else ''}")
+            if verbose:
+                for plan in planes:
+                    for linea in plan:
+                        print(f"       {linea}")
+        engine.dispose()
+    
+    if fallas:
+        print(f"{fallas} read path(s) regressed to a full table scan")
+    return 1 if fallas else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(verbose='-v' in sys.argv))
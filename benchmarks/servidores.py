@@ -0,0 +1,21 @@
+"""
+Helpers for benchmarks that run the app in a server process
+"""
+import time
+
+import httpx
+
+
+def esperar_listo(proceso, base: str, limite: float = 60):
+    """Wait until the server started as `proceso` answers /api/stats at base"""
+    fin = time.time() + limite
+    while time.time() < fin:
+        if proceso.poll() is not None:
+            raise RuntimeError(f"el servidor terminó antes de estar listo (código {proceso.returncode})")
+        try:
+            if httpx.get(f'{base}/api/stats', timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{base} no respondió a tiempo")
@@ -0,0 +1,300 @@
+"""
+Benchmark suite: times the database.py functions and the HTTP routes against a
+fresh synthetic SQLite database and saves the results as JSON, so runs on
+different commits can be compared.
+
+Usage:
+    python -m benchmarks.suite run [--filas 100000] [--seed 42] [--iteraciones 30]
+                                   [--distribucion Postulado=40,Entrevista=10,...]
+                                   [--notas 0:60] [--tags 16] [--tags-por-fila 0:3]
+                                   [--cache] [--salida benchmarks/resultados/x.json]
+    python -m benchmarks.suite comparar base.json nuevo.json [--umbral 10]
+
+Caches are cleared before every iteration unless --cache is given, so the
+numbers are the cost of actually running the queries.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+DIRECTORIO_RESULTADOS = os.path.join(os.path.dirname(__file__), 'resultados')
+
+
+def percentil(valores: List[float], p: float) -> float:
+    """Nearest-rank percentile"""
+    ordenados = sorted(valores)
+    return ordenados[max(0, -(-len(ordenados) * p // 100) - 1)]
+
+
+def resumen(tiempos: List[float], filas: Optional[int]) -> Dict[str, Any]:
+    p50 = percentil(tiempos, 50)
+    return {
+        'n': len(tiempos),
+        'p50_ms': round(p50 * 1000, 3),
+        'p99_ms': round(percentil(tiempos, 99) * 1000, 3),
+        'media_ms': round(statistics.mean(tiempos) * 1000, 3),
+        'filas': filas,
+        'filas_por_s': round(filas / p50) if filas and p50 > 0 else None,
+    }
+
+
+def contar_filas(resultado) -> Optional[int]:
+    if isinstance(resultado, list):
+        return len(resultado)
+    if isinstance(resultado, dict):
+        for clave in ('items', 'series'):
+            if isinstance(resultado.get(clave), list):
+                return len(resultado[clave])
+    return None
+
+
+def version_git() -> Optional[str]:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+        sucio = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True, text=True).stdout.strip()
+        return commit + ('-dirty' if sucio else '')
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def casos_funciones(database, importacion, synthetic, n: int) -> List[tuple]:
+    """(name, fn(db, i)) for the read and write paths in database.py
+
+    Cases named with a trailing '*' return the number of rows they processed.
+    """
+    from datetime import date
+    cursor = database.encode_cursor(database.Postulacion(id=n // 2, fecha_postulacion=date.today()))
+    id_medio = max(1, n // 2)
+
+    def exportar(db, i):
+        return sum(len(lote) for lote in database.iter_postulaciones_para_exportar(db))
+
+    def crear_y_borrar(db, i):
+        p = database.create_postulacion(db, f'Bench {i}', 'Puesto', fecha_postulacion=date.today(), tags='python, bench')
+        database.delete_postulacion(db, p.id)
+
+    def cambiar_estado(db, i):
+        return database.update_postulacion(db, id_medio, estado='Entrevista' if i % 2 else 'En revisión')
+
+    def importar(db, i):
+        filas = list(synthetic.generate_postulaciones(1000, seed=10_000 + i))
+        for j, fila in enumerate(filas):
+            fila['url_oferta'] = f'https://bench.example.com/{i}/{j}'
+            fila['fecha_postulacion'] = fila['fecha_postulacion'].isoformat()
+            for campo in ('fecha_seguimiento', 'fecha_respuesta'):
+                fila[campo] = fila[campo].isoformat() if fila[campo] else ''
+        return importacion.importar_filas(db, filas).insertadas
+
+    return [
+        ('get_postulacion', lambda db, i: database.get_postulacion(db, id_medio)),
+        ('get_postulaciones', lambda db, i: database.get_postulaciones(db, limit=50)),
+        ('get_postulaciones[estado]', lambda db, i: database.get_postulaciones(db, limit=50, estado='Entrevista')),
+        ('get_postulaciones[tags]', lambda db, i: database.get_postulaciones(db, limit=50, tags='python,remoto')),
+        ('get_postulaciones[search]', lambda db, i: database.get_postulaciones(db, limit=50, search='entrevista')),
+        ('get_postulaciones_pagina[after]', lambda db, i: database.get_postulaciones_pagina(db, limit=50, after=cursor)),
+        ('count_postulaciones', lambda db, i: database.count_postulaciones(db)),
+        ('count_postulaciones[search]', lambda db, i: database.count_postulaciones(db, search='entrevista')),
+        ('buscar_postulaciones', lambda db, i: database.buscar_postulaciones(db, 'backend')),
+        ('get_tag_facets', lambda db, i: database.get_tag_facets(db)),
+        ('get_dashboard_stats', lambda db, i: database.get_dashboard_stats(db)),
+        ('compute_dashboard_stats', lambda db, i: database.compute_dashboard_stats(db)),
+        ('get_seguimientos_pendientes', lambda db, i: database.get_seguimientos_pendientes(db)),
+        ('get_metricas_series[semana]', lambda db, i: database.get_metricas_series(db, 'semana')),
+        ('get_funnel_metricas', lambda db, i: database.get_funnel_metricas(db)),
+        ('get_salarios_metricas', lambda db, i: database.get_salarios_metricas(db)),
+        ('get_postulaciones[salario]', lambda db, i: database.get_postulaciones(db, limit=50, salario_desde=3000, salario_moneda='USD')),
+        ('iter_postulaciones_para_exportar*', exportar),
+        ('create_postulacion+delete_postulacion', crear_y_borrar),
+        ('update_postulacion[estado]', cambiar_estado),
+        ('importar_filas[1000]*', importar),
+    ]
+
+
+def rutas(n: int) -> List[str]:
+    id_medio = max(1, n // 2)
+    return [
+        '/',
+        '/postulaciones',
+        '/postulaciones?estado=Entrevista',
+        '/postulaciones?search=entrevista',
+        f'/postulaciones/{id_medio}',  # Reported as /postulaciones/{id} so runs of any size line up
+        '/metricas',
+        '/api/stats',
+        '/api/seguimientos',
+        '/api/postulaciones?limit=50',
+        '/api/postulaciones?limit=50&tags=python,remoto',
+        '/api/buscar?q=backend',
+        '/api/tags',
+        '/api/metricas/series?granularidad=semana',
+        '/api/metricas/funnel',
+        '/api/metricas/salarios',
+        '/exportar/csv',
+    ]
+
+
+def medir(fn: Callable[[int], Any], iteraciones: int, limpiar: Callable[[], None], devuelve_filas: bool = False) -> Dict[str, Any]:
+    fn(-1)  # Warm-up: compiled statement cache, page cache, template compilation
+    tiempos = []
+    resultado = None
+    for i in range(iteraciones):
+        limpiar()
+        inicio = time.perf_counter()
+        resultado = fn(i)
+        tiempos.append(time.perf_counter() - inicio)
+    filas = resultado if devuelve_filas else contar_filas(resultado)
+    return resumen(tiempos, filas)
+
+
+async def medir_rutas(app, caminos: List[str], iteraciones: int, limpiar, n: int) -> Dict[str, Dict[str, Any]]:
+    import httpx
+    resultados = {}
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transporte, base_url='http://bench') as cliente:
+        for camino in caminos:
+            respuesta = await cliente.get(camino)
+            assert respuesta.status_code == 200, (camino, respuesta.status_code)
+            tiempos = []
+            for _ in range(iteraciones):
+                limpiar()
+                inicio = time.perf_counter()
+                respuesta = await cliente.get(camino)
+                tiempos.append(time.perf_counter() - inicio)
+            filas = n if camino.startswith('/exportar') else None
+            nombre = 'GET ' + re.sub(r'/\d+$', '/{id}', camino)
+            resultados[nombre] = r = {**resumen(tiempos, filas), 'bytes': len(respuesta.content)}
+            print(f"  {nombre:<52} p50 {r['p50_ms']:>9.2f} ms  p99 {r['p99_ms']:>9.2f} ms")
+    return resultados
+
+
+def ejecutar(args) -> int:
+    directorio = tempfile.mkdtemp(prefix='bench-suite-')
+    url = f"sqlite:///{os.path.join(directorio, 'suite.db')}"
+    # database.py binds its engine at import time, so point it at the benchmark database first
+    os.environ['DATABASE_URL'] = url
+    os.environ.pop('ASYNC_DATABASE_URL', None)
+    import cache
+    import database
+    import importacion
+    from benchmarks import synthetic
+
+    opciones = {
+        'distribucion': synthetic.parse_distribucion(args.distribucion) if args.distribucion else None,
+        'notas_palabras': tuple(int(x) for x in args.notas.split(':')),
+        'vocabulario_tags': synthetic.TAGS[:args.tags] if args.tags <= len(synthetic.TAGS)
+        else synthetic.TAGS + [f'tag{i}' for i in range(args.tags - len(synthetic.TAGS))],
+        'tags_por_fila': tuple(int(x) for x in args.tags_por_fila.split(':')),
+    }
+    inicio = time.perf_counter()
+    engine, _ = synthetic.create_database(url, args.filas, seed=args.seed, **opciones)
+    engine.dispose()
+    generacion = time.perf_counter() - inicio
+    print(f"{args.filas} filas generadas en {generacion:.1f} s ({directorio})")
+
+    limpiar = (lambda: None) if args.cache else cache.invalidar_todo
+    resultados = {}
+
+    print("Funciones de database.py:")
+    with database.SessionLocal() as db:
+        for nombre, caso in casos_funciones(database, importacion, synthetic, args.filas):
+            devuelve_filas = nombre.endswith('*')
+            nombre = nombre.rstrip('*')
+            resultados[nombre] = medir(lambda i: caso(db, i), args.iteraciones, limpiar, devuelve_filas)
+            r = resultados[nombre]
+            extra = f"  {r['filas_por_s']:>10,} filas/s" if r['filas_por_s'] else ''
+            print(f"  {nombre:<52} p50 {r['p50_ms']:>9.2f} ms  p99 {r['p99_ms']:>9.2f} ms{extra}")
+
+    print("Rutas (cliente ASGI en proceso):")
+    import main
+    resultados.update(asyncio.run(medir_rutas(main.app, rutas(args.filas), args.iteraciones, limpiar, args.filas)))
+
+    import sqlalchemy
+    salida = args.salida or os.path.join(
+        DIRECTORIO_RESULTADOS, f"{datetime.now():%Y%m%d-%H%M%S}-{version_git() or 'sin-git'}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(salida)), exist_ok=True)
+    with open(salida, 'w', encoding='utf-8') as f:
+        json.dump({
+            'meta': {
+                'commit': version_git(),
+                'fecha': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'sqlalchemy': sqlalchemy.__version__,
+                'sqlite': database.engine.dialect.dbapi.sqlite_version,
+                'plataforma': platform.platform(),
+                'filas': args.filas,
+                'seed': args.seed,
+                'iteraciones': args.iteraciones,
+                'cache': args.cache,
+                'opciones': {k: v for k, v in vars(args).items() if k not in ('func', 'salida')},
+                'generacion_s': round(generacion, 2),
+            },
+            'resultados': resultados,
+        }, f, indent=2, ensure_ascii=False)
+    print(f"Resultados en {salida}")
+    database.engine.dispose()
+    shutil.rmtree(directorio, ignore_errors=True)
+    return 0
+
+
+def comparar(args) -> int:
+    with open(args.base, encoding='utf-8') as f:
+        base = json.load(f)
+    with open(args.nuevo, encoding='utf-8') as f:
+        nuevo = json.load(f)
+    if base['meta'].get('filas') != nuevo['meta'].get('filas'):
+        print(f"Aviso: tamaños distintos ({base['meta'].get('filas')} vs {nuevo['meta'].get('filas')} filas)")
+    print(f"{'caso':<56} {'base p50':>10} {'nuevo p50':>10} {'cambio':>8}")
+    regresiones = 0
+    for nombre in list(base['resultados']) + [n for n in nuevo['resultados'] if n not in base['resultados']]:
+        antes = base['resultados'].get(nombre, {}).get('p50_ms')
+        despues = nuevo['resultados'].get(nombre, {}).get('p50_ms')
+        if antes is None or despues is None:
+            print(f"{nombre:<56} {antes if antes is not None else '-':>10} {despues if despues is not None else '-':>10}")
+            continue
+        cambio = (despues - antes) / antes * 100 if antes else 0
+        marca = ''
+        if cambio > args.umbral:
+            marca = '  REGRESIÓN'
+            regresiones += 1
+        print(f"{nombre:<56} {antes:>10.2f} {despues:>10.2f} {cambio:>+7.1f}%{marca}")
+    if regresiones:
+        print(f"{regresiones} caso(s) más de {args.umbral}% más lentos")
+    return 1 if regresiones else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark suite for Job Application Tracker")
+    sub = parser.add_subparsers(dest='command', required=True)
+    run = sub.add_parser('run', help="Generate a synthetic database and time functions and routes")
+    run.add_argument('--filas', type=int, default=100000)
+    run.add_argument('--seed', type=int, default=42)
+    run.add_argument('--iteraciones', type=int, default=30)
+    run.add_argument('--distribucion', help="Estado weights, e.g. Postulado=40,Entrevista=10")
+    run.add_argument('--notas', default='0:60', help="min:max words in notas")
+    run.add_argument('--tags', type=int, default=16, help="Tag vocabulary size")
+    run.add_argument('--tags-por-fila', default='0:3', help="min:max tags per application")
+    run.add_argument('--cache', action='store_true', help="Keep read caches warm between iterations")
+    run.add_argument('--salida', help="JSON output path (default: benchmarks/resultados/<fecha>-<commit>.json)")
+    run.set_defaults(func=ejecutar)
+    cmp = sub.add_parser('comparar', help="Compare two result files (p50)")
+    cmp.add_argument('base')
+    cmp.add_argument('nuevo')
+    cmp.add_argument('--umbral', type=float, default=10.0, help="Regression threshold in percent")
+    cmp.set_defaults(func=comparar)
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Synthetic Postulacion datasets for benchmarks
+
+Rows are deterministic for a given seed and parameters, so runs on different
+commits measure the same data.
+"""
+import random
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from database import (
+    Postulacion, ESTADOS, create_schema, rebuild_stats, seed_historial, migrate_tags, huella_postulacion
+)
+from salarios import columnas_salario
+
+EMPRESAS = ['Globant', 'Mercado Libre', 'Despegar', 'Accenture', 'Ualá', 'Naranja X',
+            'Auth0', 'Satellogic', 'Tiendanube', 'Belatrix', 'Baufest', 'Endava']
+PUESTOS = ['Backend Developer', 'Frontend Developer', 'Data Analyst', 'QA Automation',
+           'DevOps Engineer', 'Editor de video', 'Técnico audiovisual', 'Full Stack Developer']
+UBICACIONES = ['Buenos Aires', 'Córdoba', 'Rosario', 'Mendoza', 'Montevideo', 'Santiago', 'Remoto LATAM']
+MODALIDADES = ['Remoto', 'Híbrido', 'Presencial']
+# salario_ofrecido texts; {0} is 15-59 and {1} is {0} + 10
+FORMATOS_SALARIO = ['USD {0}00', 'USD {0}00 - {1}00 mensual', 'US$ {0},000 anual', '{0}-{1}k USD/año', '$ {0}00.000 mensual']
+PALABRAS_NOTAS = (
+    'entrevista técnica recruiter revisión cv feedback equipo python django react sql '
+    'salario beneficios seguimiento llamada email prueba desafío inglés senior semi junior '
+    'cultura producto proceso respuesta pendiente oferta contrato remoto oficina'
+).split()
+TAGS = ['python', 'remoto', 'senior', 'fintech', 'startup', 'backend', 'frontend', 'data',
+        'devops', 'ingles', 'referido', 'linkedin', 'urgente', 'freelance', 'ecommerce', 'salud']
+
+# Rough shape of a real search: most applications never get past the first stages
+DISTRIBUCION_ESTADOS = {
+    'Postulado': 35, 'En revisión': 15, 'Sin respuesta': 20, 'Rechazado': 18,
+    'Entrevista': 7, 'Oferta': 3, 'Aceptado': 2,
+}
+
+
+def parse_distribucion(texto: str) -> Dict[str, float]:
+    """'Postulado=40,Entrevista=10' -> weights (unlisted estados get 0)"""
+    pesos = {}
+    for parte in texto.split(','):
+        estado, _, peso = parte.partition('=')
+        if estado.strip() not in ESTADOS:
+            raise ValueError(f"estado desconocido: {estado!r}")
+        pesos[estado.strip()] = float(peso)
+    return pesos
+
+
+def _salario(rnd: random.Random, i: int) -> str:
+    # One draw, as before the formats were added, so older datasets keep their other columns
+    base = rnd.randrange(15, 60)
+    return FORMATOS_SALARIO[i % len(FORMATOS_SALARIO)].format(base, base + 10)
+
+
+def generate_postulaciones(
+    n: int,
+    seed: int = 42,
+    dias: int = 730,
+    distribucion: Optional[Dict[str, float]] = None,
+    notas_palabras: Tuple[int, int] = (0, 60),
+    vocabulario_tags: Optional[List[str]] = None,
+    tags_por_fila: Tuple[int, int] = (0, 3),
+) -> Iterator[Dict]:
+    """Yield n realistic-looking postulacion rows spread over the last `dias` days
+
+    distribucion weights the estados (default DISTRIBUCION_ESTADOS), notas_palabras
+    is the (min, max) word count of notas and tags_por_fila the (min, max) number
+    of tags drawn from vocabulario_tags.
+    """
+    rnd = random.Random(seed)
+    hoy = date.today()
+    now = datetime.now()
+    pesos = distribucion or DISTRIBUCION_ESTADOS
+    estados = [e for e in pesos if pesos[e] > 0]
+    acumulados = []
+    total = 0
+    for estado in estados:
+        total += pesos[estado]
+        acumulados.append(total)
+    vocabulario = vocabulario_tags or TAGS
+
+    for i in range(n):
+        fecha_post = hoy - timedelta(days=rnd.randrange(dias))
+        estado = rnd.choices(estados, cum_weights=acumulados)[0]
+        fecha_resp = None
+        if estado not in ('Postulado', 'Sin respuesta', 'En revisión'):
+            fecha_resp = fecha_post + timedelta(days=rnd.randrange(1, 45))
+        fecha_seg = fecha_post + timedelta(days=rnd.randrange(3, 21)) if rnd.random() < 0.6 else None
+        n_palabras = rnd.randint(*notas_palabras)
+        n_tags = min(rnd.randint(*tags_por_fila), len(vocabulario))
+        empresa = rnd.choice(EMPRESAS)
+        puesto = rnd.choice(PUESTOS)
+        url = f'https://example.com/ofertas/{i}'
+        fila = {
+            'empresa': empresa,
+            'puesto': puesto,
+            'url_oferta': url,
+            'fecha_postulacion': fecha_post,
+            'estado': estado,
+            'notas': ' '.join(rnd.choices(PALABRAS_NOTAS, k=n_palabras)) or None,
+            'fecha_seguimiento': fecha_seg,
+            'fecha_respuesta': fecha_resp,
+            'tags': ', '.join(rnd.sample(vocabulario, n_tags)) or None,
+            'contacto_nombre': f'Recruiter {rnd.randrange(500)}' if rnd.random() < 0.4 else None,
+            'contacto_email': f'recruiter{rnd.randrange(500)}@example.com' if rnd.random() < 0.3 else None,
+            'salario_ofrecido': _salario(rnd, i) if rnd.random() < 0.25 else None,
+            'ubicacion': rnd.choice(UBICACIONES),
+            'modalidad': rnd.choice(MODALIDADES),
+            'huella': huella_postulacion(empresa, puesto, url),
+            'created_at': now,
+            'updated_at': now,
+        }
+        fila.update(columnas_salario(fila['salario_ofrecido']))
+        yield fila
+
+
+def create_database(url: str, n: int, seed: int = 42, batch: int = 10000, **opciones):
+    """Create a fresh database at `url` with n synthetic rows; returns (engine, Session)
+
+    Extra keyword arguments go to generate_postulaciones.
+    """
+    engine = create_engine(url)
+    create_schema(engine)
+    filas = generate_postulaciones(n, seed, **opciones)
+    with engine.begin() as conn:
+        while True:
+            lote = [f for _, f in zip(range(batch), filas)]
+            if not lote:
+                break
+            conn.execute(insert(Postulacion), lote)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        rebuild_stats(db)
+        seed_historial(db)
+        migrate_tags(db)
+    return engine, Session
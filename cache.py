@@ -0,0 +1,261 @@
+"""
+In-process read cache for Job Application Tracker
+
+Bounded LRU caches with a TTL for the read functions in database.py. Keys are
+the call arguments (minus the session) plus today's date, so results that
+depend on "hoy" roll over at midnight. database._despues_de_escribir clears
+every cache after a committed write; the TTL only bounds staleness from
+writes made by other processes.
+
+The same hook bumps a data version, used by main.py for ETag/Last-Modified.
+With several worker processes (servidor.py), CACHE_VERSION_ARCHIVO names a
+small memory-mapped file holding that version, so a write in one worker
+invalidates the caches and ETags of all of them.
+"""
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Seconds an entry stays valid; 0 disables caching
+CACHE_TTL = float(os.getenv('CACHE_TTL', '60'))
+# Shared version file for multi-process deployments; unset keeps the version in-process
+CACHE_VERSION_ARCHIVO = os.getenv('CACHE_VERSION_ARCHIVO')
+
+_SIN_VALOR = object()
+
+# Data version: process start id plus a write counter, so ETags never repeat across restarts
+_ARRANQUE = f'{time.time_ns():x}'
+_version = 0
+_ultima_escritura = datetime.now(timezone.utc).replace(microsecond=0)
+_version_lock = threading.Lock()
+
+
+class VersionCompartida:
+    """Write counter shared by processes through a memory-mapped file
+    
+    Layout: creation id, version and last write (epoch seconds). Reads are a
+    plain memory read; increments hold database.bloqueo_archivo on the file.
+    """
+    FORMATO = struct.Struct('<QQd')
+    
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        with self._bloqueo():
+            self._fd = os.open(ruta, os.O_RDWR | os.O_CREAT, 0o644)
+            if os.fstat(self._fd).st_size < self.FORMATO.size:
+                os.ftruncate(self._fd, self.FORMATO.size)
+                os.pwrite(self._fd, self.FORMATO.pack(time.time_ns(), 0, time.time()), 0)
+        self._mapa = mmap.mmap(self._fd, self.FORMATO.size)
+    
+    def _bloqueo(self):
+        # Imported here: database.py imports this module
+        from database import bloqueo_archivo
+        return bloqueo_archivo(self.ruta)
+    
+    def leer(self) -> Tuple[int, int, float]:
+        """(creation id, version, last write timestamp)"""
+        return self.FORMATO.unpack_from(self._mapa)
+    
+    def incrementar(self):
+        with self._bloqueo():
+            arranque, version, _ = self.leer()
+            self.FORMATO.pack_into(self._mapa, 0, arranque, version + 1, time.time())
+    
+    def nuevo_arranque(self):
+        """New creation id, plus an increment so every worker drops its caches"""
+        with self._bloqueo():
+            _, version, _ = self.leer()
+            self.FORMATO.pack_into(self._mapa, 0, time.time_ns(), version + 1, time.time())
+
+
+_compartida: Optional[VersionCompartida] = None
+# Shared version the local caches were last validated against
+_version_vista = 0
+
+
+def _version_compartida() -> Optional[VersionCompartida]:
+    """The shared version file, opened on first use (its lock lives in database.py)"""
+    global _compartida, _version_vista
+    if _compartida is None and CACHE_VERSION_ARCHIVO:
+        with _version_lock:
+            if _compartida is None:
+                compartida = VersionCompartida(CACHE_VERSION_ARCHIVO)
+                _version_vista = compartida.leer()[1]
+                _compartida = compartida
+    return _compartida
+
+
+class CacheTTL:
+    """Thread-safe LRU cache with a per-entry time to live and hit/miss counters"""
+
+    def __init__(self, nombre: str, maxsize: int = 256, ttl: float = CACHE_TTL):
+        self.nombre = nombre
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._datos: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by clear(); values computed before an invalidation are not stored
+        self.generacion = 0
+        self.hits = self.misses = self.expiradas = self.desalojadas = 0
+
+    def get(self, clave: Hashable) -> Any:
+        """Cached value for clave, or _SIN_VALOR"""
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is not None:
+                vence, valor = entrada
+                if vence > time.monotonic():
+                    self._datos.move_to_end(clave)
+                    self.hits += 1
+                    return valor
+                del self._datos[clave]
+                self.expiradas += 1
+            self.misses += 1
+            return _SIN_VALOR
+
+    def set(self, clave: Hashable, valor: Any, generacion: int):
+        with self._lock:
+            if generacion != self.generacion:
+                return
+            self._datos[clave] = (time.monotonic() + self.ttl, valor)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.maxsize:
+                self._datos.popitem(last=False)
+                self.desalojadas += 1
+
+    def clear(self):
+        with self._lock:
+            self._datos.clear()
+            self.generacion += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            consultas = self.hits + self.misses
+            return {
+                'size': len(self._datos),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / consultas, 3) if consultas else None,
+                'expiradas': self.expiradas,
+                'desalojadas': self.desalojadas,
+                'invalidaciones': self.generacion
+            }
+
+
+# Every cache created by @cacheado, by name
+_caches: Dict[str, CacheTTL] = {}
+
+
+def _congelar(valor: Any) -> Hashable:
+    """Make list arguments usable as part of a key"""
+    if isinstance(valor, (list, set)):
+        return tuple(valor)
+    return valor
+
+
+def nueva_cache(nombre: str, maxsize: int = 256, ttl: float = CACHE_TTL) -> CacheTTL:
+    """Create a cache that is cleared on every write and reported by estadisticas()"""
+    cache = _caches[nombre] = CacheTTL(nombre, maxsize, ttl)
+    return cache
+
+
+def cacheado(maxsize: int = 256, ttl: float = CACHE_TTL) -> Callable:
+    """Cache a `fn(db, *args, **kwargs)` read function; the session is not part of the key"""
+    def decorador(fn):
+        cache = nueva_cache(fn.__name__, maxsize, ttl)
+
+        @wraps(fn)
+        def envoltura(db, *args, **kwargs):
+            if cache.ttl <= 0:
+                return fn(db, *args, **kwargs)
+            if _version_compartida() is not None:
+                _sincronizar()
+            clave = (
+                tuple(_congelar(a) for a in args),
+                tuple(sorted((k, _congelar(v)) for k, v in kwargs.items())),
+                date.today()
+            )
+            try:
+                valor = cache.get(clave)
+            except TypeError:  # Unhashable argument
+                return fn(db, *args, **kwargs)
+            if valor is _SIN_VALOR:
+                generacion = cache.generacion
+                valor = fn(db, *args, **kwargs)
+                cache.set(clave, valor, generacion)
+            return valor
+
+        envoltura.cache = cache
+        return envoltura
+    return decorador
+
+
+def _limpiar_caches():
+    for cache in _caches.values():
+        cache.clear()
+
+
+def _sincronizar():
+    """Drop local results if another process has written since they were cached"""
+    global _version_vista
+    version = _compartida.leer()[1]
+    if version != _version_vista:
+        with _version_lock:
+            if version != _version_vista:
+                _version_vista = version
+                _limpiar_caches()
+
+
+def invalidar_todo():
+    """Drop every cached result and bump the data version (called after each committed write)"""
+    global _version, _ultima_escritura
+    compartida = _version_compartida()
+    if compartida is not None:
+        compartida.incrementar()
+    with _version_lock:
+        _version += 1
+        _ultima_escritura = datetime.now(timezone.utc).replace(microsecond=0)
+    _limpiar_caches()
+
+
+def nuevo_arranque():
+    """Make the data version (and so every ETag) differ from any given before this start
+
+    The shared file outlives the server; without a new creation id a restart
+    would hand out the ETags of before it, though the data may have changed
+    while it was down.
+    """
+    compartida = _version_compartida()
+    if compartida is not None:
+        compartida.nuevo_arranque()
+        _sincronizar()
+
+
+def version_datos() -> str:
+    """Opaque identifier of the current data; changes on every write"""
+    compartida = _version_compartida()
+    if compartida is not None:
+        arranque, version, _ = compartida.leer()
+        return f'{arranque:x}-{version}'
+    return f'{_ARRANQUE}-{_version}'
+
+
+def ultima_escritura() -> datetime:
+    """UTC time of the last write (or process start), truncated to seconds for HTTP dates"""
+    compartida = _version_compartida()
+    if compartida is not None:
+        return datetime.fromtimestamp(int(compartida.leer()[2]), timezone.utc)
+    return _ultima_escritura
+
+
+def estadisticas() -> Dict[str, Dict[str, Any]]:
+    """Counters of every cache, for monitoring"""
+    return {nombre: cache.stats() for nombre, cache in _caches.items()}
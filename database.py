@@ -1,28 +1,139 @@
 """
 Database models and operations for Job Application Tracker
 """
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, Float, Date
+from sqlalchemy import (
+    create_engine, Column, Integer, String, DateTime, Text, Float, Date, ForeignKey, Index,
+    select, func, case, cast, literal, null, and_, or_, update, delete, insert, tuple_, bindparam,
+    text, table, column, inspect, event
+)
+from sqlalchemy.engine import Row, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from contextlib import contextmanager
+from datetime import datetime, date, time, timedelta
+from typing import List, Optional, Dict, Any, Tuple, Union
+import hashlib
+import html
 import os
+import re
+import unicodedata
+
+from cache import cacheado, invalidar_todo
+from salarios import COLUMNAS_SALARIO, columnas_salario
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process only
+    fcntl = None
 
 # Create data directory if it doesn't exist
 os.makedirs('data', exist_ok=True)
+ARCHIVO_BLOQUEO_ESQUEMA = os.path.join('data', '.esquema.lock')
 
 # Database setup
 DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///data/job_tracker.db')
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+
+# Pragmas run on every new SQLite connection. WAL lets readers proceed while a
+# writer (e.g. a CSV import) holds the database; NORMAL sync is durable in WAL
+# mode except for the last commits on power loss. cache_size < 0 is KiB.
+PERFIL_SQLITE = {
+    'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'cache_size': int(os.getenv('SQLITE_CACHE_SIZE', '-65536')),
+    'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024))),
+    'temp_store': os.getenv('SQLITE_TEMP_STORE', 'MEMORY'),
+    'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', '5000')),  # ms
+}
+# Connections kept open per engine, plus extra ones allowed under load
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '10'))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '20'))
+
+
+def aplicar_perfil_sqlite(engine, perfil: Optional[Dict[str, Any]] = None):
+    """Run the PERFIL_SQLITE pragmas on each new connection of a SQLite engine
+
+    Works for sync engines and for the sync_engine of an aiosqlite AsyncEngine.
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+    perfil = PERFIL_SQLITE if perfil is None else perfil
+    memoria = engine.url.database in (None, '', ':memory:')
+
+    @event.listens_for(engine, 'connect')
+    def configurar(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma, valor in perfil.items():
+            if memoria and pragma in ('journal_mode', 'mmap_size'):
+                continue
+            cursor.execute(f'PRAGMA {pragma} = {valor}')
+        cursor.close()
+
+
+def opciones_pool(url: str) -> Dict[str, Any]:
+    """Pool sizing for an engine on url (sync or async driver)
+
+    In-memory SQLite gets a single-connection StaticPool, which takes no sizing.
+    """
+    url = make_url(url)
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return {}
+    return {'pool_size': DB_POOL_SIZE, 'max_overflow': DB_MAX_OVERFLOW}
+
+
+def crear_engine(url: str, **kwargs):
+    """Engine for url with the SQLite profile and pool sizing applied"""
+    opciones = opciones_pool(url)
+    if url.startswith('sqlite'):
+        opciones['connect_args'] = {"check_same_thread": False}
+    else:
+        opciones['pool_pre_ping'] = True
+    opciones.update(kwargs)
+    nuevo = create_engine(url, **opciones)
+    aplicar_perfil_sqlite(nuevo)
+    return nuevo
+
+
+engine = crear_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 # Estado enum values
 ESTADOS = ['Postulado', 'En revisión', 'Entrevista', 'Oferta', 'Rechazado', 'Aceptado', 'Sin respuesta']
 
+# Days in 'Postulado' after which an application counts as unanswered
+DIAS_SIN_RESPUESTA = 14
+
+# Columns the salary medians are grouped by
+DIMENSIONES_SALARIO = ('modalidad', 'ubicacion')
+
 
 class Postulacion(Base):
     __tablename__ = 'postulaciones'
+    __table_args__ = (
+        # Default list ordering, keyset pagination and date-window counts
+        Index('ix_postulaciones_fecha_postulacion_id', 'fecha_postulacion', 'id'),
+        # Estado filter ordered by date, and the "sin respuesta" aging check
+        Index('ix_postulaciones_estado_fecha_postulacion', 'estado', 'fecha_postulacion'),
+        # Pending follow-ups (estado IN (...) AND fecha_seguimiento <= ?)
+        Index('ix_postulaciones_estado_fecha_seguimiento', 'estado', 'fecha_seguimiento'),
+        # Responses per period in the metrics time series
+        Index('ix_postulaciones_fecha_respuesta', 'fecha_respuesta'),
+        # Import deduplication (INSERT ... ON CONFLICT (huella)); NULLs never collide
+        Index('ux_postulaciones_huella', 'huella', unique=True),
+        # Salary range filters (offers overlapping [desde, hasta])
+        Index('ix_postulaciones_salario_min', 'salario_min'),
+        Index('ix_postulaciones_salario_max', 'salario_max'),
+        # Salary medians: only the rows with a salary, in window partition order, so
+        # the table isn't read and only each partition's midpoints get sorted
+        *(
+            Index(
+                f'ix_postulaciones_{dimension}_salario', dimension, 'salario_moneda', 'salario_periodo',
+                'salario_min', 'salario_max',
+                sqlite_where=text('salario_min IS NOT NULL'), postgresql_where=text('salario_min IS NOT NULL')
+            )
+            for dimension in DIMENSIONES_SALARIO
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     empresa = Column(String(200), nullable=False, index=True)
@@ -37,14 +148,261 @@ class Postulacion(Base):
     contacto_nombre = Column(String(150), nullable=True)
     contacto_email = Column(String(150), nullable=True)
     salario_ofrecido = Column(String(50), nullable=True)
+    # Parsed from salario_ofrecido on every write (salarios.parsear_salario)
+    salario_min = Column(Float, nullable=True)
+    salario_max = Column(Float, nullable=True)
+    salario_moneda = Column(String(3), nullable=True)  # ISO code; NULL if the text doesn't say
+    salario_periodo = Column(String(4), nullable=True)  # hora, dia, mes, año
     ubicacion = Column(String(150), nullable=True)
     modalidad = Column(String(50), nullable=True)  # Remoto, Híbrido, Presencial
+    huella = Column(String(40), nullable=True)  # huella_postulacion(); NULL for manual duplicates
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+class Tag(Base):
+    __tablename__ = 'tags'
+    
+    id = Column(Integer, primary_key=True)
+    nombre = Column(String(100), nullable=False, unique=True)  # Normalized: stripped, lowercase
+
+
+class PostulacionTag(Base):
+    """Normalized copy of Postulacion.tags, kept in sync by the write functions"""
+    __tablename__ = 'postulacion_tags'
+    __table_args__ = (
+        Index('ix_postulacion_tags_tag_postulacion', 'tag_id', 'postulacion_id'),
+    )
+    
+    postulacion_id = Column(Integer, ForeignKey('postulaciones.id', ondelete='CASCADE'), primary_key=True)
+    tag_id = Column(Integer, ForeignKey('tags.id'), primary_key=True)
+
+
+class EstadoHistorial(Base):
+    """Append-only log of estado transitions (estado_anterior is NULL for the first one)"""
+    __tablename__ = 'estado_historial'
+    __table_args__ = (
+        Index('ix_estado_historial_postulacion_fecha', 'postulacion_id', 'fecha', 'id'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    postulacion_id = Column(Integer, ForeignKey('postulaciones.id', ondelete='CASCADE'), nullable=False)
+    estado_anterior = Column(String(50), nullable=True)
+    estado = Column(String(50), nullable=False)
+    fecha = Column(DateTime, nullable=False, default=datetime.now)
+
+
+class EstadoStats(Base):
+    """Materialized per-estado counters, kept up to date by the write functions"""
+    __tablename__ = 'stats_estados'
+    
+    estado = Column(String(50), primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    dias_respuesta_suma = Column(Integer, nullable=False, default=0)
+    dias_respuesta_n = Column(Integer, nullable=False, default=0)
+
+
+class DiarioStats(Base):
+    """Materialized application counts per fecha_postulacion and estado"""
+    __tablename__ = 'stats_diarios'
+    
+    fecha = Column(Date, primary_key=True)
+    estado = Column(String(50), primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+
+
+# SQLite full-text index over empresa/puesto/notas, synced by triggers.
+# remove_diacritics makes "revision" match "revisión".
+FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS postulaciones_fts USING fts5(
+        empresa, puesto, notas,
+        content='postulaciones', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS postulaciones_fts_ai AFTER INSERT ON postulaciones BEGIN
+        INSERT INTO postulaciones_fts(rowid, empresa, puesto, notas)
+        VALUES (new.id, new.empresa, new.puesto, new.notas);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS postulaciones_fts_ad AFTER DELETE ON postulaciones BEGIN
+        INSERT INTO postulaciones_fts(postulaciones_fts, rowid, empresa, puesto, notas)
+        VALUES ('delete', old.id, old.empresa, old.puesto, old.notas);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS postulaciones_fts_au AFTER UPDATE OF empresa, puesto, notas ON postulaciones BEGIN
+        INSERT INTO postulaciones_fts(postulaciones_fts, rowid, empresa, puesto, notas)
+        VALUES ('delete', old.id, old.empresa, old.puesto, old.notas);
+        INSERT INTO postulaciones_fts(rowid, empresa, puesto, notas)
+        VALUES (new.id, new.empresa, new.puesto, new.notas);
+    END""",
+]
+
+# Lightweight handle for querying the virtual table
+postulaciones_fts = table('postulaciones_fts', column('rowid'), column('postulaciones_fts'))
+
+# SQLite database file -> whether it has the FTS index (shared by the sync and async engines)
+_fts_databases: Dict[str, bool] = {}
+
+
+def _agregar_columnas(bind) -> List[str]:
+    """ALTER TABLE ADD COLUMN for model columns missing from existing tables"""
+    inspector = inspect(bind)
+    agregadas = []
+    for tabla in Base.metadata.sorted_tables:
+        existentes = {c['name'] for c in inspector.get_columns(tabla.name)}
+        for col in tabla.columns:
+            if col.name in existentes:
+                continue
+            tipo = col.type.compile(dialect=bind.dialect)
+            with bind.begin() as conn:
+                conn.execute(text(f'ALTER TABLE {tabla.name} ADD COLUMN {col.name} {tipo}'))
+            agregadas.append(f'{tabla.name}.{col.name}')
+    return agregadas
+
+
+def create_schema(bind):
+    """Create tables, plus the full-text index on SQLite builds that support FTS5"""
+    Base.metadata.create_all(bind=bind)
+    # create_all doesn't alter existing tables either
+    agregadas = _agregar_columnas(bind)
+    if 'postulaciones.huella' in agregadas:
+        rellenar_huellas(bind)
+    if 'postulaciones.salario_min' in agregadas:
+        rellenar_salarios(bind)
+    # create_all skips existing tables, so add indexes introduced later explicitly
+    for tabla in Base.metadata.sorted_tables:
+        for index in tabla.indexes:
+            index.create(bind=bind, checkfirst=True)
+    if bind.dialect.name != 'sqlite':
+        return
+    with bind.begin() as conn:
+        existia = conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE name = 'postulaciones_fts'"
+        )).first() is not None
+        try:
+            for ddl in FTS_DDL:
+                conn.execute(text(ddl))
+        except Exception as e:
+            print(f"FTS5 not available, using LIKE search: {e}")
+            _fts_databases[bind.url.database] = False
+            return
+        if not existia:
+            conn.execute(text("INSERT INTO postulaciones_fts(postulaciones_fts) VALUES ('rebuild')"))
+    _fts_databases[bind.url.database] = True
+
+
+@contextmanager
+def bloqueo_archivo(ruta: str, bloqueante: bool = True):
+    """Exclusive advisory lock on `ruta` across processes (no-op without fcntl)
+    
+    Yields whether the lock is held: with bloqueante=False it is False,
+    instead of waiting, when another process holds it.
+    """
+    os.makedirs(os.path.dirname(ruta) or '.', exist_ok=True)
+    with open(ruta, 'a') as f:
+        if fcntl:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX if bloqueante else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+        try:
+            yield True
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def init_db():
+    """Create tables and seed the materialized stats and tags for pre-existing data
+    
+    Serialized with a file lock, so workers starting together don't race on DDL.
+    """
+    with bloqueo_archivo(ARCHIVO_BLOQUEO_ESQUEMA):
+        create_schema(engine)
+        with SessionLocal() as db:
+            if db.query(EstadoStats).first() is None and db.query(Postulacion).first() is not None:
+                rebuild_stats(db)
+            if db.query(Tag).first() is None and db.query(Postulacion).filter(Postulacion.tags != None).first() is not None:
+                migrate_tags(db)
+            if db.query(EstadoHistorial).first() is None and db.query(Postulacion).first() is not None:
+                seed_historial(db)
+
+
+def _normalizar_texto(valor: Optional[str]) -> str:
+    """Casefold, drop accents and collapse whitespace"""
+    valor = unicodedata.normalize('NFKD', valor or '')
+    valor = ''.join(c for c in valor if not unicodedata.combining(c))
+    return ' '.join(valor.casefold().split())
+
+
+def huella_postulacion(empresa: Optional[str], puesto: Optional[str], url_oferta: Optional[str]) -> str:
+    """Identity of an application for import deduplication: sha1 of normalized empresa|puesto|url"""
+    url = re.sub(r'^https?://(www\.)?', '', (url_oferta or '').strip().lower()).rstrip('/')
+    clave = '\x1f'.join([_normalizar_texto(empresa), _normalizar_texto(puesto), url])
+    return hashlib.sha1(clave.encode('utf-8')).hexdigest()
+
+
+def _huella_libre(db, postulacion) -> Optional[str]:
+    """The application's huella, or None if another row already owns it
+    
+    Manual entries may duplicate an existing application on purpose; imports
+    match against the first one.
+    """
+    huella = huella_postulacion(postulacion.empresa, postulacion.puesto, postulacion.url_oferta)
+    duena = db.execute(select(Postulacion.id).where(Postulacion.huella == huella)).scalar()
+    return huella if duena is None or duena == postulacion.id else None
+
+
+def rellenar_huellas(bind):
+    """Fingerprint existing rows; later duplicates keep NULL so the unique index can be built"""
+    tabla = Postulacion.__table__
+    with bind.begin() as conn:
+        vistas = set()
+        valores = []
+        filas = conn.execute(
+            select(tabla.c.id, tabla.c.empresa, tabla.c.puesto, tabla.c.url_oferta).order_by(tabla.c.id)
+        )
+        for postulacion_id, empresa, puesto, url_oferta in filas:
+            huella = huella_postulacion(empresa, puesto, url_oferta)
+            if huella not in vistas:
+                vistas.add(huella)
+                valores.append({'b_id': postulacion_id, 'b_huella': huella})
+        if valores:
+            conn.execute(
+                update(tabla).where(tabla.c.id == bindparam('b_id')).values(huella=bindparam('b_huella')),
+                valores
+            )
+
+
+def rellenar_salarios(bind, batch: int = 1000) -> int:
+    """Parse salario_ofrecido of every row into the salario_* columns; returns rows with a salary text
+    
+    One transaction per `batch` rows, walking the primary key, so a large
+    table isn't locked for the whole backfill.
+    """
+    tabla = Postulacion.__table__
+    actualizar = update(tabla).where(tabla.c.id == bindparam('b_id')).values(
+        {c: bindparam(f'b_{c}') for c in COLUMNAS_SALARIO}
+    )
+    procesadas = 0
+    ultimo_id = 0
+    while True:
+        with bind.begin() as conn:
+            filas = conn.execute(
+                select(tabla.c.id, tabla.c.salario_ofrecido)
+                .where(tabla.c.id > ultimo_id, tabla.c.salario_ofrecido != None)
+                .order_by(tabla.c.id)
+                .limit(batch)
+            ).all()
+            if not filas:
+                break
+            conn.execute(actualizar, [
+                {'b_id': postulacion_id, **{f'b_{c}': v for c, v in columnas_salario(texto).items()}}
+                for postulacion_id, texto in filas
+            ])
+        procesadas += len(filas)
+        ultimo_id = filas[-1].id
+    _despues_de_escribir()
+    return procesadas
 
 
 def get_db():
@@ -58,13 +416,24 @@ def get_db():
 
 def create_postulacion(db, empresa: str, puesto: str, **kwargs) -> Postulacion:
     """Create a new job application"""
+    kwargs.update(columnas_salario(kwargs.get('salario_ofrecido')))
     db_postulacion = Postulacion(
         empresa=empresa,
         puesto=puesto,
         **kwargs
     )
+    db_postulacion.huella = _huella_libre(db, db_postulacion)
     db.add(db_postulacion)
+    db.flush()
+    _sincronizar_tags(db, {db_postulacion.id: parse_tags(db_postulacion.tags)})
+    _registrar_estados(db, [_estado_inicial(db_postulacion.id, db_postulacion.estado, db_postulacion.fecha_postulacion)])
+    
+    delta = _StatsDelta()
+    delta.agregar(db_postulacion, 1)
+    delta.aplicar(db)
+    
     db.commit()
+    _despues_de_escribir([db_postulacion.id])
     db.refresh(db_postulacion)
     return db_postulacion
 
@@ -74,58 +443,441 @@ def get_postulacion(db, postulacion_id: int) -> Optional[Postulacion]:
     return db.query(Postulacion).filter(Postulacion.id == postulacion_id).first()
 
 
-def get_postulaciones(
-    db, 
-    skip: int = 0, 
-    limit: int = 100,
+def _filtrar_postulaciones(
+    db,
+    query,
     estado: Optional[str] = None,
     empresa: Optional[str] = None,
-    tags: Optional[str] = None,
+    tags: Optional[Union[str, List[str]]] = None,
     search: Optional[str] = None,
-    order_by: str = 'fecha_postulacion',
-    order_desc: bool = True
-) -> List[Postulacion]:
-    """Get job applications with filters"""
-    query = db.query(Postulacion)
-    
+    tags_modo: str = 'all',
+    salario_desde: Optional[float] = None,
+    salario_hasta: Optional[float] = None,
+    salario_moneda: Optional[str] = None
+):
+    """Apply the list filters to a query or select()"""
     if estado:
         query = query.filter(Postulacion.estado == estado)
     
     if empresa:
         query = query.filter(Postulacion.empresa.ilike(f'%{empresa}%'))
     
-    if tags:
-        query = query.filter(Postulacion.tags.ilike(f'%{tags}%'))
+    nombres = parse_tags(tags)
+    if nombres:
+        # Exact tag match; 'all' requires every tag (AND), 'any' at least one (OR)
+        con_tags = (
+            select(PostulacionTag.postulacion_id)
+            .join(Tag, Tag.id == PostulacionTag.tag_id)
+            .where(Tag.nombre.in_(nombres))
+        )
+        if tags_modo == 'all' and len(nombres) > 1:
+            con_tags = con_tags.group_by(PostulacionTag.postulacion_id).having(func.count() == len(nombres))
+        query = query.filter(Postulacion.id.in_(con_tags))
     
     if search:
-        search_filter = (
-            Postulacion.empresa.ilike(f'%{search}%') |
-            Postulacion.puesto.ilike(f'%{search}%') |
-            Postulacion.notas.ilike(f'%{search}%')
+        consulta = _consulta_fts(search)
+        if _usa_fts(db) and consulta:
+            query = query.filter(Postulacion.id.in_(
+                select(postulaciones_fts.c.rowid)
+                .where(postulaciones_fts.c.postulaciones_fts.op('MATCH')(consulta))
+            ))
+        else:
+            search_filter = (
+                Postulacion.empresa.ilike(f'%{search}%') |
+                Postulacion.puesto.ilike(f'%{search}%') |
+                Postulacion.notas.ilike(f'%{search}%')
+            )
+            query = query.filter(search_filter)
+    
+    # Offers whose parsed range overlaps [salario_desde, salario_hasta]
+    if salario_desde is not None:
+        query = query.filter(Postulacion.salario_max >= salario_desde)
+    if salario_hasta is not None:
+        query = query.filter(Postulacion.salario_min <= salario_hasta)
+    if salario_moneda:
+        query = query.filter(Postulacion.salario_moneda == salario_moneda.upper())
+    
+    return query
+
+
+def _usa_fts(db) -> bool:
+    """Whether the session's database has the FTS index"""
+    bind = db.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return False
+    if bind.url.database not in _fts_databases:
+        # Schema created by another process (servidor.py, a previous run): look once
+        _fts_databases[bind.url.database] = db.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE name = 'postulaciones_fts'"
+        )).first() is not None
+    return _fts_databases[bind.url.database]
+
+
+def _consulta_fts(texto: str) -> str:
+    """Turn free text into an FTS5 query: every word must match as a prefix"""
+    palabras = re.findall(r'\w+', texto)
+    return ' '.join(f'"{p}"*' for p in palabras)
+
+
+def buscar_postulaciones(db, texto: str, limit: int = 20) -> List[Dict[str, Any]]:
+    """Full-text search ranked by relevance, with an HTML-safe highlighted snippet"""
+    consulta = _consulta_fts(texto)
+    if not consulta:
+        return []
+    
+    if not _usa_fts(db):
+        return [
+            {'postulacion': p, 'snippet': None, 'rank': None}
+            for p in get_postulaciones(db, limit=limit, search=texto)
+        ]
+    
+    # Empresa and puesto matches weigh more than matches buried in notas
+    fts = postulaciones_fts.c.postulaciones_fts
+    rank = func.bm25(fts, 10.0, 5.0, 1.0)
+    query = (
+        select(Postulacion, func.snippet(fts, -1, '\x02', '\x03', '…', 12), rank)
+        .join(postulaciones_fts, postulaciones_fts.c.rowid == Postulacion.id)
+        .where(fts.op('MATCH')(consulta))
+        .order_by(rank)
+        .limit(limit)
+    )
+    return [
+        {
+            'postulacion': p,
+            'snippet': html.escape(snippet or '').replace('\x02', '<mark>').replace('\x03', '</mark>'),
+            'rank': rank
+        }
+        for p, snippet, rank in db.execute(query)
+    ]
+
+
+def encode_cursor(postulacion) -> str:
+    """Opaque keyset cursor for a row: '<fecha_postulacion>_<id>'"""
+    return f"{_como_fecha(postulacion.fecha_postulacion).isoformat()}_{postulacion.id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[date, int]:
+    """Parse a cursor produced by encode_cursor; raises ValueError if malformed"""
+    fecha, _, postulacion_id = cursor.partition('_')
+    return date.fromisoformat(fecha), int(postulacion_id)
+
+
+# Columns the list views and the JSON list API read; everything but the
+# unbounded notas, the contact details and the raw salary text
+COLUMNAS_LISTA = [
+    'id', 'empresa', 'puesto', 'url_oferta', 'fecha_postulacion', 'estado',
+    'fecha_seguimiento', 'fecha_respuesta', 'tags', 'ubicacion', 'modalidad',
+    *COLUMNAS_SALARIO
+]
+COLUMNAS_SEGUIMIENTO = ['id', 'empresa', 'puesto', 'fecha_seguimiento', 'estado']
+
+
+def _proyeccion(db, columnas: Optional[List[str]]):
+    """Query of whole Postulacion objects, or of just `columnas` (Row tuples with attribute access)"""
+    if columnas is None:
+        return db.query(Postulacion)
+    return db.query(*[getattr(Postulacion, c) for c in columnas])
+
+
+def get_postulaciones_por_id(db, ids: List[int], columnas: Optional[List[str]] = None) -> List[Any]:
+    """The applications with the given ids that still exist, in id order"""
+    ids = sorted(set(ids))
+    filas = []
+    for i in range(0, len(ids), _LOTE_BUSQUEDA):
+        filas.extend(
+            _proyeccion(db, columnas).filter(Postulacion.id.in_(ids[i:i + _LOTE_BUSQUEDA]))
+            .order_by(Postulacion.id).all()
         )
-        query = query.filter(search_filter)
+    return filas
+
+
+def get_postulaciones(
+    db, 
+    skip: int = 0, 
+    limit: int = 100,
+    estado: Optional[str] = None,
+    empresa: Optional[str] = None,
+    tags: Optional[Union[str, List[str]]] = None,
+    search: Optional[str] = None,
+    order_by: str = 'fecha_postulacion',
+    order_desc: bool = True,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    tags_modo: str = 'all',
+    columnas: Optional[List[str]] = None,
+    salario_desde: Optional[float] = None,
+    salario_hasta: Optional[float] = None,
+    salario_moneda: Optional[str] = None
+) -> List[Union[Postulacion, Row]]:
+    """Get job applications with filters
+    
+    `tags` is a comma-separated string or a list; `tags_modo` is 'all' (AND)
+    or 'any' (OR). salario_desde/salario_hasta keep offers whose parsed range
+    overlaps them (rows without a parsed salary are left out), optionally in
+    one salario_moneda. Passing an `after` or `before` cursor switches to keyset
+    pagination on (fecha_postulacion, id), which costs the same on every
+    page unlike OFFSET. With `columnas` (e.g. COLUMNAS_LISTA) only those
+    columns are selected and read-only Rows are returned instead of ORM
+    objects; cursors need 'id' and 'fecha_postulacion' among them.
+    """
+    query = _filtrar_postulaciones(
+        db, _proyeccion(db, columnas), estado, empresa, tags, search, tags_modo,
+        salario_desde, salario_hasta, salario_moneda
+    )
+    
+    if after or before:
+        clave = tuple_(Postulacion.fecha_postulacion, Postulacion.id)
+        desc = order_desc
+        if after:
+            cursor = tuple_(*decode_cursor(after))
+            query = query.filter(clave < cursor if order_desc else clave > cursor)
+        else:
+            # Walk backwards from the cursor and flip the page afterwards
+            cursor = tuple_(*decode_cursor(before))
+            query = query.filter(clave > cursor if order_desc else clave < cursor)
+            desc = not order_desc
+        if desc:
+            query = query.order_by(Postulacion.fecha_postulacion.desc(), Postulacion.id.desc())
+        else:
+            query = query.order_by(Postulacion.fecha_postulacion, Postulacion.id)
+        rows = query.limit(limit).all()
+        return rows[::-1] if before else rows
     
     # Ordering
     if order_desc:
-        query = query.order_by(getattr(Postulacion, order_by).desc())
+        query = query.order_by(getattr(Postulacion, order_by).desc(), Postulacion.id.desc())
     else:
-        query = query.order_by(getattr(Postulacion, order_by))
+        query = query.order_by(getattr(Postulacion, order_by), Postulacion.id)
     
     return query.offset(skip).limit(limit).all()
 
 
+def get_postulaciones_pagina(
+    db,
+    limit: int = 20,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    **filtros
+) -> Dict[str, Any]:
+    """Get one keyset page with the cursors for the neighbouring pages"""
+    rows = get_postulaciones(db, limit=limit + 1, after=after, before=before, **filtros)
+    hay_mas = len(rows) > limit
+    if before:
+        rows = rows[1:] if hay_mas else rows
+        hay_anterior, hay_siguiente = hay_mas, True
+    else:
+        rows = rows[:limit]
+        hay_anterior, hay_siguiente = bool(after), hay_mas
+    
+    return {
+        'items': rows,
+        'next_cursor': encode_cursor(rows[-1]) if rows and hay_siguiente else None,
+        'prev_cursor': encode_cursor(rows[0]) if rows and hay_anterior else None
+    }
+
+
+@cacheado(maxsize=256)
+def count_postulaciones(
+    db,
+    estado: Optional[str] = None,
+    empresa: Optional[str] = None,
+    tags: Optional[Union[str, List[str]]] = None,
+    search: Optional[str] = None,
+    tags_modo: str = 'all',
+    salario_desde: Optional[float] = None,
+    salario_hasta: Optional[float] = None,
+    salario_moneda: Optional[str] = None
+) -> int:
+    """Count job applications matching the filters with a single SELECT COUNT(*)"""
+    query = _filtrar_postulaciones(
+        db, select(func.count(Postulacion.id)), estado, empresa, tags, search, tags_modo,
+        salario_desde, salario_hasta, salario_moneda
+    )
+    return db.execute(query).scalar()
+
+
+def parse_tags(tags: Optional[Union[str, List[str]]]) -> List[str]:
+    """Normalize a comma-separated string (or list) of tags, dropping blanks and duplicates"""
+    if not tags:
+        return []
+    if isinstance(tags, str):
+        tags = tags.split(',')
+    nombres = []
+    for tag in tags:
+        tag = tag.strip().lower()
+        if tag and tag not in nombres:
+            nombres.append(tag)
+    return nombres
+
+
+def _sincronizar_tags(db, tags_por_postulacion: Dict[int, List[str]], nuevas: bool = False):
+    """Replace the postulacion_tags rows of the given applications, creating missing tags
+    
+    `nuevas` skips deleting previous rows for applications inserted in this transaction.
+    """
+    if not tags_por_postulacion:
+        return
+    
+    nombres = {nombre for lista in tags_por_postulacion.values() for nombre in lista}
+    tag_ids = {}
+    if nombres:
+        tag_ids = dict(db.execute(select(Tag.nombre, Tag.id).where(Tag.nombre.in_(nombres))).all())
+        nuevos = [{'nombre': nombre} for nombre in nombres if nombre not in tag_ids]
+        if nuevos:
+            db.execute(insert(Tag), nuevos)
+            tag_ids = dict(db.execute(select(Tag.nombre, Tag.id).where(Tag.nombre.in_(nombres))).all())
+    
+    if not nuevas:
+        db.execute(delete(PostulacionTag).where(PostulacionTag.postulacion_id.in_(tags_por_postulacion)))
+    filas = [
+        {'postulacion_id': postulacion_id, 'tag_id': tag_ids[nombre]}
+        for postulacion_id, lista in tags_por_postulacion.items()
+        for nombre in lista
+    ]
+    if filas:
+        db.execute(insert(PostulacionTag), filas)
+
+
+def get_tag_facets(
+    db,
+    estado: Optional[str] = None,
+    empresa: Optional[str] = None,
+    tags: Optional[Union[str, List[str]]] = None,
+    search: Optional[str] = None,
+    tags_modo: str = 'all'
+) -> List[Dict[str, Any]]:
+    """Tag counts over the applications matching the filters, in one query"""
+    total = func.count(PostulacionTag.postulacion_id)
+    query = (
+        select(Tag.nombre, total)
+        .join(PostulacionTag, PostulacionTag.tag_id == Tag.id)
+        .group_by(Tag.nombre)
+        .order_by(total.desc(), Tag.nombre)
+    )
+    if any((estado, empresa, tags, search)):
+        ids = _filtrar_postulaciones(db, select(Postulacion.id), estado, empresa, tags, search, tags_modo)
+        query = query.where(PostulacionTag.postulacion_id.in_(ids))
+    return [{'tag': nombre, 'count': count} for nombre, count in db.execute(query)]
+
+
+def migrate_tags(db, batch: int = 1000) -> int:
+    """Populate tags/postulacion_tags from the comma-separated Postulacion.tags column"""
+    db.execute(delete(PostulacionTag))
+    migradas = 0
+    ultimo_id = 0
+    while True:
+        filas = db.execute(
+            select(Postulacion.id, Postulacion.tags)
+            .where(Postulacion.id > ultimo_id, Postulacion.tags != None)
+            .order_by(Postulacion.id)
+            .limit(batch)
+        ).all()
+        if not filas:
+            break
+        _sincronizar_tags(db, {postulacion_id: parse_tags(tags) for postulacion_id, tags in filas})
+        migradas += len(filas)
+        ultimo_id = filas[-1].id
+    db.commit()
+    _despues_de_escribir()
+    return migradas
+
+
+def _estado_inicial(postulacion_id: int, estado: str, fecha_postulacion) -> tuple:
+    """History entry for a new application: it entered `estado` on its application date"""
+    fecha = fecha_postulacion if isinstance(fecha_postulacion, datetime) else datetime.combine(fecha_postulacion, time())
+    return (postulacion_id, None, estado, fecha)
+
+
+def _registrar_estados(db, cambios: List[tuple]):
+    """Append (postulacion_id, estado_anterior, estado, fecha) transitions to the history"""
+    if cambios:
+        db.execute(insert(EstadoHistorial.__table__), [
+            {'postulacion_id': postulacion_id, 'estado_anterior': anterior, 'estado': estado, 'fecha': fecha}
+            for postulacion_id, anterior, estado, fecha in cambios
+        ])
+
+
+def seed_historial(db) -> int:
+    """Reconstruct a history for applications that predate estado_historial
+    
+    Each one gets 'Postulado' on fecha_postulacion and, if it has moved on, a
+    transition to its current estado on fecha_respuesta (or its last update).
+    """
+    db.execute(delete(EstadoHistorial))
+    inicio = _como_fecha_hora(db, Postulacion.fecha_postulacion)
+    fin = func.coalesce(_como_fecha_hora(db, Postulacion.fecha_respuesta), Postulacion.updated_at, inicio)
+    columnas = ['postulacion_id', 'estado_anterior', 'estado', 'fecha']
+    resultado = db.execute(insert(EstadoHistorial).from_select(
+        columnas,
+        select(Postulacion.id, null(), literal('Postulado'), inicio)
+    ))
+    db.execute(insert(EstadoHistorial).from_select(
+        columnas,
+        select(Postulacion.id, literal('Postulado'), Postulacion.estado, fin).where(Postulacion.estado != 'Postulado')
+    ))
+    db.commit()
+    _despues_de_escribir()
+    return resultado.rowcount
+
+
+# Callables run after every committed write with the ids of the changed
+# (created or updated) and deleted applications; see al_escribir
+_oyentes_escritura: List[Any] = []
+
+
+def al_escribir(oyente):
+    """Register oyente(cambiadas, eliminadas) to run after every committed write
+    
+    Called on the writing thread right after the caches are invalidated; both
+    arguments are lists of application ids, empty for writes that only touch
+    derived data (stats, tags, history). Exceptions are logged and ignored so a
+    failing listener never fails the write.
+    """
+    if oyente not in _oyentes_escritura:
+        _oyentes_escritura.append(oyente)
+    return oyente
+
+
+def _despues_de_escribir(cambiadas=(), eliminadas=()):
+    """Invalidate read caches after a committed write, then notify the write listeners"""
+    invalidar_todo()
+    for oyente in _oyentes_escritura:
+        try:
+            oyente(list(cambiadas), list(eliminadas))
+        except Exception as e:
+            print(f"Oyente de escritura {getattr(oyente, '__qualname__', oyente)}: {type(e).__name__}: {e}")
+
+
 def update_postulacion(db, postulacion_id: int, **kwargs) -> Optional[Postulacion]:
     """Update a job application"""
     db_postulacion = get_postulacion(db, postulacion_id)
     if not db_postulacion:
         return None
     
+    delta = _StatsDelta()
+    delta.agregar(db_postulacion, -1)
+    estado_anterior = db_postulacion.estado
+    
+    if 'salario_ofrecido' in kwargs:
+        kwargs.update(columnas_salario(kwargs['salario_ofrecido']))
     for key, value in kwargs.items():
         if hasattr(db_postulacion, key):
             setattr(db_postulacion, key, value)
     
+    if kwargs.keys() & {'empresa', 'puesto', 'url_oferta'}:
+        db_postulacion.huella = _huella_libre(db, db_postulacion)
+    
+    delta.agregar(db_postulacion, 1)
+    delta.aplicar(db)
+    
+    if 'tags' in kwargs:
+        _sincronizar_tags(db, {db_postulacion.id: parse_tags(db_postulacion.tags)})
+    if db_postulacion.estado != estado_anterior:
+        _registrar_estados(db, [(db_postulacion.id, estado_anterior, db_postulacion.estado, datetime.now())])
+    
     db_postulacion.updated_at = datetime.now()
     db.commit()
+    _despues_de_escribir([postulacion_id])
     db.refresh(db_postulacion)
     return db_postulacion
 
@@ -136,68 +888,246 @@ def delete_postulacion(db, postulacion_id: int) -> bool:
     if not db_postulacion:
         return False
     
+    delta = _StatsDelta()
+    delta.agregar(db_postulacion, -1)
+    delta.aplicar(db)
+    
+    db.execute(delete(PostulacionTag).where(PostulacionTag.postulacion_id == postulacion_id))
+    db.execute(delete(EstadoHistorial).where(EstadoHistorial.postulacion_id == postulacion_id))
     db.delete(db_postulacion)
     db.commit()
+    _despues_de_escribir(eliminadas=[postulacion_id])
     return True
 
 
+def envejecer_postulaciones(db, dias: int = DIAS_SIN_RESPUESTA, hoy: Optional[date] = None) -> int:
+    """Move applications still 'Postulado' after `dias` days to 'Sin respuesta'
+    
+    One UPDATE ... RETURNING over the (estado, fecha_postulacion) index; the
+    returned rows feed the stats delta and the history. Returns the number of
+    applications moved.
+    """
+    limite = (hoy or date.today()) - timedelta(days=dias)
+    now = datetime.now()
+    tabla = Postulacion.__table__
+    movidas = db.execute(
+        update(tabla)
+        .where(tabla.c.estado == 'Postulado', tabla.c.fecha_postulacion <= limite)
+        .values(estado='Sin respuesta', updated_at=now)
+        .returning(tabla.c.id, tabla.c.fecha_postulacion, tabla.c.fecha_respuesta)
+    ).all()
+    if not movidas:
+        db.rollback()
+        return 0
+    
+    delta = _StatsDelta()
+    for fila in movidas:
+        delta.agregar_valores('Postulado', fila.fecha_postulacion, fila.fecha_respuesta, -1)
+        delta.agregar_valores('Sin respuesta', fila.fecha_postulacion, fila.fecha_respuesta, 1)
+    delta.aplicar(db)
+    _registrar_estados(db, [(fila.id, 'Postulado', 'Sin respuesta', now) for fila in movidas])
+    db.commit()
+    _despues_de_escribir([fila.id for fila in movidas])
+    return len(movidas)
+
+
+def _dias_entre(db, inicio, fin):
+    """SQL expression for the number of days between two date columns"""
+    if db.get_bind().dialect.name == 'sqlite':
+        return func.julianday(fin) - func.julianday(inicio)
+    return fin - inicio
+
+
+def _como_fecha_hora(db, columna):
+    """SQL expression converting a Date column to a midnight DateTime"""
+    if db.get_bind().dialect.name == 'sqlite':
+        return func.datetime(columna)
+    return cast(columna, DateTime)
+
+
+def _contar_si(condicion):
+    """SUM(CASE WHEN condicion THEN 1 ELSE 0 END)"""
+    return func.sum(case((condicion, 1), else_=0))
+
+
+def _como_fecha(valor):
+    """Normalize datetime values assigned to Date columns"""
+    return valor.date() if isinstance(valor, datetime) else valor
+
+
+class _StatsDelta:
+    """Pending changes to the materialized stats tables"""
+    
+    def __init__(self):
+        self.estados = {}  # estado -> [total, dias_respuesta_suma, dias_respuesta_n]
+        self.diarios = {}  # (fecha, estado) -> total
+    
+    def sumar(self, estado, fecha, total, suma_dias=0, n_respuestas=0):
+        e = self.estados.setdefault(estado, [0, 0, 0])
+        e[0] += total
+        e[1] += suma_dias
+        e[2] += n_respuestas
+        self.diarios[(fecha, estado)] = self.diarios.get((fecha, estado), 0) + total
+    
+    def agregar(self, postulacion, signo: int):
+        """Add (signo=1) or remove (signo=-1) one application's contribution"""
+        self.agregar_valores(postulacion.estado, postulacion.fecha_postulacion, postulacion.fecha_respuesta, signo)
+    
+    def agregar_valores(self, estado, fecha_postulacion, fecha_respuesta, signo: int):
+        fecha_post = _como_fecha(fecha_postulacion)
+        fecha_resp = _como_fecha(fecha_respuesta)
+        if fecha_post and fecha_resp:
+            self.sumar(estado, fecha_post, signo, signo * (fecha_resp - fecha_post).days, signo)
+        else:
+            self.sumar(estado, fecha_post, signo)
+    
+    def aplicar(self, db):
+        """Write the pending changes in the current transaction"""
+        for estado, (total, suma, n) in self.estados.items():
+            if not (total or suma or n):
+                continue
+            result = db.execute(
+                update(EstadoStats).where(EstadoStats.estado == estado).values(
+                    total=EstadoStats.total + total,
+                    dias_respuesta_suma=EstadoStats.dias_respuesta_suma + suma,
+                    dias_respuesta_n=EstadoStats.dias_respuesta_n + n
+                )
+            )
+            if result.rowcount == 0:
+                db.execute(insert(EstadoStats).values(
+                    estado=estado, total=total, dias_respuesta_suma=suma, dias_respuesta_n=n
+                ))
+        
+        diarios = {clave: total for clave, total in self.diarios.items() if total}
+        if diarios:
+            # One lookup plus two executemany calls, so bulk writes touching many days stay cheap
+            existentes = set(db.execute(
+                select(DiarioStats.fecha, DiarioStats.estado)
+                .where(DiarioStats.fecha.in_({fecha for fecha, _ in diarios}))
+            ).all())
+            actualizar = [
+                {'b_fecha': fecha, 'b_estado': estado, 'b_total': total}
+                for (fecha, estado), total in diarios.items() if (fecha, estado) in existentes
+            ]
+            nuevos = [
+                {'fecha': fecha, 'estado': estado, 'total': total}
+                for (fecha, estado), total in diarios.items() if (fecha, estado) not in existentes
+            ]
+            tabla = DiarioStats.__table__
+            if actualizar:
+                db.execute(
+                    update(tabla)
+                    .where(tabla.c.fecha == bindparam('b_fecha'), tabla.c.estado == bindparam('b_estado'))
+                    .values(total=tabla.c.total + bindparam('b_total')),
+                    actualizar
+                )
+            if nuevos:
+                db.execute(insert(tabla), nuevos)
+        
+        self.estados.clear()
+        self.diarios.clear()
+
+
+def compute_dashboard_stats(db) -> Dict[str, Any]:
+    """Compute dashboard statistics from scratch in a single aggregate query"""
+    hoy = datetime.now().date()
+    week_ago = hoy - timedelta(days=7)
+    month_ago = hoy - timedelta(days=30)
+    # No response after DIAS_SIN_RESPUESTA days: still Postulado, or already moved to Sin respuesta
+    limite = hoy - timedelta(days=DIAS_SIN_RESPUESTA)
+    
+    query = select(
+        func.count(Postulacion.id).label('total'),
+        *[_contar_si(Postulacion.estado == estado) for estado in ESTADOS],
+        # Respondidos = no Postulado ni Sin respuesta
+        _contar_si(Postulacion.estado.notin_(['Postulado', 'Sin respuesta'])).label('respondidos'),
+        _contar_si(Postulacion.fecha_postulacion >= week_ago).label('esta_semana'),
+        _contar_si(Postulacion.fecha_postulacion >= month_ago).label('este_mes'),
+        # AVG skips NULLs, so rows without fecha_respuesta don't count
+        func.avg(_dias_entre(db, Postulacion.fecha_postulacion, Postulacion.fecha_respuesta)).label('tiempo_promedio'),
+        _contar_si(and_(
+            Postulacion.fecha_seguimiento <= hoy,
+            Postulacion.estado.in_(['Postulado', 'En revisión'])
+        )).label('seguimientos_pendientes'),
+        _contar_si(or_(
+            Postulacion.estado == 'Sin respuesta',
+            and_(Postulacion.estado == 'Postulado', Postulacion.fecha_postulacion <= limite)
+        )).label('sin_respuesta')
+    )
+    row = db.execute(query).one()
+    
+    total = row.total
+    estado_counts = {estado: row[i + 1] or 0 for i, estado in enumerate(ESTADOS)}
+    respondidos = row.respondidos or 0
+    tasa_respuesta = (respondidos / total * 100) if total > 0 else 0
+    tiempo_promedio = float(row.tiempo_promedio or 0)
+    
+    return {
+        'total': total,
+        'estado_counts': estado_counts,
+        'tasa_respuesta': round(tasa_respuesta, 1),
+        'esta_semana': row.esta_semana or 0,
+        'este_mes': row.este_mes or 0,
+        'tiempo_promedio_respuesta': round(tiempo_promedio, 1),
+        'seguimientos_pendientes': row.seguimientos_pendientes or 0,
+        'sin_respuesta_14dias': row.sin_respuesta or 0,
+        'respondidos': respondidos
+    }
+
+
+@cacheado(maxsize=1)
 def get_dashboard_stats(db) -> Dict[str, Any]:
-    """Get dashboard statistics"""
-    total = db.query(Postulacion).count()
-    
-    # Count by status
-    estado_counts = {}
-    for estado in ESTADOS:
-        count = db.query(Postulacion).filter(Postulacion.estado == estado).count()
-        estado_counts[estado] = count
-    
-    # Response rate (respondidos = no Postulado ni Sin respuesta)
-    respondidos = db.query(Postulacion).filter(
-        Postulacion.estado.notin_(['Postulado', 'Sin respuesta'])
-    ).count()
+    """Get dashboard statistics from the materialized stats tables"""
+    hoy = datetime.now().date()
+    week_ago = hoy - timedelta(days=7)
+    month_ago = hoy - timedelta(days=30)
+    limite = hoy - timedelta(days=DIAS_SIN_RESPUESTA)
+    
+    estado_counts = {estado: 0 for estado in ESTADOS}
+    suma_dias = n_respuestas = 0
+    for fila in db.query(EstadoStats).all():
+        estado_counts[fila.estado] = estado_counts.get(fila.estado, 0) + fila.total
+        suma_dias += fila.dias_respuesta_suma
+        n_respuestas += fila.dias_respuesta_n
+    
+    total = sum(estado_counts.values())
+    respondidos = sum(
+        count for estado, count in estado_counts.items()
+        if estado not in ('Postulado', 'Sin respuesta')
+    )
     tasa_respuesta = (respondidos / total * 100) if total > 0 else 0
+    tiempo_promedio = (suma_dias / n_respuestas) if n_respuestas else 0
     
-    # Applications this week
-    week_ago = datetime.now().date() - timedelta(days=7)
-    esta_semana = db.query(Postulacion).filter(
-        Postulacion.fecha_postulacion >= week_ago
-    ).count()
-    
-    # Applications this month
-    month_ago = datetime.now().date() - timedelta(days=30)
-    este_mes = db.query(Postulacion).filter(
-        Postulacion.fecha_postulacion >= month_ago
-    ).count()
-    
-    # Average response time (for applications with fecha_respuesta)
-    respuestas = db.query(Postulacion).filter(Postulacion.fecha_respuesta != None).all()
-    if respuestas:
-        tiempos = [(p.fecha_respuesta - p.fecha_postulacion).days for p in respuestas]
-        tiempo_promedio = sum(tiempos) / len(tiempos)
-    else:
-        tiempo_promedio = 0
+    # Date windows only touch the last month of daily buckets
+    ventanas = db.execute(
+        select(
+            func.sum(case((DiarioStats.fecha >= week_ago, DiarioStats.total), else_=0)).label('esta_semana'),
+            func.sum(DiarioStats.total).label('este_mes'),
+            func.sum(case((
+                and_(DiarioStats.estado == 'Postulado', DiarioStats.fecha > limite),
+                DiarioStats.total
+            ), else_=0)).label('postulados_recientes')
+        ).where(DiarioStats.fecha >= month_ago)
+    ).one()
+    
+    # No response after DIAS_SIN_RESPUESTA days: still Postulado, or already moved to
+    # Sin respuesta by the scheduler (which would otherwise empty this count)
+    sin_respuesta = (
+        estado_counts['Postulado'] - (ventanas.postulados_recientes or 0) + estado_counts['Sin respuesta']
+    )
     
     # Pending follow-ups (fecha_seguimiento <= today)
-    hoy = datetime.now().date()
-    seguimientos_pendientes = db.query(Postulacion).filter(
+    seguimientos_pendientes = db.query(func.count(Postulacion.id)).filter(
         Postulacion.fecha_seguimiento <= hoy,
         Postulacion.estado.in_(['Postulado', 'En revisión'])
-    ).count()
-    
-    # No response after 14 days (still Postulado)
-    dias_sin_respuesta = 14
-    limite = hoy - timedelta(days=dias_sin_respuesta)
-    sin_respuesta = db.query(Postulacion).filter(
-        Postulacion.estado == 'Postulado',
-        Postulacion.fecha_postulacion <= limite
-    ).count()
+    ).scalar()
     
     return {
         'total': total,
         'estado_counts': estado_counts,
         'tasa_respuesta': round(tasa_respuesta, 1),
-        'esta_semana': esta_semana,
-        'este_mes': este_mes,
+        'esta_semana': ventanas.esta_semana or 0,
+        'este_mes': ventanas.este_mes or 0,
         'tiempo_promedio_respuesta': round(tiempo_promedio, 1),
         'seguimientos_pendientes': seguimientos_pendientes,
         'sin_respuesta_14dias': sin_respuesta,
@@ -205,61 +1135,603 @@ def get_dashboard_stats(db) -> Dict[str, Any]:
     }
 
 
-def get_seguimientos_pendientes(db, dias: int = 7) -> List[Postulacion]:
-    """Get job applications needing follow-up"""
+GRANULARIDADES = ('dia', 'semana', 'mes')
+
+# Upper bound on the periods returned by one series request (10 years of days)
+MAX_PERIODOS = 3660
+
+# Cohort counts: an offer or an accepted offer also went through an interview
+ESTADOS_ENTREVISTA = ('Entrevista', 'Oferta', 'Aceptado')
+ESTADOS_OFERTA = ('Oferta', 'Aceptado')
+
+
+def _inicio_periodo(fecha: date, granularidad: str) -> date:
+    """First day of the day/week (Monday)/month containing fecha"""
+    if granularidad == 'semana':
+        return fecha - timedelta(days=fecha.weekday())
+    if granularidad == 'mes':
+        return fecha.replace(day=1)
+    return fecha
+
+
+def _siguiente_periodo(fecha: date, granularidad: str) -> date:
+    if granularidad == 'semana':
+        return fecha + timedelta(days=7)
+    if granularidad == 'mes':
+        return (fecha.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return fecha + timedelta(days=1)
+
+
+def _periodo(db, columna, granularidad: str):
+    """SQL expression truncating a date column to the start of its period"""
+    if db.get_bind().dialect.name == 'sqlite':
+        if granularidad == 'semana':
+            return func.date(columna, '-6 days', 'weekday 1')
+        if granularidad == 'mes':
+            return func.strftime('%Y-%m-01', columna)
+        return func.date(columna)
+    if granularidad == 'dia':
+        return columna
+    return func.date_trunc('week' if granularidad == 'semana' else 'month', columna)
+
+
+@cacheado(maxsize=32)
+def get_metricas_series(
+    db,
+    granularidad: str = 'semana',
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None
+) -> Dict[str, Any]:
+    """Applications, responses, interviews and offers per day/week/month
+    
+    postulaciones/entrevistas/ofertas count applications by fecha_postulacion
+    (from the stats_diarios buckets, grouped by their current estado);
+    respuestas counts fecha_respuesta. Defaults to the last year; every
+    period in the range is present, with zeros when empty.
+    """
+    if granularidad not in GRANULARIDADES:
+        raise ValueError(f"Granularidad inválida: {granularidad}")
+    hasta = hasta or datetime.now().date()
+    desde = desde or hasta - timedelta(days=365)
+    if desde > hasta:
+        raise ValueError("desde debe ser anterior a hasta")
+    
+    series = {}
+    periodo = _inicio_periodo(desde, granularidad)
+    while periodo <= hasta:
+        series[periodo.isoformat()] = {
+            'periodo': periodo.isoformat(),
+            'postulaciones': 0, 'respuestas': 0, 'entrevistas': 0, 'ofertas': 0
+        }
+        periodo = _siguiente_periodo(periodo, granularidad)
+        if len(series) > MAX_PERIODOS:
+            raise ValueError("Rango demasiado amplio para la granularidad elegida")
+    
+    p_diario = _periodo(db, DiarioStats.fecha, granularidad).label('periodo')
+    cohortes = db.execute(
+        select(
+            p_diario,
+            func.sum(DiarioStats.total),
+            func.sum(case((DiarioStats.estado.in_(ESTADOS_ENTREVISTA), DiarioStats.total), else_=0)),
+            func.sum(case((DiarioStats.estado.in_(ESTADOS_OFERTA), DiarioStats.total), else_=0))
+        )
+        .where(DiarioStats.fecha >= desde, DiarioStats.fecha <= hasta)
+        .group_by(p_diario)
+    ).all()
+    for periodo, postulaciones, entrevistas, ofertas in cohortes:
+        fila = series[str(periodo)[:10]]
+        fila['postulaciones'] = postulaciones or 0
+        fila['entrevistas'] = entrevistas or 0
+        fila['ofertas'] = ofertas or 0
+    
+    p_respuesta = _periodo(db, Postulacion.fecha_respuesta, granularidad).label('periodo')
+    respuestas = db.execute(
+        select(p_respuesta, func.count())
+        .where(Postulacion.fecha_respuesta >= desde, Postulacion.fecha_respuesta <= hasta)
+        .group_by(p_respuesta)
+    ).all()
+    for periodo, total in respuestas:
+        series[str(periodo)[:10]]['respuestas'] = total
+    
+    return {
+        'granularidad': granularidad,
+        'desde': desde.isoformat(),
+        'hasta': hasta.isoformat(),
+        'series': list(series.values())
+    }
+
+
+# Funnel stages in order; reaching a later stage implies having passed the earlier ones.
+# 'En revisión' is optional in practice, so it counts as still Postulado.
+ETAPAS_FUNNEL = ['Postulado', 'Entrevista', 'Oferta', 'Aceptado']
+
+
+@cacheado(maxsize=1)
+def get_funnel_metricas(db) -> Dict[str, Any]:
+    """Funnel conversion and time-in-stage latencies from estado_historial
+    
+    etapas: applications that reached each stage, with the conversion from the
+    previous stage. tiempos: median and p90 (nearest rank) days spent in each
+    estado before the next transition, computed with LEAD/ROW_NUMBER windows.
+    """
+    h = EstadoHistorial
+    rango = case({estado: i for i, estado in enumerate(ETAPAS_FUNNEL)}, value=h.estado, else_=0)
+    por_postulacion = (
+        select(func.max(rango).label('rango'))
+        .group_by(h.postulacion_id)
+        .subquery()
+    )
+    por_rango = dict(db.execute(
+        select(por_postulacion.c.rango, func.count()).group_by(por_postulacion.c.rango)
+    ).all())
+    
+    etapas = []
+    anterior = None
+    for i, estado in enumerate(ETAPAS_FUNNEL):
+        alcanzadas = sum(n for r, n in por_rango.items() if r >= i)
+        etapas.append({
+            'estado': estado,
+            'alcanzadas': alcanzadas,
+            'conversion': round(alcanzadas / anterior * 100, 1) if anterior else None
+        })
+        anterior = alcanzadas
+    
+    siguiente = func.lead(h.fecha).over(partition_by=h.postulacion_id, order_by=(h.fecha, h.id))
+    tramos = select(h.estado, h.fecha.label('inicio'), siguiente.label('fin')).subquery()
+    if db.get_bind().dialect.name == 'sqlite':
+        dias = func.julianday(tramos.c.fin) - func.julianday(tramos.c.inicio)
+    else:
+        dias = func.extract('epoch', tramos.c.fin - tramos.c.inicio) / 86400
+    duraciones = select(tramos.c.estado, dias.label('dias')).where(tramos.c.fin != None).subquery()
+    ordenadas = select(
+        duraciones.c.estado,
+        duraciones.c.dias,
+        func.row_number().over(partition_by=duraciones.c.estado, order_by=duraciones.c.dias).label('n'),
+        func.count().over(partition_by=duraciones.c.estado).label('total')
+    ).subquery()
+    # Nearest-rank percentiles: rank ceil(p * total), in integer arithmetic
+    rank_mediana = (ordenadas.c.total * 50 + 99) // 100
+    rank_p90 = (ordenadas.c.total * 90 + 99) // 100
+    filas = db.execute(
+        select(ordenadas.c.estado, ordenadas.c.total, ordenadas.c.dias,
+               ordenadas.c.n == rank_mediana, ordenadas.c.n == rank_p90)
+        .where(or_(ordenadas.c.n == rank_mediana, ordenadas.c.n == rank_p90))
+    ).all()
+    
+    tiempos = {}
+    for estado, total, valor, es_mediana, es_p90 in filas:
+        t = tiempos.setdefault(estado, {'estado': estado, 'n': total, 'mediana_dias': None, 'p90_dias': None})
+        if es_mediana:
+            t['mediana_dias'] = round(valor, 1)
+        if es_p90:
+            t['p90_dias'] = round(valor, 1)
+    
+    return {
+        'etapas': etapas,
+        'tiempos': [tiempos[e] for e in ESTADOS if e in tiempos]
+    }
+
+
+@cacheado(maxsize=1)
+def get_salarios_metricas(db) -> Dict[str, List[Dict[str, Any]]]:
+    """Median offered salary by modalidad and by ubicacion
+    
+    Amounts are only comparable within a currency and pay period, so each
+    group is (value, moneda, periodo). A range counts as its midpoint. The
+    median is nearest-rank: the smallest midpoint whose CUME_DIST reaches
+    0.5, so one window and one GROUP BY per dimension, and no salary rows
+    are loaded into Python.
+    """
+    punto = (Postulacion.salario_min + Postulacion.salario_max) / 2
+    resultado = {}
+    for dimension in DIMENSIONES_SALARIO:
+        grupo = getattr(Postulacion, dimension)
+        ordenadas = select(
+            grupo.label('grupo'),
+            Postulacion.salario_moneda.label('moneda'),
+            Postulacion.salario_periodo.label('periodo'),
+            Postulacion.salario_min.label('minimo'),
+            Postulacion.salario_max.label('maximo'),
+            punto.label('punto'),
+            func.cume_dist().over(
+                partition_by=(grupo, Postulacion.salario_moneda, Postulacion.salario_periodo), order_by=punto
+            ).label('acumulado')
+        ).where(Postulacion.salario_min != None).subquery()
+        c = ordenadas.c
+        total = func.count()
+        filas = db.execute(
+            select(
+                c.grupo, c.moneda, c.periodo, total.label('n'),
+                func.min(case((c.acumulado >= 0.5, c.punto))).label('mediana'),
+                func.min(c.minimo).label('minimo'),
+                func.max(c.maximo).label('maximo')
+            )
+            .group_by(c.grupo, c.moneda, c.periodo)
+            .order_by(total.desc(), c.grupo)
+        ).all()
+        resultado[dimension] = [
+            {
+                dimension: fila.grupo, 'moneda': fila.moneda, 'periodo': fila.periodo, 'n': fila.n,
+                'mediana': round(fila.mediana, 2), 'minimo': fila.minimo, 'maximo': fila.maximo
+            }
+            for fila in filas
+        ]
+    return resultado
+
+
+def _stats_buckets(db):
+    """Recompute the materialized stats buckets from postulaciones in one grouped query"""
+    dias = _dias_entre(db, Postulacion.fecha_postulacion, Postulacion.fecha_respuesta)
+    query = select(
+        Postulacion.estado,
+        Postulacion.fecha_postulacion,
+        func.count(Postulacion.id),
+        func.coalesce(func.sum(dias), 0),
+        func.count(Postulacion.fecha_respuesta)
+    ).group_by(Postulacion.estado, Postulacion.fecha_postulacion)
+    
+    delta = _StatsDelta()
+    for estado, fecha, total, suma, n in db.execute(query):
+        delta.sumar(estado, fecha, total, int(suma), n)
+    return delta
+
+
+def rebuild_stats(db) -> int:
+    """Recompute the materialized stats tables from scratch"""
+    delta = _stats_buckets(db)
+    db.execute(delete(EstadoStats))
+    db.execute(delete(DiarioStats))
+    delta.aplicar(db)
+    db.commit()
+    _despues_de_escribir()
+    return len(delta.diarios)
+
+
+def verify_stats(db) -> List[str]:
+    """Compare the materialized stats with a fresh recomputation and describe any drift"""
+    esperado = _stats_buckets(db)
+    drift = []
+    
+    guardado = {
+        f.estado: (f.total, f.dias_respuesta_suma, f.dias_respuesta_n)
+        for f in db.query(EstadoStats).all()
+    }
+    for estado in sorted(set(guardado) | set(esperado.estados)):
+        real = tuple(esperado.estados.get(estado, (0, 0, 0)))
+        actual = guardado.get(estado, (0, 0, 0))
+        if real != actual:
+            drift.append(f"estado {estado!r}: stored (total, dias, n)={actual}, expected {real}")
+    
+    guardado = {(f.fecha, f.estado): f.total for f in db.query(DiarioStats).all()}
+    for clave in sorted(set(guardado) | set(esperado.diarios)):
+        real = esperado.diarios.get(clave, 0)
+        actual = guardado.get(clave, 0)
+        if real != actual:
+            drift.append(f"dia {clave[0]} {clave[1]!r}: stored {actual}, expected {real}")
+    
+    return drift
+
+
+@cacheado(maxsize=16)
+def get_seguimientos_pendientes(db, dias: int = 7) -> List[Row]:
+    """Get job applications needing follow-up (COLUMNAS_SEGUIMIENTO only)"""
     hoy = datetime.now().date()
     limite = hoy + timedelta(days=dias)
     
-    return db.query(Postulacion).filter(
+    # Rows are plain tuples, so cached results never lazy-load through a closed session
+    return _proyeccion(db, COLUMNAS_SEGUIMIENTO).filter(
         Postulacion.fecha_seguimiento <= limite,
         Postulacion.estado.in_(['Postulado', 'En revisión'])
     ).order_by(Postulacion.fecha_seguimiento).all()
 
 
-def get_postulaciones_para_exportar(db) -> List[Postulacion]:
+# Columns (and CSV header) of the export, in order
+COLUMNAS_EXPORTAR = [
+    'id', 'empresa', 'puesto', 'url_oferta', 'fecha_postulacion',
+    'estado', 'notas', 'fecha_seguimiento', 'fecha_respuesta', 'tags',
+    'contacto_nombre', 'contacto_email', 'salario_ofrecido',
+    'ubicacion', 'modalidad'
+]
+
+
+def select_postulaciones_para_exportar(db, **filtros):
+    """SELECT of the export columns, with the same filters as get_postulaciones"""
+    query = select(*[getattr(Postulacion, c) for c in COLUMNAS_EXPORTAR])
+    query = _filtrar_postulaciones(db, query, **filtros)
+    return query.order_by(Postulacion.fecha_postulacion.desc(), Postulacion.id.desc())
+
+
+def get_postulaciones_para_exportar(db, **filtros) -> List[Postulacion]:
     """Get all applications for export"""
-    return db.query(Postulacion).order_by(Postulacion.fecha_postulacion.desc()).all()
+    query = _filtrar_postulaciones(db, db.query(Postulacion), **filtros)
+    return query.order_by(Postulacion.fecha_postulacion.desc(), Postulacion.id.desc()).all()
+
+
+def iter_postulaciones_para_exportar(db, batch: int = 1000, **filtros):
+    """Yield export rows in chunks of `batch` without loading the whole table"""
+    query = select_postulaciones_para_exportar(db, **filtros).execution_options(yield_per=batch)
+    yield from db.execute(query).partitions()
+
+
+MODOS_IMPORTACION = ('omitir', 'actualizar')
+
+# Bound parameters per lookup query, well under SQLite's limit
+_LOTE_BUSQUEDA = 5000
+
+
+def _insert_con_conflicto(db, tabla):
+    """Dialect-specific INSERT supporting ON CONFLICT"""
+    # Imported here: the PostgreSQL dialect alone adds ~90 ms to every cold start
+    nombre = db.get_bind().dialect.name
+    if nombre == 'sqlite':
+        from sqlalchemy.dialects import sqlite
+        return sqlite.insert(tabla)
+    if nombre == 'postgresql':
+        from sqlalchemy.dialects import postgresql
+        return postgresql.insert(tabla)
+    raise NotImplementedError(f"INSERT ... ON CONFLICT no soportado en {nombre}")
+
+
+def insert_postulaciones(
+    db,
+    filas: List[Dict[str, Any]],
+    modo: str = 'omitir',
+    columnas: Optional[List[str]] = None,
+    dry_run: bool = False,
+    commit: bool = True
+) -> Dict[str, int]:
+    """Insert validated rows in one statement, merging on the huella unique index
+    
+    Rows are dicts of Postulacion column values. modo='omitir' keeps applications
+    that already exist; 'actualizar' overwrites their `columnas` (default: every
+    column in the rows). Stats and tags are kept in sync. Returns the
+    insertadas/actualizadas/omitidas counts; dry_run only classifies the rows.
+    """
+    if modo not in MODOS_IMPORTACION:
+        raise ValueError(f"Modo de importación inválido: {modo}")
+    resultado = {'insertadas': 0, 'actualizadas': 0, 'omitidas': 0}
+    if not filas:
+        return resultado
+    
+    # Repeated applications inside the batch: keep the first, or the last when updating
+    unicas = {}
+    for fila in filas:
+        fila['huella'] = huella_postulacion(fila['empresa'], fila['puesto'], fila.get('url_oferta'))
+        if 'salario_ofrecido' in fila:
+            fila.update(columnas_salario(fila['salario_ofrecido']))
+        if modo == 'actualizar' or fila['huella'] not in unicas:
+            unicas[fila['huella']] = fila
+    resultado['omitidas'] = len(filas) - len(unicas)
+    
+    tabla = Postulacion.__table__
+    huellas = list(unicas)
+    existentes = {}
+    for i in range(0, len(huellas), _LOTE_BUSQUEDA):
+        existentes.update((fila.huella, fila) for fila in db.execute(
+            select(tabla.c.huella, tabla.c.estado, tabla.c.fecha_postulacion, tabla.c.fecha_respuesta)
+            .where(tabla.c.huella.in_(huellas[i:i + _LOTE_BUSQUEDA]))
+        ))
+    
+    if dry_run:
+        resultado['insertadas'] = len(unicas) - len(existentes)
+        resultado['actualizadas' if modo == 'actualizar' else 'omitidas'] += len(existentes)
+        return resultado
+    
+    now = datetime.now()
+    for fila in unicas.values():
+        fila.setdefault('created_at', now)
+        fila.setdefault('updated_at', now)
+    
+    stmt = _insert_con_conflicto(db, tabla)
+    if modo == 'omitir':
+        stmt = stmt.on_conflict_do_nothing(index_elements=[tabla.c.huella])
+        actualizar = set()
+    else:
+        actualizar = set(columnas or filas[0]) - {'id', 'huella', 'created_at'}
+        actualizar.add('updated_at')
+        if 'salario_ofrecido' in actualizar:
+            actualizar.update(COLUMNAS_SALARIO)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[tabla.c.huella],
+            set_={nombre: stmt.excluded[nombre] for nombre in actualizar}
+        )
+    # Core insert on the Table: the ORM bulk path re-splices RETURNING rows per page.
+    # Rows are matched back through huella, so RETURNING order doesn't matter.
+    guardadas = db.execute(stmt.returning(tabla.c.id, tabla.c.huella), list(unicas.values())).all()
+    resultado['omitidas'] += len(unicas) - len(guardadas)
+    
+    delta = _StatsDelta()
+    tags_nuevas, tags_actualizadas = {}, {}
+    cambios = []
+    for postulacion_id, huella in guardadas:
+        fila = unicas[huella]
+        anterior = existentes.get(huella)
+        if anterior is None:
+            resultado['insertadas'] += 1
+            delta.agregar_valores(fila['estado'], fila['fecha_postulacion'], fila.get('fecha_respuesta'), 1)
+            cambios.append(_estado_inicial(postulacion_id, fila['estado'], fila['fecha_postulacion']))
+            if fila.get('tags'):
+                tags_nuevas[postulacion_id] = parse_tags(fila['tags'])
+            continue
+        
+        resultado['actualizadas'] += 1
+        nuevo = {
+            campo: fila.get(campo) if campo in actualizar else getattr(anterior, campo)
+            for campo in ('estado', 'fecha_postulacion', 'fecha_respuesta')
+        }
+        delta.agregar(anterior, -1)
+        delta.agregar_valores(nuevo['estado'], nuevo['fecha_postulacion'], nuevo['fecha_respuesta'], 1)
+        if nuevo['estado'] != anterior.estado:
+            cambios.append((postulacion_id, anterior.estado, nuevo['estado'], now))
+        if 'tags' in actualizar:
+            tags_actualizadas[postulacion_id] = parse_tags(fila.get('tags'))
+    delta.aplicar(db)
+    _registrar_estados(db, cambios)
+    
+    _sincronizar_tags(db, tags_nuevas, nuevas=True)
+    _sincronizar_tags(db, tags_actualizadas)
+    
+    if commit:
+        db.commit()
+        _despues_de_escribir([postulacion_id for postulacion_id, _ in guardadas])
+    return resultado
 
 
 def bulk_import(db, postulaciones: List[Dict]) -> int:
-    """Bulk import job applications from CSV"""
-    count = 0
-    for p in postulaciones:
-        try:
-            # Parse dates
-            fecha_post = p.get('fecha_postulacion')
-            if fecha_post and isinstance(fecha_post, str):
-                fecha_post = datetime.strptime(fecha_post, '%Y-%m-%d').date()
-            
-            fecha_seg = p.get('fecha_seguimiento')
-            if fecha_seg and isinstance(fecha_seg, str):
-                fecha_seg = datetime.strptime(fecha_seg, '%Y-%m-%d').date()
-            
-            fecha_resp = p.get('fecha_respuesta')
-            if fecha_resp and isinstance(fecha_resp, str):
-                fecha_resp = datetime.strptime(fecha_resp, '%Y-%m-%d').date()
-            
-            postulacion = Postulacion(
-                empresa=p.get('empresa', 'Sin empresa'),
-                puesto=p.get('puesto', 'Sin puesto'),
-                url_oferta=p.get('url_oferta'),
-                fecha_postulacion=fecha_post or datetime.now().date(),
-                estado=p.get('estado', 'Postulado'),
-                notas=p.get('notas'),
-                fecha_seguimiento=fecha_seg,
-                fecha_respuesta=fecha_resp,
-                tags=p.get('tags'),
-                contacto_nombre=p.get('contacto_nombre'),
-                contacto_email=p.get('contacto_email'),
-                salario_ofrecido=p.get('salario_ofrecido'),
-                ubicacion=p.get('ubicacion'),
-                modalidad=p.get('modalidad')
+    """Bulk import job applications from CSV rows; see importacion.importar_filas for the full report"""
+    from importacion import importar_filas
+    return importar_filas(db, postulaciones).insertadas
+
+
+OPERACIONES_LOTE = ('crear', 'actualizar', 'eliminar')
+
+# Columns a batch operation may not set directly
+_COLUMNAS_PROTEGIDAS = {'id', 'huella', 'created_at', 'updated_at', *COLUMNAS_SALARIO}
+
+
+def _resolver_huellas(db, filas: List[Dict[str, Any]], eliminadas: set):
+    """Set huella on new/changed rows, or NULL when another row already owns it (as _huella_libre)"""
+    tabla = Postulacion.__table__
+    for fila in filas:
+        fila['huella'] = huella_postulacion(fila['empresa'], fila['puesto'], fila.get('url_oferta'))
+    recalculadas = {fila.get('id') for fila in filas}
+    candidatas = list({fila['huella'] for fila in filas})
+    ocupadas = set()
+    for i in range(0, len(candidatas), _LOTE_BUSQUEDA):
+        ocupadas.update(
+            huella for huella, dueno in db.execute(
+                select(tabla.c.huella, tabla.c.id).where(tabla.c.huella.in_(candidatas[i:i + _LOTE_BUSQUEDA]))
             )
-            db.add(postulacion)
-            count += 1
-        except Exception as e:
-            print(f"Error importing row: {e}")
+            # Rows deleted or re-fingerprinted in this batch release their huella
+            if dueno not in eliminadas and dueno not in recalculadas
+        )
+    for fila in filas:
+        if fila['huella'] in ocupadas:
+            fila['huella'] = None
+        else:
+            ocupadas.add(fila['huella'])
+
+
+def aplicar_operaciones(
+    db,
+    operaciones: List[Dict[str, Any]],
+    atomico: bool = False,
+    commit: bool = True
+) -> List[Dict[str, Any]]:
+    """Apply a batch of create/update/delete operations in one transaction
+    
+    Each operation is {'op': 'crear' | 'actualizar' | 'eliminar', 'id': ..., 'campos': {...}}
+    ('crear' has no id, 'eliminar' no campos). Operations are replayed in order
+    on an in-memory copy of the rows they touch, then the net result is written
+    with one DELETE per table, one executemany UPDATE per set of changed columns
+    and one INSERT, keeping stats, history, tags and huellas in sync. Returns one
+    {'ok', 'id', 'error'} dict per operation; with atomico=True nothing is
+    written if any operation fails.
+    """
+    tabla = Postulacion.__table__
+    ids = list({op['id'] for op in operaciones if op['op'] != 'crear'})
+    actuales = {}
+    for i in range(0, len(ids), _LOTE_BUSQUEDA):
+        for fila in db.execute(select(tabla).where(tabla.c.id.in_(ids[i:i + _LOTE_BUSQUEDA]))).mappings():
+            actuales[fila['id']] = dict(fila)
+    originales = {postulacion_id: dict(fila) for postulacion_id, fila in actuales.items()}
+    
+    now = datetime.now()
+    resultados = []
+    creadas = []  # (index in resultados, column values)
+    cambiadas = {}  # id -> changed column names
+    eliminadas = set()
+    cambios = []
+    for op in operaciones:
+        if op['op'] not in OPERACIONES_LOTE:
+            raise ValueError(f"Operación inválida: {op['op']}")
+        campos = {k: v for k, v in (op.get('campos') or {}).items() if k in tabla.c and k not in _COLUMNAS_PROTEGIDAS}
+        if 'salario_ofrecido' in campos:
+            campos.update(columnas_salario(campos['salario_ofrecido']))
+        if op['op'] == 'crear':
+            valores = {'estado': 'Postulado', 'fecha_postulacion': date.today(), **campos}
+            valores['created_at'] = valores['updated_at'] = now
+            creadas.append((len(resultados), valores))
+            resultados.append({'ok': True, 'id': None})
             continue
+        
+        fila = actuales.get(op['id'])
+        if fila is None:
+            resultados.append({'ok': False, 'id': op['id'], 'error': 'Postulación no encontrada'})
+            continue
+        if op['op'] == 'eliminar':
+            del actuales[op['id']]
+            cambiadas.pop(op['id'], None)
+            eliminadas.add(op['id'])
+        else:
+            if campos.get('estado', fila['estado']) != fila['estado']:
+                cambios.append((op['id'], fila['estado'], campos['estado'], now))
+            fila.update(campos)
+            fila['updated_at'] = now
+            cambiadas.setdefault(op['id'], set()).update(campos, ['updated_at'])
+        resultados.append({'ok': True, 'id': op['id']})
     
-    db.commit()
-    return count
+    if atomico and not all(r['ok'] for r in resultados):
+        return resultados
+    
+    refirmadas = [postulacion_id for postulacion_id, columnas in cambiadas.items() if columnas & {'empresa', 'puesto', 'url_oferta'}]
+    _resolver_huellas(db, [actuales[i] for i in refirmadas] + [valores for _, valores in creadas], eliminadas)
+    for postulacion_id in refirmadas:
+        cambiadas[postulacion_id].add('huella')
+    
+    delta = _StatsDelta()
+    if eliminadas:
+        lista = list(eliminadas)
+        for i in range(0, len(lista), _LOTE_BUSQUEDA):
+            parte = lista[i:i + _LOTE_BUSQUEDA]
+            db.execute(delete(PostulacionTag).where(PostulacionTag.postulacion_id.in_(parte)))
+            db.execute(delete(EstadoHistorial).where(EstadoHistorial.postulacion_id.in_(parte)))
+            db.execute(delete(tabla).where(tabla.c.id.in_(parte)))
+        for postulacion_id in eliminadas:
+            o = originales[postulacion_id]
+            delta.agregar_valores(o['estado'], o['fecha_postulacion'], o['fecha_respuesta'], -1)
+    
+    grupos = {}
+    for postulacion_id, columnas in cambiadas.items():
+        o, n = originales[postulacion_id], actuales[postulacion_id]
+        delta.agregar_valores(o['estado'], o['fecha_postulacion'], o['fecha_respuesta'], -1)
+        delta.agregar_valores(n['estado'], n['fecha_postulacion'], n['fecha_respuesta'], 1)
+        grupos.setdefault(tuple(sorted(columnas)), []).append(
+            {'b_id': postulacion_id, **{f'b_{c}': n[c] for c in columnas}}
+        )
+    for columnas, parametros in grupos.items():
+        db.execute(
+            update(tabla).where(tabla.c.id == bindparam('b_id')).values({c: bindparam(f'b_{c}') for c in columnas}),
+            parametros
+        )
+    
+    # Transitions of rows deleted later in the batch; SQLite may hand their ids to the new rows
+    cambios = [cambio for cambio in cambios if cambio[0] not in eliminadas]
+    tags_nuevas = {}
+    if creadas:
+        columnas = sorted({c for _, valores in creadas for c in valores})
+        filas = [{c: valores.get(c) for c in columnas} for _, valores in creadas]
+        nuevos_ids = db.execute(
+            insert(tabla).returning(tabla.c.id, sort_by_parameter_order=True), filas
+        ).scalars().all()
+        for (indice, valores), postulacion_id in zip(creadas, nuevos_ids):
+            resultados[indice]['id'] = postulacion_id
+            delta.agregar_valores(valores['estado'], valores['fecha_postulacion'], valores.get('fecha_respuesta'), 1)
+            cambios.append(_estado_inicial(postulacion_id, valores['estado'], valores['fecha_postulacion']))
+            if valores.get('tags'):
+                tags_nuevas[postulacion_id] = parse_tags(valores['tags'])
+    
+    delta.aplicar(db)
+    _registrar_estados(db, cambios)
+    _sincronizar_tags(db, tags_nuevas, nuevas=True)
+    _sincronizar_tags(db, {
+        postulacion_id: parse_tags(actuales[postulacion_id]['tags'])
+        for postulacion_id, columnas in cambiadas.items() if 'tags' in columnas
+    })
+    
+    if commit:
+        db.commit()
+        nuevos = [resultados[indice]['id'] for indice, _ in creadas]
+        _despues_de_escribir([*cambiadas, *nuevos], eliminadas.difference(nuevos))
+    return resultados
+
@@ -0,0 +1,75 @@
+"""
+Async database access for Job Application Tracker
+
+AsyncSession-based variants of the operations in database.py, so FastAPI
+handlers can await them instead of blocking the event loop. SQLite URLs use
+aiosqlite and PostgreSQL URLs use asyncpg; each function runs the matching
+database.py implementation through AsyncSession.run_sync, so both layers
+share the same queries, stats maintenance and tag syncing.
+"""
+from functools import wraps
+import os
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+import database
+
+
+def _async_url(url: str) -> str:
+    """Map a sync DATABASE_URL to its async driver"""
+    if url.startswith('sqlite://'):
+        return 'sqlite+aiosqlite://' + url[len('sqlite://'):]
+    for prefijo in ('postgresql://', 'postgres://', 'postgresql+psycopg2://'):
+        if url.startswith(prefijo):
+            return 'postgresql+asyncpg://' + url[len(prefijo):]
+    return url
+
+
+ASYNC_DATABASE_URL = os.getenv('ASYNC_DATABASE_URL', _async_url(database.DATABASE_URL))
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **database.opciones_pool(ASYNC_DATABASE_URL))
+database.aplicar_perfil_sqlite(async_engine.sync_engine)
+# Objects must stay usable after commit: lazy refreshes can't run outside run_sync
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db():
+    """Get async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _en_sesion(fn):
+    """Async version of a database.py function taking the session as first argument"""
+    @wraps(fn)
+    async def wrapper(db: AsyncSession, *args, **kwargs):
+        return await db.run_sync(fn, *args, **kwargs)
+    return wrapper
+
+
+create_postulacion = _en_sesion(database.create_postulacion)
+get_postulacion = _en_sesion(database.get_postulacion)
+get_postulaciones = _en_sesion(database.get_postulaciones)
+get_postulaciones_pagina = _en_sesion(database.get_postulaciones_pagina)
+count_postulaciones = _en_sesion(database.count_postulaciones)
+buscar_postulaciones = _en_sesion(database.buscar_postulaciones)
+update_postulacion = _en_sesion(database.update_postulacion)
+delete_postulacion = _en_sesion(database.delete_postulacion)
+aplicar_operaciones = _en_sesion(database.aplicar_operaciones)
+get_tag_facets = _en_sesion(database.get_tag_facets)
+get_dashboard_stats = _en_sesion(database.get_dashboard_stats)
+get_metricas_series = _en_sesion(database.get_metricas_series)
+get_funnel_metricas = _en_sesion(database.get_funnel_metricas)
+get_salarios_metricas = _en_sesion(database.get_salarios_metricas)
+compute_dashboard_stats = _en_sesion(database.compute_dashboard_stats)
+get_seguimientos_pendientes = _en_sesion(database.get_seguimientos_pendientes)
+get_postulaciones_para_exportar = _en_sesion(database.get_postulaciones_para_exportar)
+select_postulaciones_para_exportar = _en_sesion(database.select_postulaciones_para_exportar)
+bulk_import = _en_sesion(database.bulk_import)
+
+
+async def iter_postulaciones_para_exportar(db: AsyncSession, batch: int = 1000, **filtros):
+    """Yield export rows in chunks of `batch` using a server-side streaming cursor"""
+    query = await select_postulaciones_para_exportar(db, **filtros)
+    result = await db.stream(query.execution_options(yield_per=batch))
+    async for lote in result.partitions():
+        yield lote
@@ -0,0 +1,259 @@
+"""
+Live updates for Job Application Tracker (Server-Sent Events)
+
+Open dashboards and lists subscribe to /api/eventos instead of reloading.
+database.py notifies the Difusor after every committed write with the ids of
+the changed and deleted applications; off the request path the Difusor then
+computes the dashboard stats and loads the changed rows once per burst of
+writes, encodes one event and hands the same string to every open stream. N
+open dashboards cost one computation per change rather than one per refresh.
+
+Events:
+
+- `stats` (first message of every stream): {"version", "stats"} with the full
+  get_dashboard_stats dict
+- `cambios`: {"desde", "version", "stats", "filas", "eliminadas", "recargar"}
+  where stats holds only the keys whose value changed since the stats of data
+  version `desde` (all of them when desde is null), filas the changed
+  applications (same keys as the JSON list API) and eliminadas the deleted
+  ids. A client whose last version isn't `desde` reloads /api/stats instead
+  of applying the delta. Past MAX_FILAS_EVENTO changed rows (imports), filas
+  is empty and recargar is true.
+
+With several worker processes a write served by another worker is noticed
+through the shared data version (cache.version_datos) within EVENTOS_SONDEO
+seconds and sent as a stats-only update.
+"""
+import asyncio
+import json
+import os
+import signal
+import threading
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+import cache
+from database import COLUMNAS_LISTA, SessionLocal, al_escribir, get_dashboard_stats, get_postulaciones_por_id
+
+# Seconds a write waits for others to join it before the event is computed
+EVENTOS_ESPERA = float(os.getenv('EVENTOS_ESPERA', '0.1'))
+# Seconds between checks of the shared data version (writes in other workers)
+EVENTOS_SONDEO = float(os.getenv('EVENTOS_SONDEO', '2'))
+# Seconds between keep-alive comments on an idle stream (proxies drop silent connections)
+EVENTOS_LATIDO = float(os.getenv('EVENTOS_LATIDO', '15'))
+# Changed rows sent in one event; larger batches ask the lists to reload
+MAX_FILAS_EVENTO = 200
+# Events buffered per client; a client that falls this far behind is disconnected
+MAX_COLA_CLIENTE = 64
+# Milliseconds the browser waits before reconnecting a dropped stream
+REINTENTO_MS = 3000
+
+
+def _json(valor):
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    raise TypeError(f"{type(valor).__name__} no es serializable")
+
+
+def mensaje_sse(evento: str, datos: Dict[str, Any], reintento: Optional[int] = None) -> str:
+    """One encoded Server-Sent Events message"""
+    lineas = [f'retry: {reintento}'] if reintento is not None else []
+    lineas.append(f'event: {evento}')
+    lineas.append('data: ' + json.dumps(datos, default=_json, ensure_ascii=False, separators=(',', ':')))
+    return '\n'.join(lineas) + '\n\n'
+
+
+def delta_stats(anterior: Optional[Dict[str, Any]], actual: Dict[str, Any]) -> Dict[str, Any]:
+    """The keys of actual whose value differs from anterior (all of them without anterior)"""
+    if anterior is None:
+        return dict(actual)
+    return {clave: valor for clave, valor in actual.items() if anterior.get(clave) != valor}
+
+
+class Difusor:
+    """Fan-out of write notifications to the open /api/eventos streams"""
+
+    def __init__(self, espera: float = EVENTOS_ESPERA, sondeo: float = EVENTOS_SONDEO, latido: float = EVENTOS_LATIDO):
+        self.espera = espera
+        self.sondeo = sondeo
+        self.latido = latido
+        self.eventos = 0  # Events sent (each once, whatever the number of clients)
+        self.calculos = 0  # Stats computations made for them
+        self._clientes: Set[asyncio.Queue] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tarea: Optional[asyncio.Task] = None
+        self._pendiente: Optional[asyncio.Event] = None
+        self._lock = threading.Lock()
+        self._cambiadas: Set[int] = set()
+        self._eliminadas: Set[int] = set()
+        # Stats and data version of the last event; every connected client is in sync with them
+        self._stats: Optional[Dict[str, Any]] = None
+        self._version: Optional[str] = None
+
+    def notificar(self, cambiadas: List[int], eliminadas: List[int]):
+        """database write listener; runs on the writing thread"""
+        loop = self._loop
+        if loop is None or not self._clientes:
+            return
+        with self._lock:
+            self._cambiadas.update(cambiadas)
+            self._cambiadas.difference_update(eliminadas)
+            self._eliminadas.update(eliminadas)
+        try:
+            loop.call_soon_threadsafe(self._pendiente.set)
+        except RuntimeError:  # Loop already closed (shutting down)
+            pass
+
+    def _calcular(self, cambiadas: Set[int], eliminadas: Set[int]) -> Optional[str]:
+        """Encoded `cambios` event for the pending changes, or None if nothing visible changed"""
+        # Read before the queries, like the ETags: a write racing them only causes one more event
+        version = cache.version_datos()
+        with SessionLocal() as db:
+            stats = get_dashboard_stats(db)
+            recargar = len(cambiadas) > MAX_FILAS_EVENTO
+            filas = [] if recargar else get_postulaciones_por_id(db, list(cambiadas), columnas=COLUMNAS_LISTA)
+        self.calculos += 1
+        delta = delta_stats(self._stats, stats)
+        desde = self._version
+        self._stats, self._version = stats, version
+        if not (delta or filas or eliminadas or recargar):
+            return None
+        return mensaje_sse('cambios', {
+            'desde': desde,
+            'version': version,
+            'stats': delta,
+            'filas': [dict(fila._mapping) for fila in filas],
+            'eliminadas': sorted(eliminadas),
+            'recargar': recargar
+        })
+
+    async def _bucle(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._pendiente.wait(), self.sondeo)
+            except asyncio.TimeoutError:
+                # No local write: look for one made by another worker
+                if not self._clientes or self._version is None or cache.version_datos() == self._version:
+                    continue
+            await asyncio.sleep(self.espera)
+            self._pendiente.clear()
+            with self._lock:
+                cambiadas, eliminadas = self._cambiadas, self._eliminadas
+                self._cambiadas, self._eliminadas = set(), set()
+            if not self._clientes:
+                continue
+            try:
+                mensaje = await asyncio.to_thread(self._calcular, cambiadas, eliminadas)
+            except Exception as e:
+                # Keep running: the clients get the next successful event
+                print(f"Eventos: error al calcular los cambios: {type(e).__name__}: {e}")
+                continue
+            if mensaje is not None:
+                self._difundir(mensaje)
+
+    def _difundir(self, mensaje: Optional[str]):
+        """Queue the same message for every client (None closes the streams)"""
+        self.eventos += mensaje is not None
+        for cola in list(self._clientes):
+            try:
+                cola.put_nowait(mensaje)
+            except asyncio.QueueFull:
+                # Too slow to keep up: drop it, the browser reconnects with a fresh snapshot
+                self._clientes.discard(cola)
+                while not cola.empty():
+                    cola.get_nowait()
+                cola.put_nowait(None)
+
+    async def suscribir(self) -> asyncio.Queue:
+        """Register a client; its queue starts with the full stats snapshot"""
+        version, stats = cache.version_datos(), self._stats
+        if stats is None or version != self._version or not self._clientes:
+            # Writes aren't tracked without clients, and one may be on its way to them
+            stats = await asyncio.to_thread(self._stats_actuales)
+            if not self._clientes:
+                self._stats, self._version = stats, version
+        cola = asyncio.Queue(maxsize=MAX_COLA_CLIENTE)
+        cola.put_nowait(mensaje_sse('stats', {'version': version, 'stats': stats}, reintento=REINTENTO_MS))
+        self._clientes.add(cola)
+        return cola
+
+    def desuscribir(self, cola: asyncio.Queue):
+        self._clientes.discard(cola)
+
+    @staticmethod
+    def _stats_actuales() -> Dict[str, Any]:
+        with SessionLocal() as db:
+            return get_dashboard_stats(db)
+
+    async def flujo(self, desconectado: Callable[[], Awaitable[bool]]):
+        """Body of one /api/eventos response: the snapshot, then every event, with keep-alives"""
+        cola = await self.suscribir()
+        try:
+            while True:
+                try:
+                    mensaje = await asyncio.wait_for(cola.get(), self.latido)
+                except asyncio.TimeoutError:
+                    if await desconectado():
+                        break
+                    mensaje = ': latido\n\n'
+                if mensaje is None:
+                    break
+                yield mensaje
+        finally:
+            self.desuscribir(cola)
+
+    def _cerrar_al_salir(self):
+        """Close the streams as soon as the server is told to exit
+
+        uvicorn waits for open responses before running the lifespan shutdown,
+        and event streams never end on their own. Its SIGINT/SIGTERM handlers
+        are wrapped so the streams end first; browsers reconnect to whichever
+        server comes up next.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return
+        loop = self._loop
+        for senal in (signal.SIGINT, signal.SIGTERM):
+            anterior = signal.getsignal(senal)
+            if not callable(anterior):
+                continue
+
+            def manejador(signum, frame, anterior=anterior):
+                loop.call_soon_threadsafe(self._difundir, None)
+                anterior(signum, frame)
+            signal.signal(senal, manejador)
+
+    def iniciar(self):
+        """Start delivering events on the running event loop (no-op if running)"""
+        if self._tarea is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._pendiente = asyncio.Event()
+        self._tarea = self._loop.create_task(self._bucle())
+        al_escribir(self.notificar)
+        self._cerrar_al_salir()
+
+    async def detener(self):
+        if self._tarea is None:
+            return
+        self._difundir(None)
+        self._clientes.clear()
+        self._tarea.cancel()
+        try:
+            await self._tarea
+        except asyncio.CancelledError:
+            pass
+        self._tarea = None
+        self._loop = None
+        self._stats = self._version = None
+
+    def estado(self) -> Dict[str, Any]:
+        return {
+            'activo': self._tarea is not None,
+            'clientes': len(self._clientes),
+            'eventos': self.eventos,
+            'calculos': self.calculos
+        }
+
+
+difusor = Difusor()
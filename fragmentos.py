@@ -0,0 +1,45 @@
+"""
+Fragment cache for Job Application Tracker templates
+
+A Jinja extension adding a `{% cache key, ... %}...{% endcache %}` block: the
+rendered body is kept in a cache.CacheTTL under the given key values plus
+today's date, and reused until a write clears it. Pages pass the data version
+they read (cache.version_datos(), taken before their queries) as part of the
+key, so a fragment rendered from results older than a concurrent write is
+never served after it, including in other worker processes.
+
+    {% cache 'pipeline', version_datos %} ... {% endcache %}
+"""
+from datetime import date
+
+from jinja2 import nodes
+from jinja2.ext import Extension
+
+import cache
+
+fragmentos = cache.nueva_cache('fragmentos', maxsize=64)
+
+
+class CacheFragmentos(Extension):
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        clave = [parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            clave.append(parser.parse_expression())
+        cuerpo = parser.parse_statements(('name:endcache',), drop_needle=True)
+        return nodes.CallBlock(
+            self.call_method('_renderizar', [nodes.List(clave)]), [], [], cuerpo
+        ).set_lineno(lineno)
+
+    def _renderizar(self, clave, caller) -> str:
+        if fragmentos.ttl <= 0:
+            return caller()
+        clave = (tuple(clave), date.today())
+        html = fragmentos.get(clave)
+        if html is cache._SIN_VALOR:
+            generacion = fragmentos.generacion
+            html = caller()
+            fragmentos.set(clave, html, generacion)
+        return html
@@ -0,0 +1,154 @@
+"""
+Streaming CSV import for Job Application Tracker
+
+Rows are parsed and validated one at a time and inserted in batches through
+database.insert_postulaciones, one transaction per batch, so memory use does
+not depend on the size of the file. Applications already in the database
+(same normalized empresa, puesto and url_oferta) are skipped or updated
+depending on the mode, so re-importing a file is idempotent.
+"""
+import csv
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, IO, Iterable, List, Optional, Tuple
+
+from database import ESTADOS, MODOS_IMPORTACION, insert_postulaciones
+
+BATCH_SIZE = 5000
+
+# Keep the report small for huge files with systematic errors
+MAX_ERRORES = 1000
+
+CAMPOS_FECHA = ('fecha_postulacion', 'fecha_seguimiento', 'fecha_respuesta')
+CAMPOS_TEXTO = (
+    'url_oferta', 'notas', 'tags', 'contacto_nombre', 'contacto_email',
+    'salario_ofrecido', 'ubicacion', 'modalidad'
+)
+
+
+@dataclass
+class ReporteImportacion:
+    """Outcome of an import: counts plus the rejected rows and why"""
+    modo: str = 'omitir'
+    dry_run: bool = False
+    filas: int = 0
+    insertadas: int = 0
+    actualizadas: int = 0
+    omitidas: int = 0
+    lotes: int = 0
+    rechazadas: int = 0
+    errores: List[Dict[str, Any]] = field(default_factory=list)
+    
+    def rechazar(self, numeros: List[int], motivos: List[str]):
+        self.rechazadas += len(numeros)
+        for numero in numeros:
+            if len(self.errores) < MAX_ERRORES:
+                self.errores.append({'fila': numero, 'errores': motivos})
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'modo': self.modo,
+            'dry_run': self.dry_run,
+            'filas': self.filas,
+            'insertadas': self.insertadas,
+            'actualizadas': self.actualizadas,
+            'omitidas': self.omitidas,
+            'rechazadas': self.rechazadas,
+            'lotes': self.lotes,
+            'errores': self.errores,
+            'errores_truncados': self.rechazadas > len(self.errores)
+        }
+
+
+def _texto(valor) -> Optional[str]:
+    """Strip strings and turn blanks into NULL"""
+    if valor is None:
+        return None
+    valor = str(valor).strip()
+    return valor or None
+
+
+def validar_fila(fila: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    """Convert a CSV row into Postulacion column values; returns (valores, errores)"""
+    errores = []
+    valores = {
+        'empresa': _texto(fila.get('empresa')) or 'Sin empresa',
+        'puesto': _texto(fila.get('puesto')) or 'Sin puesto',
+        'estado': _texto(fila.get('estado')) or 'Postulado',
+    }
+    if valores['estado'] not in ESTADOS:
+        errores.append(f"estado inválido: {valores['estado']!r}")
+    
+    for campo in CAMPOS_FECHA:
+        valor = fila.get(campo)
+        if isinstance(valor, str):
+            valor = valor.strip()
+            try:
+                # fromisoformat is an order of magnitude faster than strptime
+                valor = date.fromisoformat(valor) if valor else None
+            except ValueError:
+                errores.append(f"{campo}: fecha inválida {valor!r} (se espera AAAA-MM-DD)")
+                valor = None
+        valores[campo] = valor or None
+    valores['fecha_postulacion'] = valores['fecha_postulacion'] or date.today()
+    
+    for campo in CAMPOS_TEXTO:
+        valores[campo] = _texto(fila.get(campo))
+    
+    return valores, errores
+
+
+def importar_filas(
+    db,
+    filas: Iterable[Dict[str, Any]],
+    batch_size: int = BATCH_SIZE,
+    modo: str = 'omitir',
+    dry_run: bool = False
+) -> ReporteImportacion:
+    """Validate and insert rows in batches of `batch_size`, one transaction per batch
+    
+    modo='omitir' skips applications that already exist, 'actualizar' overwrites
+    them with the columns present in the file. dry_run validates and classifies
+    the rows without writing anything.
+    """
+    if modo not in MODOS_IMPORTACION:
+        raise ValueError(f"Modo de importación inválido: {modo}")
+    reporte = ReporteImportacion(modo=modo, dry_run=dry_run)
+    lote, numeros = [], []
+    columnas = None
+    
+    def insertar():
+        try:
+            resultado = insert_postulaciones(db, lote, modo=modo, columnas=columnas, dry_run=dry_run)
+        except Exception as e:
+            db.rollback()
+            reporte.rechazar(numeros, [f"error de base de datos: {e}"])
+        else:
+            reporte.insertadas += resultado['insertadas']
+            reporte.actualizadas += resultado['actualizadas']
+            reporte.omitidas += resultado['omitidas']
+            reporte.lotes += 1
+    
+    for numero, fila in enumerate(filas, start=1):
+        if columnas is None:
+            # Only columns present in the source overwrite existing applications
+            columnas = [c for c in ('empresa', 'puesto', 'estado') + CAMPOS_FECHA + CAMPOS_TEXTO if c in fila]
+        reporte.filas += 1
+        valores, errores = validar_fila(fila)
+        if errores:
+            reporte.rechazar([numero], errores)
+            continue
+        lote.append(valores)
+        numeros.append(numero)
+        if len(lote) >= batch_size:
+            insertar()
+            lote, numeros = [], []
+    
+    if lote:
+        insertar()
+    return reporte
+
+
+def importar_csv(db, archivo: IO[str], batch_size: int = BATCH_SIZE, **opciones) -> ReporteImportacion:
+    """Import a CSV text stream whose header uses the export column names"""
+    return importar_filas(db, csv.DictReader(archivo), batch_size=batch_size, **opciones)
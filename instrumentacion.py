@@ -0,0 +1,136 @@
+"""
+Instrumentation for Job Application Tracker
+
+Minimal Prometheus-style metrics without extra dependencies: latency
+histograms per route, per database.py function (from SQLAlchemy cursor
+events) and per template, plus the number of queries each request ran.
+main.py serves them at /metrics in the text exposition format.
+"""
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import jinja2
+from sqlalchemy import event
+
+import database
+
+BUCKETS_HTTP = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_CONSULTA = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+BUCKETS_CONTEO = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Histograma:
+    """Cumulative histogram per label set"""
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Sequence[str], buckets: Sequence[float]):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}  # labels -> [count per bucket..., sum, count]
+        self._lock = threading.Lock()
+
+    def observar(self, valor: float, *etiquetas: str):
+        with self._lock:
+            serie = self._series.get(etiquetas)
+            if serie is None:
+                serie = self._series[etiquetas] = [0] * (len(self.buckets) + 2)
+            for i, limite in enumerate(self.buckets):
+                if valor <= limite:
+                    serie[i] += 1
+            serie[-2] += valor
+            serie[-1] += 1
+
+    def exponer(self) -> List[str]:
+        lineas = [f"# HELP {self.nombre} {self.ayuda}", f"# TYPE {self.nombre} histogram"]
+        with self._lock:
+            series = {clave: list(serie) for clave, serie in self._series.items()}
+        for clave, serie in sorted(series.items()):
+            base = ','.join(f'{e}="{_escapar(v)}"' for e, v in zip(self.etiquetas, clave))
+            sep = ',' if base else ''
+            for limite, n in zip(self.buckets, serie):
+                lineas.append(f'{self.nombre}_bucket{{{base}{sep}le="{limite}"}} {n}')
+            lineas.append(f'{self.nombre}_bucket{{{base}{sep}le="+Inf"}} {serie[-1]}')
+            lineas.append(f'{self.nombre}_sum{{{base}}} {serie[-2]:.6f}')
+            lineas.append(f'{self.nombre}_count{{{base}}} {serie[-1]}')
+        return lineas
+
+
+DURACION_HTTP = Histograma(
+    'http_request_duration_seconds', 'Request latency by route template',
+    ('route', 'method', 'status'), BUCKETS_HTTP
+)
+CONSULTAS_HTTP = Histograma(
+    'http_request_db_queries', 'Database queries executed per request',
+    ('route', 'method'), BUCKETS_CONTEO
+)
+DURACION_CONSULTA = Histograma(
+    'db_query_duration_seconds', 'Query latency by calling database.py function',
+    ('function',), BUCKETS_CONSULTA
+)
+DURACION_PLANTILLA = Histograma(
+    'template_render_seconds', 'Jinja template render time',
+    ('template',), BUCKETS_CONSULTA
+)
+HISTOGRAMAS = [DURACION_HTTP, CONSULTAS_HTTP, DURACION_CONSULTA, DURACION_PLANTILLA]
+
+# Query counter of the request being served; run_in_threadpool and run_sync carry it along
+_consultas: ContextVar[Optional[List[int]]] = ContextVar('consultas', default=None)
+
+
+def iniciar_conteo() -> List[int]:
+    """Start counting the queries of the current request; returns the mutable counter"""
+    contador = [0]
+    _consultas.set(contador)
+    return contador
+
+
+def _funcion_llamadora() -> str:
+    """Outermost database.py function on the stack (the one the caller invoked)"""
+    frame = sys._getframe(2)
+    nombre = 'other'
+    while frame is not None:
+        if frame.f_code.co_filename == database.__file__ and frame.f_code.co_name != '<module>':
+            nombre = frame.f_code.co_name
+        frame = frame.f_back
+    return nombre
+
+
+def instrumentar_engine(engine):
+    """Time every statement of a (sync) engine and count it for the current request"""
+    @event.listens_for(engine, 'before_cursor_execute')
+    def antes(conn, cursor, statement, parameters, context, executemany):
+        context._inicio_consulta = time.perf_counter()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def despues(conn, cursor, statement, parameters, context, executemany):
+        DURACION_CONSULTA.observar(time.perf_counter() - context._inicio_consulta, _funcion_llamadora())
+        contador = _consultas.get()
+        if contador is not None:
+            contador[0] += 1
+
+
+class PlantillaMedida(jinja2.Template):
+    """Template that records its render time"""
+
+    def render(self, *args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return super().render(*args, **kwargs)
+        finally:
+            DURACION_PLANTILLA.observar(time.perf_counter() - inicio, self.name or '<string>')
+
+
+def exponer() -> str:
+    """All metrics in the Prometheus text exposition format"""
+    lineas = []
+    for histograma in HISTOGRAMAS:
+        lineas += histograma.exponer()
+    return '\n'.join(lineas) + '\n'
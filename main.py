@@ -1,29 +1,66 @@
 """
 Job Application Tracker - FastAPI Application
 """
-from fastapi import FastAPI, Request, Depends, Form, Query, HTTPException
-from fastapi.responses import HTMLResponse, RedirectResponse, FileResponse, JSONResponse
+from fastapi import FastAPI, Request, Depends, Form, Query, HTTPException, File, UploadFile
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, StreamingResponse, Response, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session
+from jinja2 import FileSystemBytecodeCache
+from starlette.concurrency import run_in_threadpool
+from starlette.routing import Match
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
-from datetime import datetime, date
+from contextlib import asynccontextmanager
+from datetime import datetime, date, time, timezone
+from email.utils import format_datetime
+from urllib.parse import urlencode
 import csv
 import io
+import os
+import re
+import zlib
 from pathlib import Path
-
-from database import (
-    get_db, create_postulacion, get_postulacion, get_postulaciones,
-    update_postulacion, delete_postulacion, get_dashboard_stats,
-    get_seguimientos_pendientes, get_postulaciones_para_exportar,
-    bulk_import, ESTADOS, Postulacion
+from time import perf_counter
+
+import cache
+import fragmentos
+import instrumentacion
+from database import ESTADOS, COLUMNAS_EXPORTAR, COLUMNAS_LISTA, Postulacion, SessionLocal, encode_cursor, engine, init_db
+from eventos import difusor
+from importacion import BATCH_SIZE, importar_csv
+from operaciones import LoteOperaciones, a_operaciones
+from planificador import planificador
+from database_async import (
+    AsyncSessionLocal, async_engine, get_async_db, iter_postulaciones_para_exportar, create_postulacion, get_postulacion, get_postulaciones,
+    get_postulaciones_pagina, count_postulaciones, buscar_postulaciones,
+    get_tag_facets,
+    update_postulacion, delete_postulacion, aplicar_operaciones, get_dashboard_stats, get_metricas_series,
+    get_funnel_metricas, get_salarios_metricas,
+    get_seguimientos_pendientes
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Check/migrate the schema before serving; run the background scheduler and live updates while serving"""
+    # servidor.py migrates once before starting the workers
+    if os.getenv('ESQUEMA_LISTO') != '1':
+        await run_in_threadpool(init_db)
+    cache.nuevo_arranque()
+    planificador.iniciar()
+    difusor.iniciar()
+    yield
+    await difusor.detener()
+    await planificador.detener()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Job Application Tracker",
     description="Sistema de seguimiento de postulaciones laborales",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Mount static files
@@ -31,22 +68,108 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 
 # Templates
 templates = Jinja2Templates(directory="templates")
+templates.env.template_class = instrumentacion.PlantillaMedida
+templates.env.add_extension(fragmentos.CacheFragmentos)
+# Compiled templates persist across restarts, so a fresh process skips parsing/codegen
+JINJA_CACHE_DIR = os.getenv('JINJA_CACHE_DIR', os.path.join('data', 'jinja'))
+Path(JINJA_CACHE_DIR).mkdir(parents=True, exist_ok=True)
+templates.env.bytecode_cache = FileSystemBytecodeCache(JINJA_CACHE_DIR)
+templates.env.globals['now'] = datetime.now
 
 # Ensure data directory exists
 Path("data").mkdir(exist_ok=True)
 
+# Read-only GET routes whose output depends only on the data version and the date
+RUTAS_CONDICIONALES = re.compile(
+    r'^/(postulaciones(/\d+)?|metricas|api/(stats|seguimientos|postulaciones|tags|buscar|metricas/\w+))?$'
+)
+
+
+def _no_modificado(request: Request, etag: str) -> bool:
+    """Whether the client's copy (If-None-Match) is current
+
+    If-Modified-Since alone never gives a 304: Last-Modified has one-second
+    resolution, so a write in the same second as the client's copy would go
+    unnoticed.
+    """
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is None:
+        return False
+    etiquetas = [e.strip().removeprefix('W/') for e in if_none_match.split(',')]
+    return '*' in etiquetas or etag in etiquetas
+
+
+@app.middleware("http")
+async def get_condicional(request: Request, call_next):
+    """Strong ETag / Last-Modified from the data version; 304 before any query or render"""
+    if request.method not in ('GET', 'HEAD') or not RUTAS_CONDICIONALES.match(request.url.path):
+        return await call_next(request)
+    
+    # Read before the handler runs: a concurrent write then only causes an extra 200 later
+    hoy = date.today()
+    etag = f'"{cache.version_datos()}-{hoy:%Y%m%d}"'
+    inicio_del_dia = datetime.combine(hoy, time()).astimezone(timezone.utc)
+    modificado = max(cache.ultima_escritura(), inicio_del_dia)
+    headers = {
+        'ETag': etag,
+        'Last-Modified': format_datetime(modificado, usegmt=True),
+        'Cache-Control': 'no-cache'
+    }
+    if _no_modificado(request, etag):
+        return Response(status_code=304, headers=headers)
+    
+    response = await call_next(request)
+    if response.status_code == 200:
+        response.headers.update(headers)
+    return response
+
+
+# Instrumentation (outermost middleware, so 304s are measured too)
+instrumentacion.instrumentar_engine(engine)
+instrumentacion.instrumentar_engine(async_engine.sync_engine)
+
+
+def _plantilla_ruta(request: Request) -> str:
+    """Route template of the request ("/postulaciones/{postulacion_id}"), to keep label cardinality low"""
+    ruta = request.scope.get('route')
+    if ruta is None:
+        # Answered before routing (e.g. 304): match it the way the router would
+        for candidata in app.router.routes:
+            if candidata.matches(request.scope)[0] == Match.FULL:
+                ruta = candidata
+                break
+    return getattr(ruta, 'path', 'unmatched')
+
+
+@app.middleware("http")
+async def medir_peticion(request: Request, call_next):
+    """Latency and query count per route"""
+    inicio = perf_counter()
+    consultas = instrumentacion.iniciar_conteo()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        ruta = _plantilla_ruta(request)
+        instrumentacion.DURACION_HTTP.observar(perf_counter() - inicio, ruta, request.method, str(status))
+        instrumentacion.CONSULTAS_HTTP.observar(consultas[0], ruta, request.method)
+
 
 @app.get("/", response_class=HTMLResponse)
-async def dashboard(request: Request, db: Session = Depends(get_db)):
+async def dashboard(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Main dashboard page"""
-    stats = get_dashboard_stats(db)
-    seguimientos = get_seguimientos_pendientes(db, dias=7)
+    version = cache.version_datos()
+    stats = await get_dashboard_stats(db)
+    seguimientos = await get_seguimientos_pendientes(db, dias=7)
     
     return templates.TemplateResponse("dashboard.html", {
         "request": request,
         "stats": stats,
         "seguimientos": seguimientos,
-        "estados": ESTADOS
+        "estados": ESTADOS,
+        "version_datos": version
     })
 
 
@@ -54,31 +177,49 @@ async def dashboard(request: Request, db: Session = Depends(get_db)):
 async def list_postulaciones(
     request: Request,
     page: int = Query(1, ge=1),
+    after: Optional[str] = None,
+    before: Optional[str] = None,
     estado: Optional[str] = None,
     empresa: Optional[str] = None,
     search: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """List all job applications with pagination and filters"""
     per_page = 20
-    skip = (page - 1) * per_page
+    filtros = {"estado": estado, "empresa": empresa, "search": search}
     
-    postulaciones = get_postulaciones(
-        db, skip=skip, limit=per_page,
-        estado=estado, empresa=empresa, search=search,
-        order_by='fecha_postulacion', order_desc=True
-    )
+    try:
+        if after or before or page == 1:
+            pagina = await get_postulaciones_pagina(
+                db, limit=per_page, after=after, before=before, columnas=COLUMNAS_LISTA, **filtros
+            )
+        else:
+            # Plain ?page=N links (bookmarks) fall back to OFFSET once, then continue by cursor
+            postulaciones = await get_postulaciones(
+                db, skip=(page - 1) * per_page, limit=per_page,
+                order_by='fecha_postulacion', order_desc=True, columnas=COLUMNAS_LISTA, **filtros
+            )
+            pagina = {
+                "items": postulaciones,
+                "next_cursor": encode_cursor(postulaciones[-1]) if len(postulaciones) == per_page else None,
+                "prev_cursor": encode_cursor(postulaciones[0]) if postulaciones else None
+            }
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Cursor inválido")
     
     # Get total count for pagination
-    total = len(get_postulaciones(db, estado=estado, empresa=empresa, search=search))
+    total = await count_postulaciones(db, **filtros)
     total_pages = (total + per_page - 1) // per_page
     
     return templates.TemplateResponse("postulaciones.html", {
         "request": request,
-        "postulaciones": postulaciones,
+        "postulaciones": pagina["items"],
         "page": page,
         "total_pages": total_pages,
         "total": total,
+        "next_cursor": pagina["next_cursor"],
+        "prev_cursor": pagina["prev_cursor"],
+        "filtros_qs": urlencode({k: v for k, v in filtros.items() if v}),
         "estado_filter": estado,
         "empresa_filter": empresa,
         "search": search,
@@ -112,14 +253,14 @@ async def create_postulacion_handler(
     salario_ofrecido: Optional[str] = Form(None),
     ubicacion: Optional[str] = Form(None),
     modalidad: Optional[str] = Form(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create new job application"""
     try:
         fecha_post = datetime.strptime(fecha_postulacion, '%Y-%m-%d').date()
         fecha_seg = datetime.strptime(fecha_seguimiento, '%Y-%m-%d').date() if fecha_seguimiento else None
         
-        create_postulacion(
+        await create_postulacion(
             db,
             empresa=empresa,
             puesto=puesto,
@@ -144,10 +285,10 @@ async def create_postulacion_handler(
 async def view_postulacion(
     request: Request,
     postulacion_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """View job application details"""
-    postulacion = get_postulacion(db, postulacion_id)
+    postulacion = await get_postulacion(db, postulacion_id)
     if not postulacion:
         raise HTTPException(status_code=404, detail="Postulación no encontrada")
     
@@ -162,10 +303,10 @@ async def view_postulacion(
 async def edit_postulacion_form(
     request: Request,
     postulacion_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Form to edit job application"""
-    postulacion = get_postulacion(db, postulacion_id)
+    postulacion = await get_postulacion(db, postulacion_id)
     if not postulacion:
         raise HTTPException(status_code=404, detail="Postulación no encontrada")
     
@@ -194,7 +335,7 @@ async def update_postulacion_handler(
     salario_ofrecido: Optional[str] = Form(None),
     ubicacion: Optional[str] = Form(None),
     modalidad: Optional[str] = Form(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update job application"""
     try:
@@ -202,7 +343,7 @@ async def update_postulacion_handler(
         fecha_seg = datetime.strptime(fecha_seguimiento, '%Y-%m-%d').date() if fecha_seguimiento else None
         fecha_resp = datetime.strptime(fecha_respuesta, '%Y-%m-%d').date() if fecha_respuesta else None
         
-        postulacion = update_postulacion(
+        postulacion = await update_postulacion(
             db,
             postulacion_id=postulacion_id,
             empresa=empresa,
@@ -232,10 +373,10 @@ async def update_postulacion_handler(
 @app.post("/postulaciones/{postulacion_id}/eliminar")
 async def delete_postulacion_handler(
     postulacion_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete job application"""
-    success = delete_postulacion(db, postulacion_id)
+    success = await delete_postulacion(db, postulacion_id)
     if not success:
         raise HTTPException(status_code=404, detail="Postulación no encontrada")
     return RedirectResponse(url="/postulaciones", status_code=303)
@@ -245,7 +386,7 @@ async def delete_postulacion_handler(
 async def cambiar_estado(
     postulacion_id: int,
     nuevo_estado: str = Form(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Quick status change"""
     kwargs = {"estado": nuevo_estado}
@@ -254,7 +395,7 @@ async def cambiar_estado(
     if nuevo_estado in ['Rechazado', 'Aceptado']:
         kwargs["fecha_respuesta"] = date.today()
     
-    postulacion = update_postulacion(db, postulacion_id, **kwargs)
+    postulacion = await update_postulacion(db, postulacion_id, **kwargs)
     if not postulacion:
         raise HTTPException(status_code=404, detail="Postulación no encontrada")
     
@@ -262,19 +403,188 @@ async def cambiar_estado(
 
 
 # API Endpoints
+def postulacion_to_dict(p) -> dict:
+    """JSON-friendly representation of a job application"""
+    return {
+        "id": p.id,
+        "empresa": p.empresa,
+        "puesto": p.puesto,
+        "url_oferta": p.url_oferta,
+        "fecha_postulacion": p.fecha_postulacion.isoformat() if p.fecha_postulacion else None,
+        "estado": p.estado,
+        "fecha_seguimiento": p.fecha_seguimiento.isoformat() if p.fecha_seguimiento else None,
+        "fecha_respuesta": p.fecha_respuesta.isoformat() if p.fecha_respuesta else None,
+        "tags": p.tags,
+        "ubicacion": p.ubicacion,
+        "modalidad": p.modalidad,
+        "salario_min": p.salario_min,
+        "salario_max": p.salario_max,
+        "salario_moneda": p.salario_moneda,
+        "salario_periodo": p.salario_periodo
+    }
+
+
+@app.get("/api/postulaciones")
+async def api_postulaciones(
+    limit: int = Query(50, ge=1, le=500),
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    estado: Optional[str] = None,
+    empresa: Optional[str] = None,
+    tags: Optional[str] = None,
+    tags_modo: str = Query('all', pattern='^(all|any)$'),
+    search: Optional[str] = None,
+    salario_desde: Optional[float] = Query(None, ge=0),
+    salario_hasta: Optional[float] = Query(None, ge=0),
+    salario_moneda: Optional[str] = Query(None, pattern='^[A-Za-z]{3}$'),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """API endpoint for keyset-paginated job applications"""
+    filtros = {
+        "estado": estado, "empresa": empresa, "tags": tags, "search": search, "tags_modo": tags_modo,
+        "salario_desde": salario_desde, "salario_hasta": salario_hasta, "salario_moneda": salario_moneda
+    }
+    try:
+        pagina = await get_postulaciones_pagina(
+            db, limit=limit, after=after, before=before, columnas=COLUMNAS_LISTA, **filtros
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    
+    return {
+        "total": await count_postulaciones(db, **filtros),
+        "next_cursor": pagina["next_cursor"],
+        "prev_cursor": pagina["prev_cursor"],
+        "items": [postulacion_to_dict(p) for p in pagina["items"]]
+    }
+
+
+@app.post("/api/postulaciones/batch")
+async def api_postulaciones_batch(lote: LoteOperaciones, db: AsyncSession = Depends(get_async_db)):
+    """API endpoint applying many create/update/delete/estado operations in one transaction"""
+    try:
+        resultados = await aplicar_operaciones(db, a_operaciones(lote), atomico=lote.atomico)
+    except IntegrityError as e:
+        await db.rollback()
+        return JSONResponse(status_code=409, content={"detail": f"Conflicto al guardar el lote: {e.orig}"})
+    
+    items = [{"indice": i, "op": op.op, **r} for i, (op, r) in enumerate(zip(lote.operaciones, resultados))]
+    errores = sum(1 for r in resultados if not r["ok"])
+    aplicadas = 0 if lote.atomico and errores else len(resultados) - errores
+    return JSONResponse(
+        status_code=409 if lote.atomico and errores else 200,
+        content={"total": len(items), "aplicadas": aplicadas, "errores": errores, "items": items}
+    )
+
+
+@app.get("/api/tags")
+async def api_tags(
+    estado: Optional[str] = None,
+    empresa: Optional[str] = None,
+    tags: Optional[str] = None,
+    tags_modo: str = Query('all', pattern='^(all|any)$'),
+    search: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """API endpoint for tag facets (counts) over the current filter set"""
+    return {
+        "items": await get_tag_facets(
+            db, estado=estado, empresa=empresa, tags=tags, search=search, tags_modo=tags_modo
+        )
+    }
+
+
+@app.get("/api/buscar")
+async def api_buscar(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """API endpoint for ranked full-text search with highlighted snippets"""
+    resultados = await buscar_postulaciones(db, q, limit=limit)
+    return {
+        "count": len(resultados),
+        "items": [
+            {**postulacion_to_dict(r["postulacion"]), "snippet": r["snippet"], "rank": r["rank"]}
+            for r in resultados
+        ]
+    }
+
+
 @app.get("/api/stats")
-async def api_stats(db: Session = Depends(get_db)):
+async def api_stats(db: AsyncSession = Depends(get_async_db)):
     """API endpoint for dashboard stats"""
-    return get_dashboard_stats(db)
+    return await get_dashboard_stats(db)
+
+
+@app.get("/api/eventos")
+async def api_eventos(request: Request):
+    """Server-Sent Events stream of dashboard stats deltas and changed applications (see eventos.py)"""
+    return StreamingResponse(
+        difusor.flujo(request.is_disconnected),
+        media_type="text/event-stream",
+        # No caching or proxy buffering: each event must reach the browser as it's sent
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.get("/api/eventos/estado")
+async def api_eventos_estado():
+    """API endpoint for the live update streams: open clients, events sent and computations made"""
+    return difusor.estado()
+
+
+@app.get("/api/metricas/series")
+async def api_metricas_series(
+    granularidad: str = Query('semana', pattern='^(dia|semana|mes)$'),
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """API endpoint for the metrics time series, bucketed by day/week/month"""
+    try:
+        return await get_metricas_series(db, granularidad=granularidad, desde=desde, hasta=hasta)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/api/metricas/funnel")
+async def api_metricas_funnel(db: AsyncSession = Depends(get_async_db)):
+    """API endpoint for funnel conversion and time-in-stage latencies"""
+    return await get_funnel_metricas(db)
+
+
+@app.get("/api/metricas/salarios")
+async def api_metricas_salarios(db: AsyncSession = Depends(get_async_db)):
+    """API endpoint for median offered salary by modalidad and ubicacion"""
+    return await get_salarios_metricas(db)
+
+
+@app.get("/api/cache")
+async def api_cache():
+    """API endpoint for read-cache hit/miss counters (monitoring)"""
+    return cache.estadisticas()
+
+
+@app.get("/api/planificador")
+async def api_planificador():
+    """API endpoint for the background scheduler status and last run"""
+    return planificador.estado()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus text exposition of the route, query and template metrics"""
+    return PlainTextResponse(instrumentacion.exponer(), media_type="text/plain; version=0.0.4")
 
 
 @app.get("/api/seguimientos")
 async def api_seguimientos(
     dias: int = Query(7, ge=1),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """API endpoint for pending follow-ups"""
-    seguimientos = get_seguimientos_pendientes(db, dias)
+    seguimientos = await get_seguimientos_pendientes(db, dias)
     return {
         "count": len(seguimientos),
         "items": [
@@ -292,77 +602,127 @@ async def api_seguimientos(
 
 # Export/Import
 @app.get("/exportar/csv")
-async def export_csv(db: Session = Depends(get_db)):
-    """Export all job applications to CSV"""
-    postulaciones = get_postulaciones_para_exportar(db)
-    
-    # Create CSV
-    output = io.StringIO()
-    writer = csv.writer(output)
-    
-    # Header
-    writer.writerow([
-        'id', 'empresa', 'puesto', 'url_oferta', 'fecha_postulacion',
-        'estado', 'notas', 'fecha_seguimiento', 'fecha_respuesta', 'tags',
-        'contacto_nombre', 'contacto_email', 'salario_ofrecido',
-        'ubicacion', 'modalidad'
-    ])
+async def export_csv(
+    estado: Optional[str] = None,
+    empresa: Optional[str] = None,
+    tags: Optional[str] = None,
+    tags_modo: str = Query('all', pattern='^(all|any)$'),
+    search: Optional[str] = None,
+    gzip: bool = False
+):
+    """Export job applications to CSV, streamed in chunks"""
+    filtros = {"estado": estado, "empresa": empresa, "tags": tags, "search": search, "tags_modo": tags_modo}
     
-    # Data
-    for p in postulaciones:
-        writer.writerow([
-            p.id, p.empresa, p.puesto, p.url_oferta,
-            p.fecha_postulacion.isoformat() if p.fecha_postulacion else '',
-            p.estado, p.notas,
-            p.fecha_seguimiento.isoformat() if p.fecha_seguimiento else '',
-            p.fecha_respuesta.isoformat() if p.fecha_respuesta else '',
-            p.tags, p.contacto_nombre, p.contacto_email,
-            p.salario_ofrecido, p.ubicacion, p.modalidad
-        ])
+    async def filas_csv():
+        # The session lives in the generator: the response outlives request dependencies
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(COLUMNAS_EXPORTAR)
+        async with AsyncSessionLocal() as db:
+            async for lote in iter_postulaciones_para_exportar(db, **filtros):
+                writer.writerows(
+                    [v.isoformat() if isinstance(v, date) else v for v in fila]
+                    for fila in lote
+                )
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
+        if output.tell():
+            yield output.getvalue()
     
-    output.seek(0)
+    async def comprimir(chunks):
+        compresor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: gzip container
+        async for chunk in chunks:
+            yield compresor.compress(chunk.encode('utf-8'))
+        yield compresor.flush()
     
-    return FileResponse(
-        path=None,
+    filename = f"postulaciones_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    if gzip:
+        return StreamingResponse(
+            comprimir(filas_csv()),
+            media_type="application/gzip",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.gz"'}
+        )
+    return StreamingResponse(
+        filas_csv(),
         media_type="text/csv",
-        filename=f"postulaciones_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
     )
 
 
 @app.post("/importar/csv")
 async def import_csv(
-    file_content: str = Form(...),
-    db: Session = Depends(get_db)
+    file: Optional[UploadFile] = File(None),
+    file_content: Optional[str] = Form(None),
+    batch_size: int = Form(BATCH_SIZE, ge=1, le=20000),
+    modo: str = Form('omitir', pattern='^(omitir|actualizar)$'),
+    dry_run: bool = Form(False)
 ):
-    """Import job applications from CSV"""
+    """Import job applications from an uploaded CSV file (or legacy `file_content` text)
+    
+    The file is read and inserted in batches from a worker thread, so large imports
+    neither load the whole file in memory nor block the event loop. Applications
+    already present are skipped (modo=omitir) or updated (modo=actualizar);
+    dry_run reports what would happen without writing.
+    """
+    if file is not None:
+        archivo = io.TextIOWrapper(file.file, encoding='utf-8-sig', newline='')
+    elif file_content is not None:
+        archivo = io.StringIO(file_content)
+    else:
+        return JSONResponse(
+            {"success": False, "error": "Falta el archivo CSV"},
+            status_code=400
+        )
+    
+    def importar():
+        with SessionLocal() as db:
+            return importar_csv(db, archivo, batch_size=batch_size, modo=modo, dry_run=dry_run)
+    
     try:
-        reader = csv.DictReader(io.StringIO(file_content))
-        postulaciones = list(reader)
-        count = bulk_import(db, postulaciones)
-        return JSONResponse({
-            "success": True,
-            "imported": count,
-            "message": f"Se importaron {count} postulaciones exitosamente"
-        })
-    except Exception as e:
+        reporte = await run_in_threadpool(importar)
+    except (csv.Error, UnicodeDecodeError) as e:
         return JSONResponse(
-            {"success": False, "error": str(e)},
+            {"success": False, "error": f"CSV inválido: {e}"},
             status_code=400
         )
+    
+    if dry_run:
+        mensaje = (
+            f"Simulación: se importarían {reporte.insertadas} postulaciones, "
+            f"se actualizarían {reporte.actualizadas} y se omitirían {reporte.omitidas}"
+        )
+    else:
+        mensaje = f"Se importaron {reporte.insertadas} postulaciones exitosamente"
+        if reporte.actualizadas:
+            mensaje += f", {reporte.actualizadas} actualizadas"
+        if reporte.omitidas:
+            mensaje += f", {reporte.omitidas} ya existentes omitidas"
+    if reporte.rechazadas:
+        mensaje += f" ({reporte.rechazadas} filas rechazadas)"
+    return JSONResponse({
+        "success": reporte.rechazadas < reporte.filas or reporte.filas == 0,
+        "imported": reporte.insertadas,
+        "message": mensaje,
+        **reporte.to_dict()
+    })
 
 
 @app.get("/metricas", response_class=HTMLResponse)
-async def metricas_detalladas(request: Request, db: Session = Depends(get_db)):
+async def metricas_detalladas(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Detailed metrics page"""
-    stats = get_dashboard_stats(db)
-    
-    # Get applications by week for chart
-    db_postulaciones = get_postulaciones(db, limit=1000)
+    version = cache.version_datos()
+    stats = await get_dashboard_stats(db)
+    funnel = await get_funnel_metricas(db)
+    salarios = await get_salarios_metricas(db)
     
     return templates.TemplateResponse("metricas.html", {
         "request": request,
         "stats": stats,
-        "estados": ESTADOS
+        "funnel": funnel,
+        "salarios": salarios,
+        "estados": ESTADOS,
+        "version_datos": version
     })
 
 
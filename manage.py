@@ -0,0 +1,89 @@
+"""
+Maintenance commands for Job Application Tracker
+
+Usage:
+    python manage.py verify-stats     # report drift between stats tables and postulaciones
+    python manage.py rebuild-stats    # recompute the materialized stats from scratch
+    python manage.py migrate-tags     # rebuild tags/postulacion_tags from Postulacion.tags
+    python manage.py seed-historial   # reconstruct estado_historial from the current rows
+    python manage.py planificador     # run one scheduler pass (aging, follow-ups, reminders)
+    python manage.py backfill-salarios  # parse salario_ofrecido of every row into salario_min/max/moneda/periodo
+"""
+import argparse
+import os
+import sys
+
+from servidor import ARCHIVO_VERSION
+
+# Set before importing database: the write commands bump the data version
+# shared with running servidor.py workers, so their caches and ETags drop
+# (a single-process main.py server doesn't read this file)
+os.environ.setdefault('CACHE_VERSION_ARCHIVO', ARCHIVO_VERSION)
+
+from database import SessionLocal, engine, init_db, rebuild_stats, verify_stats, migrate_tags, seed_historial, rellenar_salarios
+
+
+def cmd_verify_stats(args) -> int:
+    with SessionLocal() as db:
+        drift = verify_stats(db)
+    if not drift:
+        print("Stats OK: no drift")
+        return 0
+    print(f"Stats drift ({len(drift)} buckets):")
+    for linea in drift:
+        print(f"  {linea}")
+    return 1
+
+
+def cmd_rebuild_stats(args) -> int:
+    with SessionLocal() as db:
+        drift = verify_stats(db)
+        buckets = rebuild_stats(db)
+    print(f"Rebuilt stats: {buckets} daily buckets ({len(drift)} drifted before rebuild)")
+    return 0
+
+
+def cmd_migrate_tags(args) -> int:
+    with SessionLocal() as db:
+        migradas = migrate_tags(db)
+    print(f"Migrated tags of {migradas} postulaciones")
+    return 0
+
+
+def cmd_seed_historial(args) -> int:
+    with SessionLocal() as db:
+        n = seed_historial(db)
+    print(f"Reconstructed estado history of {n} postulaciones")
+    return 0
+
+
+def cmd_planificador(args) -> int:
+    from planificador import planificador
+    ciclo = planificador.ejecutar_ciclo()
+    print(f"Moved {ciclo['envejecidas']} postulaciones to 'Sin respuesta', "
+          f"{ciclo['vencidos']} follow-ups due, {ciclo['recordatorios']} new reminders in {planificador.archivo}")
+    return 0
+
+
+def cmd_backfill_salarios(args) -> int:
+    n = rellenar_salarios(engine)
+    print(f"Parsed the salary of {n} postulaciones")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Job Application Tracker maintenance")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('verify-stats', help="Compare materialized stats with a full recomputation").set_defaults(func=cmd_verify_stats)
+    sub.add_parser('rebuild-stats', help="Recompute materialized stats from scratch").set_defaults(func=cmd_rebuild_stats)
+    sub.add_parser('migrate-tags', help="Rebuild normalized tags from the CSV tags column").set_defaults(func=cmd_migrate_tags)
+    sub.add_parser('seed-historial', help="Replace estado_historial with one reconstructed from the current rows").set_defaults(func=cmd_seed_historial)
+    sub.add_parser('planificador', help="Run one background scheduler pass now").set_defaults(func=cmd_planificador)
+    sub.add_parser('backfill-salarios', help="Re-parse salario_ofrecido into the numeric salary columns").set_defaults(func=cmd_backfill_salarios)
+    args = parser.parse_args(argv)
+    init_db()
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
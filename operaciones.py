@@ -0,0 +1,119 @@
+"""
+Batch JSON operations for Job Application Tracker
+
+Pydantic models for POST /api/postulaciones/batch: a list of create, update,
+delete and estado-change operations told apart by their `op` field. They are
+validated up front and translated into the plain dicts that
+database.aplicar_operaciones applies in a single transaction.
+"""
+from datetime import date
+from typing import Annotated, Any, Dict, List, Literal, Optional, Union
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+from database import ESTADOS
+
+MAX_OPERACIONES = 5000
+
+# Estados that close the process; a quick estado change stamps fecha_respuesta
+ESTADOS_CON_RESPUESTA = ('Rechazado', 'Aceptado')
+
+
+def _validar_estado(estado: Optional[str]) -> Optional[str]:
+    if estado is not None and estado not in ESTADOS:
+        raise ValueError(f"estado inválido: {estado!r}")
+    return estado
+
+
+class CamposPostulacion(BaseModel):
+    """Editable Postulacion fields; unknown keys are rejected"""
+    model_config = ConfigDict(extra='forbid', str_strip_whitespace=True)
+
+    empresa: Optional[str] = Field(None, min_length=1, max_length=200)
+    puesto: Optional[str] = Field(None, min_length=1, max_length=200)
+    url_oferta: Optional[str] = Field(None, max_length=500)
+    fecha_postulacion: Optional[date] = None
+    estado: Optional[str] = None
+    notas: Optional[str] = None
+    fecha_seguimiento: Optional[date] = None
+    fecha_respuesta: Optional[date] = None
+    tags: Optional[str] = Field(None, max_length=300)
+    contacto_nombre: Optional[str] = Field(None, max_length=150)
+    contacto_email: Optional[str] = Field(None, max_length=150)
+    salario_ofrecido: Optional[str] = Field(None, max_length=50)
+    ubicacion: Optional[str] = Field(None, max_length=150)
+    modalidad: Optional[str] = Field(None, max_length=50)
+
+    _estado_valido = field_validator('estado')(_validar_estado)
+
+    @model_validator(mode='after')
+    def _obligatorios_no_nulos(self):
+        # Columns that are NOT NULL may be omitted but not cleared
+        for campo in ('empresa', 'puesto', 'fecha_postulacion', 'estado'):
+            if campo in self.model_fields_set and getattr(self, campo) is None:
+                raise ValueError(f"{campo} no puede ser null")
+        return self
+
+    def campos(self) -> Dict[str, Any]:
+        """Only the fields present in the request"""
+        return self.model_dump(include=set(CamposPostulacion.model_fields) & self.model_fields_set)
+
+
+class OperacionCrear(CamposPostulacion):
+    op: Literal['crear']
+    empresa: str = Field(..., min_length=1, max_length=200)
+    puesto: str = Field(..., min_length=1, max_length=200)
+
+
+class OperacionActualizar(CamposPostulacion):
+    op: Literal['actualizar']
+    id: int
+
+
+class OperacionEliminar(BaseModel):
+    model_config = ConfigDict(extra='forbid')
+    op: Literal['eliminar']
+    id: int
+
+
+class OperacionEstado(BaseModel):
+    model_config = ConfigDict(extra='forbid')
+    op: Literal['estado']
+    id: int
+    estado: str
+    fecha_respuesta: Optional[date] = None
+
+    _estado_valido = field_validator('estado')(_validar_estado)
+
+
+Operacion = Annotated[
+    Union[OperacionCrear, OperacionActualizar, OperacionEliminar, OperacionEstado],
+    Field(discriminator='op')
+]
+
+
+class LoteOperaciones(BaseModel):
+    """Request body: operations applied in order; atomico=True rolls back all of them if one fails"""
+    operaciones: List[Operacion] = Field(..., min_length=1, max_length=MAX_OPERACIONES)
+    atomico: bool = False
+
+
+def a_operaciones(lote: LoteOperaciones) -> List[Dict[str, Any]]:
+    """Translate validated operations into database.aplicar_operaciones dicts"""
+    resultado = []
+    for op in lote.operaciones:
+        if isinstance(op, OperacionCrear):
+            resultado.append({'op': 'crear', 'campos': op.campos()})
+        elif isinstance(op, OperacionActualizar):
+            resultado.append({'op': 'actualizar', 'id': op.id, 'campos': op.campos()})
+        elif isinstance(op, OperacionEliminar):
+            resultado.append({'op': 'eliminar', 'id': op.id})
+        else:
+            # Same rule as the /cambiar-estado form
+            campos = {'estado': op.estado}
+            if op.fecha_respuesta is not None:
+                campos['fecha_respuesta'] = op.fecha_respuesta
+            elif op.estado in ESTADOS_CON_RESPUESTA:
+                campos['fecha_respuesta'] = date.today()
+            resultado.append({'op': 'actualizar', 'id': op.id, 'campos': campos})
+    return resultado
@@ -0,0 +1,199 @@
+"""
+Background scheduler for Job Application Tracker
+
+An asyncio task started with the FastAPI app that, every
+PLANIFICADOR_INTERVALO seconds and off the request path:
+
+- moves applications still 'Postulado' after DIAS_SIN_RESPUESTA days to
+  'Sin respuesta' in one bulk UPDATE (database.envejecer_postulaciones)
+- precomputes the dashboard's follow-up list and stats into the read cache
+- appends a reminder for every follow-up that is due to a JSON Lines file
+  (RECORDATORIOS_ARCHIVO), once per application and follow-up date
+
+With several worker processes only the one holding the data/.planificador.lock
+file lock runs the passes; the others keep trying, so one takes over if it exits.
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+from contextlib import ExitStack
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+from database import SessionLocal, bloqueo_archivo, envejecer_postulaciones, get_dashboard_stats, get_seguimientos_pendientes
+
+# Seconds between runs; 0 disables the scheduler
+PLANIFICADOR_INTERVALO = float(os.getenv('PLANIFICADOR_INTERVALO', '60'))
+RECORDATORIOS_ARCHIVO = os.getenv('RECORDATORIOS_ARCHIVO', 'data/recordatorios.jsonl')
+# Size at which the reminders file is rotated to <archivo>.1, replacing the previous one
+RECORDATORIOS_MAX_BYTES = int(os.getenv('RECORDATORIOS_MAX_BYTES', str(1024 * 1024)))
+ARCHIVO_LIDER = os.path.join('data', '.planificador.lock')
+
+# Same window as the dashboard's "Seguimientos pendientes" panel
+DIAS_SEGUIMIENTO = 7
+
+
+class Planificador:
+    """Periodic maintenance task; ejecutar_ciclo can also be called directly (manage.py)"""
+
+    def __init__(
+        self,
+        intervalo: float = PLANIFICADOR_INTERVALO,
+        archivo: str = RECORDATORIOS_ARCHIVO,
+        max_bytes: int = RECORDATORIOS_MAX_BYTES
+    ):
+        self.intervalo = intervalo
+        self.archivo = archivo
+        self.max_bytes = max_bytes
+        self.ciclos = 0
+        self.errores = 0
+        self.ultimo_ciclo: Optional[Dict[str, Any]] = None
+        self.ultimo_error: Optional[str] = None
+        self._tarea: Optional[asyncio.Task] = None
+        self._notificados: Optional[set] = None
+        self._lock = threading.Lock()
+        self._bloqueo_lider: Optional[ExitStack] = None
+
+    def _cargar_notificados(self) -> set:
+        """(id, fecha_seguimiento) pairs already written, so restarts don't repeat reminders
+
+        Read once per process, from the current and the rotated file (both
+        bounded by max_bytes).
+        """
+        notificados = set()
+        for ruta in (self.archivo + '.1', self.archivo):
+            if not os.path.exists(ruta):
+                continue
+            with open(ruta, encoding='utf-8') as f:
+                for linea in f:
+                    try:
+                        evento = json.loads(linea)
+                    except ValueError:
+                        continue
+                    if evento.get('tipo') == 'seguimiento':
+                        notificados.add((evento['id'], evento['fecha_seguimiento']))
+        return notificados
+
+    def _rotar(self):
+        """Move a full reminders file aside so it doesn't grow without bound"""
+        try:
+            if os.path.getsize(self.archivo) >= self.max_bytes:
+                os.replace(self.archivo, self.archivo + '.1')
+        except FileNotFoundError:
+            pass
+
+    def _escribir_eventos(self, seguimientos: List[Any], envejecidas: int) -> int:
+        """Append the new reminder events; returns how many follow-up reminders were written
+
+        seguimientos are all the follow-ups due now. Keys of follow-ups no
+        longer due (answered, rescheduled, deleted) are dropped, so the set
+        stays the size of the due list.
+        """
+        if self._notificados is None:
+            self._notificados = self._cargar_notificados()
+        creado = datetime.now().isoformat(timespec='seconds')
+        vigentes = set()
+        eventos = []
+        for s in seguimientos:
+            clave = (s.id, s.fecha_seguimiento.isoformat())
+            vigentes.add(clave)
+            if clave in self._notificados:
+                continue
+            eventos.append({
+                'tipo': 'seguimiento', 'id': s.id, 'empresa': s.empresa, 'puesto': s.puesto,
+                'estado': s.estado, 'fecha_seguimiento': clave[1], 'creado': creado
+            })
+        self._notificados = vigentes
+        n_seguimientos = len(eventos)
+        if envejecidas:
+            eventos.append({'tipo': 'sin_respuesta', 'cantidad': envejecidas, 'creado': creado})
+        if eventos:
+            os.makedirs(os.path.dirname(self.archivo) or '.', exist_ok=True)
+            self._rotar()
+            with open(self.archivo, 'a', encoding='utf-8') as f:
+                f.writelines(json.dumps(e, ensure_ascii=False) + '\n' for e in eventos)
+        return n_seguimientos
+
+    def ejecutar_ciclo(self) -> Dict[str, Any]:
+        """Run one maintenance pass synchronously"""
+        with self._lock:
+            inicio = time.perf_counter()
+            hoy = date.today()
+            with SessionLocal() as db:
+                envejecidas = envejecer_postulaciones(db)
+                # Cached calls: the next dashboard request finds both ready
+                seguimientos = get_seguimientos_pendientes(db, dias=DIAS_SEGUIMIENTO)
+                get_dashboard_stats(db)
+            vencidos = [s for s in seguimientos if s.fecha_seguimiento <= hoy]
+            recordatorios = self._escribir_eventos(vencidos, envejecidas)
+            self.ciclos += 1
+            self.ultimo_ciclo = {
+                'fecha': datetime.now().isoformat(timespec='seconds'),
+                'duracion_ms': round((time.perf_counter() - inicio) * 1000, 1),
+                'envejecidas': envejecidas,
+                'seguimientos': len(seguimientos),
+                'vencidos': len(vencidos),
+                'recordatorios': recordatorios
+            }
+            return self.ultimo_ciclo
+
+    def _es_lider(self) -> bool:
+        """Hold (or try to take) the cross-process lock that elects the running worker"""
+        if self._bloqueo_lider is not None:
+            return True
+        pila = ExitStack()
+        if not pila.enter_context(bloqueo_archivo(ARCHIVO_LIDER, bloqueante=False)):
+            pila.close()
+            return False
+        self._bloqueo_lider = pila
+        return True
+
+    async def _bucle(self):
+        while True:
+            if not self._es_lider():
+                await asyncio.sleep(self.intervalo)
+                continue
+            try:
+                await asyncio.to_thread(self.ejecutar_ciclo)
+            except Exception as e:
+                # Keep running: a locked database or a full disk shouldn't stop future passes
+                self.errores += 1
+                self.ultimo_error = f'{type(e).__name__}: {e}'
+                print(f"Planificador: error en el ciclo: {self.ultimo_error}")
+            await asyncio.sleep(self.intervalo)
+
+    def iniciar(self):
+        """Start the periodic task on the running event loop (no-op if disabled or running)"""
+        if self.intervalo > 0 and self._tarea is None:
+            self._tarea = asyncio.get_running_loop().create_task(self._bucle())
+
+    async def detener(self):
+        if self._tarea is None:
+            return
+        self._tarea.cancel()
+        try:
+            await self._tarea
+        except asyncio.CancelledError:
+            pass
+        self._tarea = None
+        if self._bloqueo_lider is not None:
+            self._bloqueo_lider.close()  # Releases the lock for another worker
+            self._bloqueo_lider = None
+
+    def estado(self) -> Dict[str, Any]:
+        return {
+            'activo': self._tarea is not None,
+            'lider': self._bloqueo_lider is not None,
+            'pid': os.getpid(),
+            'intervalo': self.intervalo,
+            'archivo': self.archivo,
+            'ciclos': self.ciclos,
+            'errores': self.errores,
+            'ultimo_error': self.ultimo_error,
+            'ultimo_ciclo': self.ultimo_ciclo
+        }
+
+
+planificador = Planificador()
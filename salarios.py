@@ -0,0 +1,130 @@
+"""
+Salary parsing for Job Application Tracker
+
+salario_ofrecido is free text ("USD 3000-4000", "$1.500.000 mensual",
+"80k USD/año", "A convenir"). parsear_salario extracts the amount range,
+currency and pay period, which database.py stores in the salario_min,
+salario_max, salario_moneda and salario_periodo columns on every write so
+offers can be filtered and aggregated in SQL.
+"""
+import re
+from typing import Any, Dict, List, NamedTuple, Optional
+
+PERIODOS = ('hora', 'dia', 'mes', 'año')
+# Postulacion columns filled from salario_ofrecido
+COLUMNAS_SALARIO = ('salario_min', 'salario_max', 'salario_moneda', 'salario_periodo')
+
+# (pattern, ISO code), tried in order; a bare "$" or "pesos" leaves the currency unknown
+_MONEDAS = [
+    (r'US\$|U\$[SD]|(?<![a-z])USD(?![a-z])|d[oó]lar(es)?\b', 'USD'),
+    (r'€|(?<![a-z])EUR(?![a-z])|\beuros?\b', 'EUR'),
+    (r'(?<![A-Za-z])AR\$', 'ARS'),
+    (r'(?<![A-Za-z])R\$|(?<![a-z])BRL(?![a-z])|\breales\b', 'BRL'),
+    (r'£|(?<![a-z])GBP(?![a-z])', 'GBP'),
+    (r'(?<![a-z])(ARS|CLP|MXN|COP|PEN|UYU|PYG|BOB|CAD)(?![a-z])', None),  # The code itself
+]
+
+_PERIODOS = [
+    (r'/\s*h(ora|r)?\b|\bpor hora\b|\bhourly\b|\bla hora\b', 'hora'),
+    (r'/\s*d[ií]a\b|\bpor d[ií]a\b|\bdiarios?\b|\bdaily\b', 'dia'),
+    (r'/\s*a[ñn]o\b|\banual(es)?\b|\bal a[ñn]o\b|\bpor a[ñn]o\b|\bannual\b|\byearly\b|/\s*year\b', 'año'),
+    (r'/\s*mes\b|\bmensual(es)?\b|\bal mes\b|\bpor mes\b|\bmonthly\b|/\s*month\b', 'mes'),
+]
+
+_MULTIPLICADORES = {'k': 1_000, 'mil': 1_000, 'm': 1_000_000, 'mm': 1_000_000, 'millon': 1_000_000, 'millones': 1_000_000}
+
+# An amount with its separators, optionally followed by a multiplier that isn't
+# the start of a word ("1500 mensual" has no "m" multiplier)
+_CANTIDAD = re.compile(
+    r'(\d[\d.,]*)(?:\s*(k|mil|mm|m|millon|millones)(?![a-záéíóúñ]))?',
+    re.IGNORECASE
+)
+# Units that make a number something other than pay ("40 horas", "3 años")
+_NO_MONTO = re.compile(r'\s*(horas?\b|hs\b|d[ií]as\b|a[ñn]os\b|semanas\b|meses\b|%)', re.IGNORECASE)
+# What may separate the two ends of a range
+_RANGO = re.compile(r'^\s*(-|–|—|a|al|to|y|hasta)\s*$', re.IGNORECASE)
+
+
+class Salario(NamedTuple):
+    minimo: float
+    maximo: float
+    moneda: Optional[str]
+    periodo: Optional[str]
+
+
+def _numero(texto: str, con_multiplicador: bool) -> Optional[float]:
+    """Parse "1.500.000", "1,500.50", "2,5" or "3.5" with either separator convention"""
+    texto = texto.rstrip('.,')
+    if '.' in texto and ',' in texto:
+        # The last separator is the decimal one
+        decimal = '.' if texto.rfind('.') > texto.rfind(',') else ','
+        miles = ',' if decimal == '.' else '.'
+        texto = texto.replace(miles, '').replace(decimal, '.')
+    else:
+        separador = '.' if '.' in texto else ',' if ',' in texto else None
+        if separador:
+            partes = texto.split(separador)
+            # "1.500" and "1.500.000" group thousands; "2,5" and "1.5k" are decimals
+            if len(partes) > 2 or (len(partes[1]) == 3 and not con_multiplicador):
+                texto = ''.join(partes)
+            else:
+                texto = '.'.join(partes)
+    try:
+        return float(texto)
+    except ValueError:
+        return None
+
+
+def _cantidades(texto: str) -> List[tuple]:
+    """(value, multiplier or None, start, end) of every amount in texto"""
+    cantidades = []
+    for m in _CANTIDAD.finditer(texto):
+        if _NO_MONTO.match(texto, m.end()):
+            continue
+        sufijo = (m.group(2) or '').lower()
+        valor = _numero(m.group(1), bool(sufijo))
+        if valor is not None:
+            cantidades.append((valor, _MULTIPLICADORES.get(sufijo), m.start(), m.end()))
+    return cantidades
+
+
+def parsear_salario(texto: Optional[str]) -> Optional[Salario]:
+    """Amount range, currency and period of a salary text, or None if it has no amount
+
+    A single amount gives minimo == maximo. A multiplier on the upper end also
+    applies to a bare lower end ("80-100k"). Currency and period are None when
+    the text doesn't say.
+    """
+    if not texto or not texto.strip():
+        return None
+    cantidades = _cantidades(texto)
+    if not cantidades:
+        return None
+
+    valor, multiplicador, _, fin = cantidades[0]
+    minimo = maximo = valor * (multiplicador or 1)
+    if len(cantidades) > 1 and _RANGO.match(texto[fin:cantidades[1][2]]):
+        valor2, multiplicador2, _, _ = cantidades[1]
+        maximo = valor2 * (multiplicador2 or 1)
+        if multiplicador is None and multiplicador2:
+            minimo = valor * multiplicador2
+        minimo, maximo = min(minimo, maximo), max(minimo, maximo)
+
+    moneda = None
+    for patron, codigo in _MONEDAS:
+        m = re.search(patron, texto, re.IGNORECASE)
+        if m:
+            moneda = codigo or m.group(1).upper()
+            break
+    periodo = None
+    for patron, nombre in _PERIODOS:
+        if re.search(patron, texto, re.IGNORECASE):
+            periodo = nombre
+            break
+    return Salario(minimo, maximo, moneda, periodo)
+
+
+def columnas_salario(texto: Optional[str]) -> Dict[str, Any]:
+    """Values of the parsed salary columns of Postulacion for a salario_ofrecido text"""
+    salario = parsear_salario(texto)
+    return dict(zip(COLUMNAS_SALARIO, salario or (None, None, None, None)))
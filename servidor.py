@@ -0,0 +1,41 @@
+"""
+Production launcher for Job Application Tracker
+
+Creates/migrates the schema once, then starts N uvicorn worker processes
+sharing the port. Workers skip schema work (ESQUEMA_LISTO) and share the data
+version through a memory-mapped file (CACHE_VERSION_ARCHIVO), so a write
+served by one worker invalidates the caches and ETags of all of them. The
+background scheduler runs in a single worker, elected with a file lock.
+
+Usage: python servidor.py [--workers N] [--host 0.0.0.0] [--port 8000]
+"""
+import argparse
+import os
+import sys
+
+ARCHIVO_VERSION = os.path.join('data', 'version_datos.bin')
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run Job Application Tracker with several worker processes")
+    parser.add_argument('--workers', type=int, default=int(os.getenv('WEB_CONCURRENCY', os.cpu_count() or 1)))
+    parser.add_argument('--host', default=os.getenv('HOST', '0.0.0.0'))
+    parser.add_argument('--port', type=int, default=int(os.getenv('PORT', '8000')))
+    parser.add_argument('--log-level', default='info')
+    args = parser.parse_args(argv)
+
+    # Set before importing database: workers inherit the environment
+    os.environ.setdefault('CACHE_VERSION_ARCHIVO', ARCHIVO_VERSION)
+    import database
+    database.init_db()
+    os.environ['ESQUEMA_LISTO'] = '1'
+    # Connections opened by the parent must not be shared with the workers
+    database.engine.dispose()
+
+    import uvicorn
+    uvicorn.run('main:app', host=args.host, port=args.port, workers=args.workers, log_level=args.log_level)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
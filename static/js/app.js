@@ -66,6 +66,12 @@ document.addEventListener('DOMContentLoaded', function() {
     
     // Date input helpers
     initializeDateHelpers();
+    
+    // Metrics trend chart
+    initializeSeriesChart();
+    
+    // Live dashboard and list updates
+    initializeLiveUpdates();
 });
 
 // Update status badges with appropriate colors
@@ -129,6 +135,242 @@ function initializeDateHelpers() {
     });
 }
 
+// Metrics trend chart: bars per period from /api/metricas/series
+function initializeSeriesChart() {
+    const chart = document.getElementById('seriesChart');
+    if (!chart) return;
+    
+    const series = ['postulaciones', 'respuestas', 'entrevistas', 'ofertas'];
+    const buttons = document.querySelectorAll('[data-granularidad]');
+    
+    function render(data) {
+        chart.innerHTML = '';
+        const max = Math.max(1, ...data.series.map(p => Math.max(...series.map(s => p[s]))));
+        const labelEvery = Math.max(1, Math.ceil(data.series.length / 12));
+        
+        data.series.forEach((p, i) => {
+            const period = document.createElement('div');
+            period.className = 'series-period';
+            period.dataset.tooltip = p.periodo + ': ' + series.map(s => `${s} ${p[s]}`).join(', ');
+            
+            series.forEach(s => {
+                const bar = document.createElement('div');
+                bar.className = `serie-bar serie-${s}`;
+                bar.style.height = (p[s] / max * 100) + '%';
+                period.appendChild(bar);
+            });
+            
+            if (i % labelEvery === 0) {
+                const label = document.createElement('span');
+                label.className = 'series-label';
+                label.textContent = p.periodo;
+                period.appendChild(label);
+            }
+            chart.appendChild(period);
+        });
+        initializeTooltips();
+    }
+    
+    function load(granularidad) {
+        buttons.forEach(b => {
+            b.classList.toggle('btn-primary', b.dataset.granularidad === granularidad);
+            b.classList.toggle('btn-secondary', b.dataset.granularidad !== granularidad);
+        });
+        const desde = new Date();
+        desde.setDate(desde.getDate() - (granularidad === 'dia' ? 90 : 365));
+        fetch(`/api/metricas/series?granularidad=${granularidad}&desde=${desde.toISOString().split('T')[0]}`)
+            .then(r => r.json())
+            .then(render)
+            .catch(() => { chart.textContent = 'No se pudo cargar la tendencia'; });
+    }
+    
+    buttons.forEach(b => b.addEventListener('click', () => load(b.dataset.granularidad)));
+    load('semana');
+}
+
+// "2024-03-05" -> "05/03/2024", like the templates' strftime('%d/%m/%Y')
+function formatDate(iso) {
+    return iso ? iso.split('-').reverse().join('/') : '';
+}
+
+// Local date as YYYY-MM-DD, comparable with the ISO dates of the API
+function isoDate(date) {
+    const pad = n => String(n).padStart(2, '0');
+    return `${date.getFullYear()}-${pad(date.getMonth() + 1)}-${pad(date.getDate())}`;
+}
+
+function setStatusBadge(badge, estado) {
+    if (!badge) return;
+    badge.textContent = estado;
+    badge.className = badge.className.replace(/\bstatus-(?!badge\b)\S+/g, '').trim() +
+        ` status-${estado.toLowerCase().replace(/ /g, '-')}`;
+}
+
+// Live updates: apply the stats deltas and changed rows pushed by /api/eventos
+// in place, instead of reloading the dashboard or the list
+function initializeLiveUpdates() {
+    const tbody = document.querySelector('tbody[data-postulaciones]');
+    const followups = document.querySelector('[data-seguimientos-dias]');
+    const hasStats = document.querySelector('[data-stat], [data-estado-count]');
+    if (!(tbody || followups || hasStats) || !window.EventSource) return;
+    
+    let version = null;
+    const source = new EventSource('/api/eventos');
+    
+    source.addEventListener('stats', e => {
+        const data = JSON.parse(e.data);
+        // Reconnected after missing events: the follow-ups may be stale too
+        if (version !== null && data.version !== version) reloadFollowups();
+        version = data.version;
+        applyStats(data.stats);
+    });
+    
+    source.addEventListener('cambios', e => {
+        const data = JSON.parse(e.data);
+        if (data.desde === null || data.desde === version) {
+            applyStats(data.stats);
+        } else {
+            // The delta is relative to stats we never got
+            fetch('/api/stats').then(r => r.json()).then(applyStats).catch(() => {});
+        }
+        version = data.version;
+        
+        if (data.recargar) {
+            // Too many rows changed to send (an import): reload what lists them
+            if (tbody) window.location.reload();
+            reloadFollowups();
+            return;
+        }
+        data.eliminadas.forEach(id => {
+            document.querySelectorAll(`[data-postulacion-id="${id}"]`).forEach(el => el.remove());
+        });
+        data.filas.forEach(p => {
+            if (tbody) updateListRow(p);
+            if (followups) updateFollowup(p);
+        });
+        if (followups) updateFollowupsCount();
+    });
+    
+    function applyStats(stats) {
+        Object.entries(stats).forEach(([key, value]) => {
+            document.querySelectorAll(`[data-stat="${key}"]`).forEach(el => { el.textContent = value; });
+        });
+        if (!stats.estado_counts) return;
+        document.querySelectorAll('[data-estado-count]').forEach(el => {
+            const count = stats.estado_counts[el.dataset.estadoCount];
+            if (count === undefined) return;
+            el.textContent = count;
+            if (el.classList.contains('action-badge')) el.hidden = !(count > 0);
+            const step = el.closest('.pipeline-step');
+            if (step) step.classList.toggle('has-items', count > 0);
+        });
+    }
+    
+    function updateListRow(p) {
+        const row = tbody.querySelector(`tr[data-postulacion-id="${p.id}"]`);
+        if (!row) return;  // New applications wait for the next page load (ordering, pagination)
+        const filtro = tbody.dataset.estadoFiltro;
+        if (filtro && p.estado !== filtro) {
+            row.remove();
+            return;
+        }
+        row.querySelector('.company-cell strong').textContent = p.empresa;
+        setStatusBadge(row.querySelector('.status-badge'), p.estado);
+        if (p.estado !== 'Postulado') {
+            const quickForm = row.querySelector('.inline-form');
+            if (quickForm) quickForm.remove();
+        }
+        const cell = row.cells[4];
+        cell.innerHTML = '';
+        const span = document.createElement('span');
+        if (p.fecha_seguimiento) {
+            span.className = p.fecha_seguimiento <= isoDate(new Date()) ? 'text-danger' : '';
+            span.innerHTML = '<i class="fas fa-bell"></i> ';
+            span.append(formatDate(p.fecha_seguimiento));
+        } else {
+            span.className = 'text-muted';
+            span.textContent = '-';
+        }
+        cell.appendChild(span);
+    }
+    
+    // Same rule as database.get_seguimientos_pendientes
+    function isPendingFollowup(p) {
+        const limit = new Date();
+        limit.setDate(limit.getDate() + Number(followups.dataset.seguimientosDias));
+        return ['Postulado', 'En revisión'].includes(p.estado) &&
+            !!p.fecha_seguimiento && p.fecha_seguimiento <= isoDate(limit);
+    }
+    
+    function updateFollowup(p) {
+        const list = followups.querySelector('.followups-list');
+        let item = list.querySelector(`[data-postulacion-id="${p.id}"]`);
+        if (!isPendingFollowup(p)) {
+            if (item) item.remove();
+            return;
+        }
+        if (!item) {
+            item = document.createElement('a');
+            item.className = 'followup-item';
+            item.href = `/postulaciones/${p.id}`;
+            item.dataset.postulacionId = p.id;
+            item.innerHTML = '<div class="followup-info"><strong></strong><span class="followup-puesto"></span></div>' +
+                '<div class="followup-meta"><span class="followup-date"></span><span class="status-badge"></span></div>';
+        }
+        item.dataset.fechaSeguimiento = p.fecha_seguimiento;
+        item.querySelector('strong').textContent = p.empresa;
+        item.querySelector('.followup-puesto').textContent = p.puesto;
+        const date = item.querySelector('.followup-date');
+        date.innerHTML = '<i class="fas fa-calendar"></i> ';
+        date.append(formatDate(p.fecha_seguimiento));
+        date.classList.toggle('overdue', p.fecha_seguimiento <= isoDate(new Date()));
+        setStatusBadge(item.querySelector('.status-badge'), p.estado);
+        
+        // Keep the list ordered by follow-up date
+        const next = Array.from(list.children).find(
+            other => other !== item && other.dataset.fechaSeguimiento > p.fecha_seguimiento
+        );
+        list.insertBefore(item, next || null);
+    }
+    
+    function updateFollowupsCount() {
+        const count = followups.querySelectorAll('.followup-item').length;
+        const badge = followups.querySelector('[data-seguimientos-count]');
+        badge.textContent = count;
+        badge.classList.toggle('badge-warning', count > 0);
+        badge.classList.toggle('badge-success', count === 0);
+        followups.querySelector('.followups-list').hidden = count === 0;
+        followups.querySelector('.empty-state').hidden = count > 0;
+    }
+    
+    function reloadFollowups() {
+        if (!followups) return;
+        fetch(`/api/seguimientos?dias=${followups.dataset.seguimientosDias}`)
+            .then(r => r.json())
+            .then(data => {
+                followups.querySelector('.followups-list').innerHTML = '';
+                data.items.forEach(updateFollowup);
+                updateFollowupsCount();
+            })
+            .catch(() => {});
+    }
+    
+    // Quick status changes on the list post in the background; the event updates the row
+    if (tbody) {
+        tbody.addEventListener('submit', e => {
+            const form = e.target.closest('.inline-form');
+            if (!form || source.readyState !== EventSource.OPEN) return;
+            e.preventDefault();
+            form.querySelectorAll('button').forEach(b => { b.disabled = true; });
+            fetch(form.action, { method: 'POST', body: new FormData(form), redirect: 'manual' })
+                .then(r => {
+                    if (r.type !== 'opaqueredirect' && !r.ok) throw new Error(r.status);
+                })
+                .catch(() => form.submit());  // Fall back to the regular post and redirect
+        });
+    }
+}
+
 // Export functions for use in inline scripts
 window.JobTracker = {
     confirmDelete: window.confirmDelete,
@@ -0,0 +1,30 @@
+import os
+import sys
+import tempfile
+
+# The modules live at the repository root (no package)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Before database.py is imported: the app under test gets its own files and no scheduler
+_tmp = tempfile.mkdtemp(prefix='job-tracker-tests-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_tmp, 'tests.db')}"
+os.environ['JINJA_CACHE_DIR'] = os.path.join(_tmp, 'jinja')
+os.environ['PLANIFICADOR_INTERVALO'] = '0'
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Session on an empty database of its own (the app's database is shared by the HTTP tests)"""
+    import cache
+    import database
+    engine = database.crear_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    database.create_schema(engine)
+    # Cached reads are keyed by arguments, not by database
+    cache.invalidar_todo()
+    with sessionmaker(bind=engine, autoflush=False)() as sesion:
+        yield sesion
+    engine.dispose()
+    cache.invalidar_todo()
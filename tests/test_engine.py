@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import database
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize('url', [
+    'sqlite://', 'sqlite:///', 'sqlite:///:memory:', 'sqlite+aiosqlite://', 'sqlite+aiosqlite:///:memory:'
+])
+def test_opciones_pool_sqlite_en_memoria(url):
+    assert database.opciones_pool(url) == {}
+
+
+@pytest.mark.parametrize('url', ['sqlite:///data/x.db', 'sqlite+aiosqlite:///data/x.db', 'postgresql+asyncpg://u@h/db'])
+def test_opciones_pool_con_archivo_o_servidor(url):
+    assert database.opciones_pool(url) == {'pool_size': database.DB_POOL_SIZE, 'max_overflow': database.DB_MAX_OVERFLOW}
+
+
+def test_database_async_en_memoria():
+    # A fresh process: the engines are built at import time from DATABASE_URL
+    resultado = subprocess.run(
+        [sys.executable, '-c', 'import database_async'],
+        cwd=RAIZ, env={**os.environ, 'DATABASE_URL': 'sqlite://'}, capture_output=True, text=True
+    )
+    assert resultado.returncode == 0, resultado.stderr
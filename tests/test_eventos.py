@@ -0,0 +1,55 @@
+import asyncio
+import json
+
+import database
+from database import SessionLocal, create_postulacion, delete_postulacion
+from eventos import Difusor
+
+
+def _leer(mensaje: str):
+    campos = dict(linea.split(': ', 1) for linea in mensaje.strip().split('\n') if not linea.startswith('retry'))
+    return campos['event'], json.loads(campos['data'])
+
+
+def _crear(empresa: str) -> int:
+    with SessionLocal() as db:
+        return create_postulacion(db, empresa, 'Dev').id
+
+
+def _eliminar(postulacion_id: int):
+    with SessionLocal() as db:
+        delete_postulacion(db, postulacion_id)
+
+
+async def _escenario():
+    difusor = Difusor(espera=0.01, sondeo=5, latido=5)
+    difusor.iniciar()
+    try:
+        cola = await difusor.suscribir()
+        evento, snapshot = _leer(cola.get_nowait())
+        assert evento == 'stats'
+        
+        postulacion_id = await asyncio.to_thread(_crear, 'Eventos SA')
+        evento, creada = _leer(await asyncio.wait_for(cola.get(), 5))
+        assert evento == 'cambios'
+        assert creada['desde'] == snapshot['version'] and creada['version'] != snapshot['version']
+        assert [f['id'] for f in creada['filas']] == [postulacion_id]
+        assert creada['filas'][0]['empresa'] == 'Eventos SA'
+        assert creada['eliminadas'] == [] and not creada['recargar']
+        assert creada['stats']['total'] == snapshot['stats']['total'] + 1
+        
+        await asyncio.to_thread(_eliminar, postulacion_id)
+        evento, eliminada = _leer(await asyncio.wait_for(cola.get(), 5))
+        assert evento == 'cambios'
+        assert eliminada['desde'] == creada['version']
+        assert eliminada['filas'] == [] and eliminada['eliminadas'] == [postulacion_id]
+        assert eliminada['stats']['total'] == snapshot['stats']['total']
+        assert difusor.estado()['clientes'] == 1
+    finally:
+        await difusor.detener()
+
+
+def test_difusor_entrega_filas_cambiadas_y_eliminadas(monkeypatch):
+    monkeypatch.setattr(database, '_oyentes_escritura', [])
+    database.init_db()
+    asyncio.run(_escenario())
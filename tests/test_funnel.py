@@ -0,0 +1,47 @@
+from datetime import date, datetime, timedelta
+
+from database import EstadoHistorial, Postulacion, get_funnel_metricas
+
+INICIO = datetime(2026, 1, 5)
+
+# Days after INICIO at which each application entered each estado
+HISTORIAS = [
+    [('Postulado', 0), ('Entrevista', 2), ('Oferta', 12), ('Aceptado', 15)],
+    [('Postulado', 0), ('Entrevista', 4), ('Rechazado', 10)],
+    [('Postulado', 0), ('Rechazado', 6)],
+    [('Postulado', 0)],
+]
+
+
+def test_funnel_con_conteos_conocidos(db):
+    for i, historia in enumerate(HISTORIAS):
+        p = Postulacion(empresa=f'Empresa {i}', puesto='Dev', fecha_postulacion=date(2026, 1, 5), estado=historia[-1][0])
+        db.add(p)
+        db.flush()
+        anterior = None
+        for estado, dias in historia:
+            db.add(EstadoHistorial(
+                postulacion_id=p.id, estado_anterior=anterior, estado=estado, fecha=INICIO + timedelta(days=dias)
+            ))
+            anterior = estado
+    db.commit()
+    
+    funnel = get_funnel_metricas(db)
+    assert funnel['etapas'] == [
+        {'estado': 'Postulado', 'alcanzadas': 4, 'conversion': None},
+        {'estado': 'Entrevista', 'alcanzadas': 2, 'conversion': 50.0},
+        {'estado': 'Oferta', 'alcanzadas': 1, 'conversion': 50.0},
+        {'estado': 'Aceptado', 'alcanzadas': 1, 'conversion': 100.0},
+    ]
+    assert funnel['tiempos'] == [
+        {'estado': 'Postulado', 'n': 3, 'mediana_dias': 4.0, 'p90_dias': 6.0},
+        {'estado': 'Entrevista', 'n': 2, 'mediana_dias': 6.0, 'p90_dias': 10.0},
+        {'estado': 'Oferta', 'n': 1, 'mediana_dias': 3.0, 'p90_dias': 3.0},
+    ]
+
+
+def test_funnel_vacio(db):
+    assert get_funnel_metricas(db) == {
+        'etapas': [{'estado': e, 'alcanzadas': 0, 'conversion': None} for e in ('Postulado', 'Entrevista', 'Oferta', 'Aceptado')],
+        'tiempos': []
+    }
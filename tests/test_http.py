@@ -0,0 +1,36 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+
+
+@pytest.fixture(scope='module')
+def cliente():
+    with TestClient(app) as c:
+        yield c
+
+
+def _crear(cliente, empresa='ACME'):
+    r = cliente.post('/postulaciones/nueva', data={
+        'empresa': empresa, 'puesto': 'Dev', 'fecha_postulacion': '2026-01-05', 'estado': 'Postulado'
+    }, follow_redirects=False)
+    assert r.status_code == 303
+    return cliente.get('/api/postulaciones', params={'empresa': empresa}).json()['items'][0]['id']
+
+
+def test_if_none_match_da_304_hasta_la_proxima_escritura(cliente):
+    postulacion_id = _crear(cliente)
+    r = cliente.get('/api/stats')
+    etag = r.headers['etag']
+    assert cliente.get('/api/stats', headers={'If-None-Match': etag}).status_code == 304
+    cliente.post(f'/postulaciones/{postulacion_id}/cambiar-estado', data={'nuevo_estado': 'Entrevista'})
+    assert cliente.get('/api/stats', headers={'If-None-Match': etag}).status_code == 200
+
+
+def test_if_modified_since_no_oculta_escrituras_del_mismo_segundo(cliente):
+    postulacion_id = _crear(cliente, 'Initech')
+    r = cliente.get('/api/stats')
+    cliente.post(f'/postulaciones/{postulacion_id}/cambiar-estado', data={'nuevo_estado': 'Oferta'})
+    r2 = cliente.get('/api/stats', headers={'If-Modified-Since': r.headers['last-modified']})
+    assert r2.status_code == 200
+    assert r2.json()['estado_counts']['Oferta'] >= 1
@@ -0,0 +1,48 @@
+import io
+
+from database import Postulacion
+from importacion import importar_csv
+
+CSV = """empresa,puesto,url_oferta,estado,fecha_postulacion,notas
+ACME,Backend Dev,https://acme.example/jobs/1,Postulado,2026-01-05,primera
+Initech,Data Engineer,,Entrevista,2026-01-06,
+Globex,QA,,Contratado,2026-01-07,
+Umbrella,SRE,,Postulado,05/01/2026,
+acme ,backend  dev,http://www.acme.example/jobs/1/,Postulado,2026-01-05,repetida en el archivo
+"""
+
+
+def _importar(db, **opciones):
+    return importar_csv(db, io.StringIO(CSV), batch_size=2, **opciones)
+
+
+def test_reimportar_no_duplica(db):
+    primera = _importar(db)
+    assert (primera.filas, primera.insertadas, primera.omitidas, primera.rechazadas) == (5, 2, 1, 2)
+    segunda = _importar(db)
+    assert (segunda.insertadas, segunda.omitidas, segunda.rechazadas) == (0, 3, 2)
+    assert sorted(p.empresa for p in db.query(Postulacion)) == ['ACME', 'Initech']
+
+
+def test_reporte_de_errores_por_fila(db):
+    reporte = _importar(db).to_dict()
+    assert reporte['errores'] == [
+        {'fila': 3, 'errores': ["estado inválido: 'Contratado'"]},
+        {'fila': 4, 'errores': ["fecha_postulacion: fecha inválida '05/01/2026' (se espera AAAA-MM-DD)"]},
+    ]
+    assert not reporte['errores_truncados']
+
+
+def test_actualizar_sobrescribe_sin_duplicar(db):
+    _importar(db)
+    reporte = _importar(db, modo='actualizar')
+    assert reporte.insertadas == 0 and reporte.actualizadas >= 2
+    assert db.query(Postulacion).count() == 2
+    # The last matching row of the file wins
+    assert sorted(p.notas or '' for p in db.query(Postulacion)) == ['', 'repetida en el archivo']
+
+
+def test_dry_run_no_escribe(db):
+    reporte = _importar(db, dry_run=True)
+    assert reporte.rechazadas == 2 and reporte.insertadas > 0
+    assert db.query(Postulacion).count() == 0
@@ -0,0 +1,109 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import database
+from database import EstadoHistorial, Postulacion, aplicar_operaciones
+from main import app
+
+
+def _crear(empresa, **campos):
+    return {'op': 'crear', 'campos': {'empresa': empresa, 'puesto': 'Dev', **campos}}
+
+
+@pytest.fixture
+def notificaciones(monkeypatch):
+    recibidas = []
+    monkeypatch.setattr(database, '_oyentes_escritura', [lambda cambiadas, eliminadas: recibidas.append((cambiadas, eliminadas))])
+    return recibidas
+
+
+def _historial(db, postulacion_id):
+    return [
+        (h.estado_anterior, h.estado)
+        for h in db.query(EstadoHistorial).filter_by(postulacion_id=postulacion_id).order_by(EstadoHistorial.id)
+    ]
+
+
+def test_operaciones_en_orden(db):
+    [creada] = aplicar_operaciones(db, [_crear('ACME')])
+    resultados = aplicar_operaciones(db, [
+        {'op': 'actualizar', 'id': creada['id'], 'campos': {'estado': 'Entrevista'}},
+        {'op': 'actualizar', 'id': creada['id'], 'campos': {'estado': 'Oferta', 'notas': 'segunda'}},
+        {'op': 'eliminar', 'id': creada['id']},
+        {'op': 'actualizar', 'id': creada['id'], 'campos': {'notas': 'tarde'}},
+    ])
+    assert [r['ok'] for r in resultados] == [True, True, True, False]
+    assert resultados[3]['error'] == 'Postulación no encontrada'
+    assert db.get(Postulacion, creada['id']) is None
+    assert _historial(db, creada['id']) == []
+
+
+def test_transiciones_se_acumulan(db):
+    [creada] = aplicar_operaciones(db, [_crear('ACME')])
+    aplicar_operaciones(db, [
+        {'op': 'actualizar', 'id': creada['id'], 'campos': {'estado': 'Entrevista'}},
+        {'op': 'actualizar', 'id': creada['id'], 'campos': {'estado': 'Oferta'}},
+    ])
+    assert db.get(Postulacion, creada['id']).estado == 'Oferta'
+    assert _historial(db, creada['id']) == [(None, 'Postulado'), ('Postulado', 'Entrevista'), ('Entrevista', 'Oferta')]
+
+
+def test_eliminar_y_crear_en_el_mismo_lote(db, notificaciones):
+    _, segunda = aplicar_operaciones(db, [_crear('ACME'), _crear('Initech')])
+    notificaciones.clear()
+    resultados = aplicar_operaciones(db, [
+        {'op': 'actualizar', 'id': segunda['id'], 'campos': {'estado': 'Entrevista'}},
+        {'op': 'eliminar', 'id': segunda['id']},
+        _crear('Globex', estado='Oferta'),
+    ])
+    nueva = resultados[2]['id']
+    # SQLite reuses the rowid of the deleted last row
+    assert nueva == segunda['id']
+    assert db.get(Postulacion, nueva).empresa == 'Globex'
+    assert _historial(db, nueva) == [(None, 'Oferta')]
+    assert notificaciones == [([nueva], [])]
+
+
+def test_atomico_no_escribe_nada(db):
+    [creada] = aplicar_operaciones(db, [_crear('ACME')])
+    resultados = aplicar_operaciones(db, [
+        {'op': 'actualizar', 'id': creada['id'], 'campos': {'estado': 'Oferta'}},
+        {'op': 'eliminar', 'id': creada['id'] + 100},
+    ], atomico=True)
+    assert [r['ok'] for r in resultados] == [True, False]
+    db.rollback()
+    assert db.get(Postulacion, creada['id']).estado == 'Postulado'
+
+
+def test_huella_repetida_queda_sin_huella(db):
+    primera, segunda = aplicar_operaciones(db, [
+        _crear('ACME', url_oferta='https://acme.example/1'),
+        _crear('acme', url_oferta='http://www.acme.example/1/'),
+    ])
+    assert db.get(Postulacion, primera['id']).huella is not None
+    assert db.get(Postulacion, segunda['id']).huella is None
+
+
+def test_huella_liberada_en_el_lote(db):
+    [vieja] = aplicar_operaciones(db, [_crear('ACME')])
+    huella = db.get(Postulacion, vieja['id']).huella
+    resultados = aplicar_operaciones(db, [{'op': 'eliminar', 'id': vieja['id']}, _crear('ACME')])
+    assert db.get(Postulacion, resultados[1]['id']).huella == huella
+
+
+def test_api_atomico_da_409():
+    with TestClient(app) as cliente:
+        r = cliente.post('/api/postulaciones/batch', json={'operaciones': [
+            {'op': 'crear', 'empresa': 'Lote 409', 'puesto': 'Dev'}
+        ]})
+        assert r.status_code == 200
+        postulacion_id = r.json()['items'][0]['id']
+        r = cliente.post('/api/postulaciones/batch', json={'atomico': True, 'operaciones': [
+            {'op': 'actualizar', 'id': postulacion_id, 'estado': 'Oferta'},
+            {'op': 'eliminar', 'id': 10 ** 9},
+        ]})
+        assert r.status_code == 409
+        assert r.json()['aplicadas'] == 0
+        assert [i['ok'] for i in r.json()['items']] == [True, False]
+        fila = cliente.get('/api/postulaciones', params={'empresa': 'Lote 409'}).json()['items'][0]
+        assert fila['estado'] == 'Postulado'
@@ -0,0 +1,53 @@
+import json
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from planificador import Planificador
+
+
+def _seguimiento(id_: int, dias: int = 0):
+    return SimpleNamespace(
+        id=id_, empresa=f'Empresa {id_}', puesto='Dev', estado='Postulado',
+        fecha_seguimiento=date.today() - timedelta(days=dias)
+    )
+
+
+def _eventos(ruta):
+    with open(ruta, encoding='utf-8') as f:
+        return [json.loads(linea) for linea in f]
+
+
+def test_recordatorio_una_vez_por_seguimiento(tmp_path):
+    archivo = str(tmp_path / 'recordatorios.jsonl')
+    p = Planificador(intervalo=0, archivo=archivo)
+    assert p._escribir_eventos([_seguimiento(1), _seguimiento(2)], 0) == 2
+    assert p._escribir_eventos([_seguimiento(1), _seguimiento(2)], 0) == 0
+    # A restart reads the keys back from the file
+    assert Planificador(intervalo=0, archivo=archivo)._escribir_eventos([_seguimiento(1)], 0) == 0
+
+
+def test_solo_guarda_claves_vencidas(tmp_path):
+    p = Planificador(intervalo=0, archivo=str(tmp_path / 'recordatorios.jsonl'))
+    p._escribir_eventos([_seguimiento(i) for i in range(100)], 0)
+    p._escribir_eventos([_seguimiento(7)], 0)
+    assert p._notificados == {(7, date.today().isoformat())}
+
+
+def test_rota_el_archivo(tmp_path):
+    archivo = str(tmp_path / 'recordatorios.jsonl')
+    p = Planificador(intervalo=0, archivo=archivo, max_bytes=1)
+    p._escribir_eventos([_seguimiento(1)], 0)
+    p._escribir_eventos([_seguimiento(1), _seguimiento(2)], 3)
+    assert [e['id'] for e in _eventos(archivo + '.1')] == [1]
+    assert [e.get('id') for e in _eventos(archivo)] == [2, None]
+    # Keys in the rotated file still count after a restart
+    assert Planificador(intervalo=0, archivo=archivo)._escribir_eventos([_seguimiento(1)], 0) == 0
+
+
+def test_un_solo_lider(tmp_path, monkeypatch):
+    monkeypatch.setattr('planificador.ARCHIVO_LIDER', str(tmp_path / 'lider.lock'))
+    a, b = Planificador(intervalo=0), Planificador(intervalo=0)
+    assert a._es_lider() and a._es_lider()
+    assert not b._es_lider()
+    a._bloqueo_lider.close()
+    assert b._es_lider()
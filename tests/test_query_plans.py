@@ -0,0 +1,21 @@
+import pytest
+
+from benchmarks.query_plans import FULL_SCAN_OK, crear_base, explicar, plan_cases
+
+CASOS = plan_cases()
+
+
+@pytest.fixture(scope='module')
+def base(tmp_path_factory):
+    engine, Session = crear_base(str(tmp_path_factory.mktemp('planes') / 'plans.db'))
+    yield engine, Session
+    engine.dispose()
+
+
+@pytest.mark.parametrize('nombre,caso', CASOS, ids=[nombre for nombre, _ in CASOS])
+def test_sin_full_scan(base, nombre, caso):
+    if nombre.split('[')[0] in FULL_SCAN_OK:
+        pytest.skip('reads every row by design')
+    planes, scans = explicar(*base, caso)
+    assert planes, 'the case issued no SELECT'
+    assert not scans, '\n'.join(scans)
@@ -0,0 +1,42 @@
+import pytest
+
+from salarios import Salario, columnas_salario, parsear_salario
+
+
+@pytest.mark.parametrize('texto, esperado', [
+    # Ranges, with the separators _RANGO accepts
+    ('USD 3000-4000', Salario(3000, 4000, 'USD', None)),
+    ('3000 a 4000 euros', Salario(3000, 4000, 'EUR', None)),
+    ('4000 – 3000', Salario(3000, 4000, None, None)),
+    # k / mil / millones multipliers, also carried from the upper end
+    ('80-100k USD/año', Salario(80_000, 100_000, 'USD', 'año')),
+    ('USD 80k-100k anual', Salario(80_000, 100_000, 'USD', 'año')),
+    ('150 mil pesos', Salario(150_000, 150_000, None, None)),
+    ('2,5 mil', Salario(2_500, 2_500, None, None)),
+    ('1.5 millones al año', Salario(1_500_000, 1_500_000, None, 'año')),
+    # Both separator conventions
+    ('$1.500.000 mensual', Salario(1_500_000, 1_500_000, None, 'mes')),
+    ('$1,500,000 monthly', Salario(1_500_000, 1_500_000, None, 'mes')),
+    ('1.500,50 EUR', Salario(1_500.5, 1_500.5, 'EUR', None)),
+    ('1,500.50 USD', Salario(1_500.5, 1_500.5, 'USD', None)),
+    # Currency symbols
+    ('AR$ 900.000', Salario(900_000, 900_000, 'ARS', None)),
+    ('R$ 5.000 por mes', Salario(5_000, 5_000, 'BRL', 'mes')),
+    ('U$S 2000', Salario(2_000, 2_000, 'USD', None)),
+    ('US$ 25 por hora', Salario(25, 25, 'USD', 'hora')),
+    ('ARS 900000', Salario(900_000, 900_000, 'ARS', None)),
+])
+def test_parsear_salario(texto, esperado):
+    assert parsear_salario(texto) == esperado
+
+
+@pytest.mark.parametrize('texto', [None, '', '   ', 'A convenir', 'Remoto, 40 horas', '3 años de experiencia'])
+def test_parsear_salario_sin_monto(texto):
+    assert parsear_salario(texto) is None
+
+
+def test_columnas_salario():
+    assert columnas_salario('AR$ 900.000 - 1.200.000 mensual') == {
+        'salario_min': 900_000, 'salario_max': 1_200_000, 'salario_moneda': 'ARS', 'salario_periodo': 'mes'
+    }
+    assert columnas_salario(None) == dict.fromkeys(['salario_min', 'salario_max', 'salario_moneda', 'salario_periodo'])
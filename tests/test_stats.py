@@ -0,0 +1,61 @@
+import io
+from datetime import date, timedelta
+
+import pytest
+
+from database import (
+    aplicar_operaciones, compute_dashboard_stats, create_postulacion, delete_postulacion,
+    envejecer_postulaciones, get_dashboard_stats, update_postulacion, verify_stats
+)
+from importacion import importar_csv
+
+HOY = date.today()
+
+
+def _dias(n: int) -> date:
+    return HOY - timedelta(days=n)
+
+
+def _crear(db):
+    for i, (dias, estado) in enumerate([(1, 'Postulado'), (10, 'Postulado'), (20, 'Postulado'), (40, 'Entrevista')]):
+        create_postulacion(db, f'Empresa {i}', 'Dev', estado=estado, fecha_postulacion=_dias(dias))
+
+
+def _actualizar(db):
+    update_postulacion(db, 1, estado='Rechazado', fecha_respuesta=HOY)
+    update_postulacion(db, 4, fecha_postulacion=_dias(3))
+
+
+def _eliminar(db):
+    delete_postulacion(db, 2)
+
+
+def _lote(db):
+    aplicar_operaciones(db, [
+        {'op': 'crear', 'campos': {'empresa': 'Lote', 'puesto': 'QA', 'fecha_postulacion': _dias(30)}},
+        {'op': 'actualizar', 'id': 3, 'campos': {'estado': 'Oferta', 'fecha_respuesta': _dias(2)}},
+        {'op': 'eliminar', 'id': 4},
+    ])
+
+
+def _importar(db):
+    importar_csv(db, io.StringIO(
+        "empresa,puesto,estado,fecha_postulacion\n"
+        f"Import A,Dev,Postulado,{_dias(15).isoformat()}\n"
+        f"Import B,Dev,Aceptado,{_dias(5).isoformat()}\n"
+    ))
+
+
+def _envejecer(db):
+    assert envejecer_postulaciones(db) == 2
+
+
+PASOS = [_crear, _actualizar, _eliminar, _lote, _importar, _envejecer]
+
+
+@pytest.mark.parametrize('hasta', range(1, len(PASOS) + 1), ids=[p.__name__.strip('_') for p in PASOS])
+def test_stats_materializadas_sin_drift(db, hasta):
+    for paso in PASOS[:hasta]:
+        paso(db)
+    assert verify_stats(db) == []
+    assert get_dashboard_stats(db) == compute_dashboard_stats(db)
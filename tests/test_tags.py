@@ -0,0 +1,44 @@
+import pytest
+
+from database import count_postulaciones, create_postulacion, get_postulaciones, get_tag_facets, update_postulacion
+
+
+@pytest.fixture
+def postulaciones(db):
+    for empresa, tags in [
+        ('Java', 'java, backend'),
+        ('JavaScript', 'javascript,frontend'),
+        ('Ambas', 'Java,JavaScript'),
+        ('Sin tags', None),
+    ]:
+        create_postulacion(db, empresa, 'Dev', tags=tags)
+    return db
+
+
+def _empresas(db, **filtros):
+    return sorted(p.empresa for p in get_postulaciones(db, **filtros))
+
+
+def test_tag_exacto(postulaciones):
+    assert _empresas(postulaciones, tags='java') == ['Ambas', 'Java']
+    assert _empresas(postulaciones, tags='JAVASCRIPT') == ['Ambas', 'JavaScript']
+    assert _empresas(postulaciones, tags='jav') == []
+    assert count_postulaciones(postulaciones, tags='java') == 2
+
+
+def test_tags_todas_o_alguna(postulaciones):
+    assert _empresas(postulaciones, tags='java,javascript') == ['Ambas']
+    assert _empresas(postulaciones, tags='java,javascript', tags_modo='any') == ['Ambas', 'Java', 'JavaScript']
+    assert _empresas(postulaciones, tags='backend,frontend', tags_modo='any') == ['Java', 'JavaScript']
+
+
+def test_editar_tags(postulaciones):
+    update_postulacion(postulaciones, 1, tags='kotlin')
+    assert _empresas(postulaciones, tags='java') == ['Ambas']
+    assert _empresas(postulaciones, tags='kotlin') == ['Java']
+
+
+def test_facetas_de_un_tag(postulaciones):
+    assert get_tag_facets(postulaciones, tags='java') == [
+        {'tag': 'java', 'count': 2}, {'tag': 'backend', 'count': 1}, {'tag': 'javascript', 'count': 1}
+    ]